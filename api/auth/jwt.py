@@ -2,16 +2,16 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
-from jose import jwt
 from pydantic import ValidationError
 
 from api.deps.user_deps import get_current_user
-from core.config import settings
 from core.security import create_access_token, create_refresh_token
+from core.token_verifier import InvalidTokenError, refresh_token_verifier
 from models.user_model import User
 from schemas.auth_schema import TokenSchema, TokenPayload
 from schemas.user_schema import UserSchema
 from services.user_services import UserServices
+from utils.auth_utils import verify_token
 
 auth_router = APIRouter()
 
@@ -47,17 +47,18 @@ async def test_token(user: User = Depends(get_current_user)):
 @auth_router.post("/refresh", summary="Reload token.", response_model=TokenSchema)
 async def refresh_token(refresh_token_item: str = Body(...)):
     try:
-        payload = jwt.decode(
-            refresh_token_item, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        # Los refresh tokens se firman con JWT_REFRESH_SECRET_KEY
+        payload = refresh_token_verifier.verify(refresh_token_item)
         token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+    except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid Token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    await verify_token(refresh_token_item, payload)
+
     user = await UserServices.get_user_by_id_service(token_data.sub)
 
     if not user:
@@ -66,8 +67,8 @@ async def refresh_token(refresh_token_item: str = Body(...)):
             detail="Invalid token for user.",
         )
     return {
-        "access_token": create_access_token(user.user_id),
-        "refresh_token": create_refresh_token(user.user_id),
+        "access_token": create_access_token(user.id),
+        "refresh_token": create_refresh_token(user.id),
     }
 
 
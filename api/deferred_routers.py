@@ -0,0 +1,41 @@
+import importlib
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class DeferredRoutersMiddleware:
+    """
+    Importa los routers poco usados hasta el primer request a su prefijo y
+    entonces los incluye en la app, para que no cuenten en el cold start de
+    Lambda. Mientras no se carguen, sus rutas no aparecen en el OpenAPI.
+    """
+
+    def __init__(
+        self, app: ASGIApp, fastapi_app: FastAPI, routers: list, prefix: str = ""
+    ):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.prefix = prefix
+        self.pending = {
+            f"{prefix}{router_prefix}": (module_path, attribute, tags)
+            for router_prefix, module_path, attribute, tags in routers
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.pending and scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            for full_prefix in list(self.pending):
+                if path == full_prefix or path.startswith(f"{full_prefix}/"):
+                    self._include(full_prefix)
+        await self.app(scope, receive, send)
+
+    def _include(self, full_prefix: str) -> None:
+        module_path, attribute, tags = self.pending.pop(full_prefix)
+        router = getattr(importlib.import_module(module_path), attribute)
+        self.fastapi_app.include_router(router, prefix=full_prefix, tags=tags)
+        # El esquema se regenera con las rutas nuevas
+        self.fastapi_app.openapi_schema = None
@@ -1,12 +1,17 @@
-from datetime import datetime
-from fastapi import Depends, HTTPException, status
+import time
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
 from pydantic import ValidationError
 from core.config import settings
+from core.token_verifier import (
+    InvalidTokenError,
+    TokenExpiredError,
+    access_token_verifier,
+)
 from models.user_model import User
 from schemas.auth_schema import TokenPayload
-from services.user_services import UserServices
+from services.principal_services import PrincipalServices
+from utils.auth_utils import verify_token
 
 reusable_oauth = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login",
@@ -14,31 +19,34 @@ reusable_oauth = OAuth2PasswordBearer(
 )
 
 
-async def get_current_user(token: str = Depends(reusable_oauth)) -> User:
+async def get_current_user(
+    request: Request, token: str = Depends(reusable_oauth)
+) -> User:
+    started = time.perf_counter()
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = access_token_verifier.verify(token)
         token_data = TokenPayload(**payload)
 
-        if datetime.fromtimestamp(token_data.exp) < datetime.now():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        await verify_token(token, payload)
 
-        user = await UserServices.get_user_by_id_service(token_data.sub)
+        # Usuario, roles y permisos en una sola consulta (con cache por usuario)
+        user = await PrincipalServices.get_principal(token_data.sub)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-
-        # Cargar roles y permisos del usuario
-        await user.fetch_all_links()
         return user
 
-    except (jwt.JWTError, ValidationError):
+    except TokenExpiredError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    finally:
+        # Costo de autenticación por request; se reporta en Server-Timing
+        request.state.auth_ms = (time.perf_counter() - started) * 1000
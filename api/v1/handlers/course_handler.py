@@ -1,8 +1,20 @@
+from typing import Optional
+
 from beanie import PydanticObjectId
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from models.user_model import User
 
+from schemas.bulk_schema import BulkReport
 from schemas.course_schema import CourseCreate, CourseResponse, CourseUpdate
+from schemas.general_schemas import Page
+from services.course_catalog_services import CourseCatalogServices
 from services.course_services import CourseServices
+from services.course_summary_services import CourseSummaryServices
+from utils.bulk_utils import BULK_OPENAPI, read_bulk_items
+from utils.http_cache_utils import hashed_json_response, json_response_with_etag
+from utils.pagination_utils import PageParams, filters_from
+from utils.permission_utils import require_permission
+from utils.streaming_utils import ExportFormat, stream_response
 
 
 course_router = APIRouter()
@@ -17,18 +29,122 @@ async def create_course(course: CourseCreate):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@course_router.get("/get-all-courses", response_model=list[CourseResponse])
-async def get_all_courses():
+@course_router.get("/get-all-courses", response_model=Page[CourseResponse])
+async def get_all_courses(
+    request: Request,
+    params: PageParams = Depends(),
+    course_status: Optional[str] = Query(None, alias="status"),
+    level: Optional[str] = None,
+):
     try:
-        return await CourseServices.get_all_courses()
+        filters = filters_from(status=course_status, level=level)
+        entry = await CourseCatalogServices.get_all_courses(params, filters)
+        return json_response_with_etag(request, entry.body, entry.etag)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@course_router.get("/summaries")
+async def get_course_summaries(
+    request: Request,
+    params: PageParams = Depends(),
+    course_status: Optional[str] = Query(None, alias="status"),
+    level: Optional[str] = None,
+):
+    try:
+        filters = filters_from(status=course_status, level=level)
+        summaries = await CourseSummaryServices.get_summaries(params, filters)
+        return hashed_json_response(request, summaries)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@course_router.get("/summary/{course_id}")
+async def get_course_summary(request: Request, course_id: PydanticObjectId):
+    try:
+        summary = await CourseSummaryServices.get_summary(course_id)
+        return hashed_json_response(request, summary)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@course_router.get("/export-courses")
+async def export_courses(
+    current_user: User = Depends(require_permission(["manage_courses", "lectura"])),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    course_status: Optional[str] = Query(None, alias="status"),
+    level: Optional[str] = None,
+):
+    filters = filters_from(status=course_status, level=level)
+    return stream_response(
+        CourseServices.export_courses(filters), export_format, "courses"
+    )
+
+
+@course_router.post(
+    "/bulk",
+    summary="Crea varios cursos",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_create_courses(
+    current_user: User = Depends(require_permission(["manage_courses", "crear"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await CourseServices.bulk_create_courses(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@course_router.put(
+    "/bulk",
+    summary="Actualiza varios cursos",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_update_courses(
+    current_user: User = Depends(require_permission(["manage_courses", "editar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await CourseServices.bulk_update_courses(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@course_router.post(
+    "/bulk/delete",
+    summary="Elimina varios cursos",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_delete_courses(
+    current_user: User = Depends(require_permission(["manage_courses", "eliminar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await CourseServices.bulk_delete_courses(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
 @course_router.get("/get-course-by-id/{course_id}", response_model=CourseResponse)
-async def get_course_by_id(course_id: PydanticObjectId):
+async def get_course_by_id(request: Request, course_id: PydanticObjectId):
     try:
-        return await CourseServices.get_course_by_id(course_id)
+        entry = await CourseCatalogServices.get_course_by_id(course_id)
+        return json_response_with_etag(request, entry.body, entry.etag)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -0,0 +1,87 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from core.config import settings
+from models.courses_model import Course
+from models.user_model import User
+from schemas.enrollment_schema import EnrollmentResult
+from services.enrollment_services import EnrollmentServices
+from services.util_services import ensure_document_exists
+from utils.pagination_utils import PageParams
+from utils.permission_utils import require_permission
+
+enrollment_router = APIRouter()
+
+
+@enrollment_router.post(
+    "/{course_id}/students/{user_id}",
+    summary="Inscribe a un usuario en un curso",
+    response_model=EnrollmentResult,
+)
+async def enroll_user(
+    course_id: str,
+    user_id: str,
+    current_user: User = Depends(require_permission(["manage_courses", "crear"])),
+):
+    try:
+        course = await ensure_document_exists(course_id, Course)
+        user = await ensure_document_exists(user_id, User)
+        changed = await EnrollmentServices.enroll(course, user)
+        return EnrollmentResult(course_id=course, user_id=user, changed=changed)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@enrollment_router.delete(
+    "/{course_id}/students/{user_id}",
+    summary="Da de baja a un usuario de un curso",
+    response_model=EnrollmentResult,
+)
+async def unenroll_user(
+    course_id: str,
+    user_id: str,
+    current_user: User = Depends(require_permission(["manage_courses", "eliminar"])),
+):
+    try:
+        course = await ensure_document_exists(course_id, Course)
+        user = await ensure_document_exists(user_id, User)
+        changed = await EnrollmentServices.unenroll(course, user)
+        return EnrollmentResult(course_id=course, user_id=user, changed=changed)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@enrollment_router.get(
+    "/{course_id}/students", summary="Alumnos inscritos en un curso (paginado)"
+)
+async def get_roster(
+    course_id: str,
+    cursor: Optional[str] = Query(None, description="`next_cursor` de la página anterior."),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    current_user: User = Depends(require_permission(["manage_courses", "lectura"])),
+):
+    try:
+        course = await ensure_document_exists(course_id, Course)
+        return await EnrollmentServices.get_roster(course, cursor, limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@enrollment_router.get(
+    "/user/{user_id}/courses", summary="Cursos en los que está inscrito un usuario"
+)
+async def get_user_courses(user_id: str, params: PageParams = Depends()):
+    try:
+        user = await ensure_document_exists(user_id, User)
+        return await EnrollmentServices.get_user_courses(user, params)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
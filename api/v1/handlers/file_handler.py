@@ -1,23 +1,109 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from models.user_model import User
+from models.files_model import File
+from schemas.bulk_schema import BulkReport
 from schemas.file_schemas import FileCreate, FileUpdate
 from services.file_services import FileService
+from utils.bulk_utils import BULK_OPENAPI, read_bulk_items
+from utils.http_cache_utils import conditional_json_response, hashed_json_response
+from utils.pagination_utils import PageParams, filters_from
+from utils.permission_utils import require_permission
+from utils.streaming_utils import ExportFormat, stream_response
 
 
 file_router = APIRouter()
 
 
 @file_router.get("/")
-async def get_files_handler():
+async def get_files_handler(
+    request: Request,
+    params: PageParams = Depends(),
+    file_type: Optional[str] = Query(None, alias="type"),
+    is_deleted: Optional[bool] = None,
+):
     try:
-        return await FileService.get_files()
+        filters = filters_from(type=file_type, is_deleted=is_deleted)
+        files = await FileService.get_files(params, filters)
+        return hashed_json_response(request, files)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@file_router.get("/export")
+async def export_files_handler(
+    current_user: User = Depends(require_permission(["manage_files", "lectura"])),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    file_type: Optional[str] = Query(None, alias="type"),
+    is_deleted: Optional[bool] = None,
+):
+    filters = filters_from(type=file_type, is_deleted=is_deleted)
+    return stream_response(FileService.export_files(filters), export_format, "files")
+
+
+@file_router.post(
+    "/bulk",
+    summary="Crea varios archivos",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_create_files(
+    current_user: User = Depends(require_permission(["manage_files", "crear"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await FileService.bulk_create_files(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@file_router.put(
+    "/bulk",
+    summary="Actualiza varios archivos",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_update_files(
+    current_user: User = Depends(require_permission(["manage_files", "editar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await FileService.bulk_update_files(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@file_router.post(
+    "/bulk/delete",
+    summary="Marca varios archivos como eliminados",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_delete_files(
+    current_user: User = Depends(require_permission(["manage_files", "eliminar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await FileService.bulk_delete_files(items, ordered)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
 
 
 @file_router.get("/{file_id}")
-async def get_file_by_id_handler(file_id: str):
+async def get_file_by_id_handler(request: Request, file_id: str):
     try:
-        return await FileService.get_file_by_id(file_id)
+        return await conditional_json_response(
+            request, File, file_id, lambda: FileService.get_file_by_id(file_id)
+        )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
 
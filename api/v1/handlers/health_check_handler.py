@@ -1,5 +1,12 @@
 from fastapi import APIRouter, HTTPException, status
 
+from core.catalog_cache import catalog_cache
+from core.password_hasher import password_hasher
+from core.token_blacklist import token_blacklist
+from core.token_verifier import access_token_verifier
+from dependencies.database import pool_stats
+from services.principal_services import principal_cache
+
 health_check_router = APIRouter()
 
 
@@ -10,4 +17,19 @@ async def health_check_endpoint():
             "message": "API  created successfully"
         }
     except Exception as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@health_check_router.get("/metrics")
+async def health_check_metrics_endpoint():
+    try:
+        return {
+            "catalog_cache": catalog_cache.stats(),
+            "mongo_pool": pool_stats.stats(),
+            "password_hasher": password_hasher.stats(),
+            "principal_cache": principal_cache.stats(),
+            "token_blacklist": token_blacklist.stats(),
+            "token_verifier": access_token_verifier.stats(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,26 +1,132 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from models.user_model import User
+from models.lesson_model import Lesson
 from services.lesson_services import LessonServices
-from schemas.lesson_schema import LessonCreate, LessonUpdate
+from schemas.bulk_schema import BulkReport
+from schemas.lesson_schema import LessonCreate, LessonReorder, LessonUpdate
 from beanie import PydanticObjectId
+from utils.bulk_utils import BULK_OPENAPI, read_bulk_items
+from utils.http_cache_utils import conditional_json_response, hashed_json_response
+from utils.pagination_utils import PageParams, filters_from
+from utils.permission_utils import require_permission
 
 
 lesson_router = APIRouter()
 
 
+@lesson_router.get(
+    "/course/{course_id}", summary="Get the lessons of a course in order", tags=["Lesson"]
+)
+async def get_lessons_for_course(
+    request: Request, course_id: PydanticObjectId, params: PageParams = Depends()
+):
+    try:
+        lessons = await LessonServices.get_lessons_for_course(course_id, params)
+        return hashed_json_response(request, lessons)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
+
+
+@lesson_router.put(
+    "/course/{course_id}/order", summary="Reorder the lessons of a course", tags=["Lesson"]
+)
+async def reorder_lessons(
+    course_id: PydanticObjectId,
+    order: LessonReorder,
+    current_user: User = Depends(require_permission(["manage_lessons", "editar"])),
+):
+    try:
+        return await LessonServices.reorder_lessons(course_id, order.lesson_ids)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to reorder lessons: {e}")
+
+
+@lesson_router.post(
+    "/bulk",
+    summary="Create many lessons",
+    tags=["Lesson"],
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_create_lessons(
+    current_user: User = Depends(require_permission(["manage_lessons", "crear"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Stop at the first failed item."),
+):
+    try:
+        return await LessonServices.bulk_create_lessons(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@lesson_router.put(
+    "/bulk",
+    summary="Update many lessons",
+    tags=["Lesson"],
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_update_lessons(
+    current_user: User = Depends(require_permission(["manage_lessons", "editar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Stop at the first failed item."),
+):
+    try:
+        return await LessonServices.bulk_update_lessons(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@lesson_router.post(
+    "/bulk/delete",
+    summary="Delete many lessons",
+    tags=["Lesson"],
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_delete_lessons(
+    current_user: User = Depends(require_permission(["manage_lessons", "eliminar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Stop at the first failed item."),
+):
+    try:
+        return await LessonServices.bulk_delete_lessons(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
 @lesson_router.get("/{lesson_id}", summary="Get a lesson by id", tags=["Lesson"])
-async def get_lesson_by_id(lesson_id: PydanticObjectId):
+async def get_lesson_by_id(request: Request, lesson_id: PydanticObjectId):
     try:
-        lesson = await LessonServices.get_lesson_by_id(lesson_id)
-        return lesson
+        return await conditional_json_response(
+            request, Lesson, lesson_id,
+            lambda: LessonServices.get_lesson_by_id(lesson_id),
+        )
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
 
 
 @lesson_router.get("/", summary="Get all lessons", tags=["Lesson"])
-async def get_all_lessons():
+async def get_all_lessons(
+    request: Request,
+    params: PageParams = Depends(),
+    course_from: Optional[PydanticObjectId] = None,
+):
     try:
-        lesson = await LessonServices.get_all_lessons()
-        return lesson
+        filters = filters_from(course_from=course_from)
+        lesson = await LessonServices.get_all_lessons(params, filters)
+        return hashed_json_response(request, lesson)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
 
@@ -1,7 +1,9 @@
+from typing import Optional
 from beanie import PydanticObjectId
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from schemas.permission_schema import PermissionCreate, PermissionUpdate
 from services.permission_services import PermissionsServices
+from utils.pagination_utils import PageParams, filters_from
 
 
 permission_router = APIRouter()
@@ -18,9 +20,13 @@ async def create_permission_handler(data: PermissionCreate):
         )
     
 @permission_router.get("/")
-async def get_all_permissions_handler():
+async def get_all_permissions_handler(
+    params: PageParams = Depends(), name: Optional[str] = None
+):
     try:
-        return await PermissionsServices.get_all_permissions()
+        return await PermissionsServices.get_all_permissions(
+            params, filters_from(name=name)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -7,7 +7,8 @@ from services.permission_services import PermissionsServices
 from services.role_services import RoleService
 from services.user_services import UserServices
 from utils.permission_utils import require_permission
-from typing import List
+from typing import List, Optional
+from utils.pagination_utils import PageParams, filters_from
 
 role_router = APIRouter()
 
@@ -27,10 +28,12 @@ async def create_new_role(
 
 @role_router.get("/")
 async def get_all_roles_handler(
-    current_user: User = Depends(require_permission(["manage_roles", "lectura"]))
+    params: PageParams = Depends(),
+    name: Optional[str] = None,
+    current_user: User = Depends(require_permission(["manage_roles", "lectura"])),
 ):
     try:
-        roles = await RoleService.get_all_roles()
+        roles = await RoleService.get_all_roles(params, filters_from(name=name))
         return roles
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -3,10 +3,11 @@ from fastapi import (
     Request,
     HTTPException,
     status,
-    BackgroundTasks,
     Depends,
+    Query,
 )
 from core.config import settings
+from models.user_model import User
 from schemas.stripe_schemas import (
     WebhookResponse,
     ProductCreate,
@@ -14,10 +15,12 @@ from schemas.stripe_schemas import (
     SubscriptionCreate,
     SubscriptionResponse,
 )
+from schemas.general_schemas import Page
 from services.stripe.stripe_services import StripeServices
 from utils.exceptions import StripeError, WebhookError
 from utils.logger import logger
-from typing import List
+from utils.permission_utils import require_permission
+from typing import List, Optional
 
 
 stripe_router = APIRouter()
@@ -49,15 +52,14 @@ async def create_checkout_session(request: Request):
 @stripe_router.post("/webhook", response_model=WebhookResponse)
 async def webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     stripe_service: StripeServices = Depends(),
 ):
     """
-    Endpoint para recibir webhooks de Stripe.
+    Endpoint para recibir webhooks de Stripe. Solo verifica la firma y guarda
+    el evento en la bandeja `webhook_events`; el worker lo procesa después.
 
     Args:
         request (Request): Objeto Request con los datos del webhook.
-        background_tasks (BackgroundTasks): Objeto para procesar tareas en segundo plano.
         stripe_service (StripeServices): Servicio de Stripe inyectado.
 
     Returns:
@@ -67,7 +69,7 @@ async def webhook(
         HTTPException: Si hay un error en la verificación o procesamiento del webhook.
     """
     try:
-        result = await stripe_service.webhook_received(request, background_tasks)
+        result = await stripe_service.webhook_received(request)
         return WebhookResponse(
             status=result["status"],
             event_id=result["event_id"],
@@ -78,33 +80,11 @@ async def webhook(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@stripe_router.get("/webhook-config")
-async def get_webhook_config():
-    """
-    Verifica la configuración actual del webhook.
-
-    Returns:
-        dict: Estado de la configuración del webhook incluyendo:
-            - webhook_secret_configured (bool): Si el secret está configurado
-            - webhook_secret_length (int): Longitud del secret
-            - webhook_secret_prefix (str): Primeros caracteres del secret
-    """
-    return {
-        "webhook_secret_configured": bool(settings.STRIPE_WEBHOOK_SECRET),
-        "webhook_secret_length": (
-            len(settings.STRIPE_WEBHOOK_SECRET) if settings.STRIPE_WEBHOOK_SECRET else 0
-        ),
-        "webhook_secret_prefix": (
-            settings.STRIPE_WEBHOOK_SECRET[:4] + "..."
-            if settings.STRIPE_WEBHOOK_SECRET
-            else None
-        ),
-    }
-
-
 @stripe_router.post("/products", response_model=ProductResponse)
 async def create_product(
-    product: ProductCreate, stripe_service: StripeServices = Depends()
+    product: ProductCreate,
+    current_user: User = Depends(require_permission(["manage_stripe", "crear"])),
+    stripe_service: StripeServices = Depends(),
 ):
     """
     Crea un nuevo producto con su precio asociado.
@@ -141,7 +121,9 @@ async def list_products(stripe_service: StripeServices = Depends()):
 
 @stripe_router.post("/subscriptions", response_model=list[SubscriptionResponse])
 async def create_subscription(
-    subscription: SubscriptionCreate, stripe_service: StripeServices = Depends()
+    subscription: SubscriptionCreate,
+    current_user: User = Depends(require_permission(["manage_stripe", "crear"])),
+    stripe_service: StripeServices = Depends(),
 ):
     """
     Crea una nueva suscripción.
@@ -159,26 +141,43 @@ async def create_subscription(
     return await stripe_service.create_subscription(subscription)
 
 
-@stripe_router.get("/subscriptions", response_model=list[SubscriptionResponse])
-async def get_subscriptions(stripe_service: StripeServices = Depends()):
+@stripe_router.get("/subscriptions", response_model=Page[SubscriptionResponse])
+async def get_subscriptions(
+    status: Optional[str] = Query("active", description="Estado; vacío para todos."),
+    customer_id: Optional[str] = Query(None, description="Cliente de Stripe."),
+    cursor: Optional[str] = Query(None, description="`next_cursor` de la página anterior."),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    current_user: User = Depends(require_permission(["manage_stripe", "lectura"])),
+    stripe_service: StripeServices = Depends(),
+):
     """
-    Lista todas las suscripciones activas.
+    Lista las suscripciones desde el espejo local, paginadas en orden de
+    renovación.
 
     Args:
+        status (str): Estado de las suscripciones (default: active).
+        customer_id (str): Solo las de este cliente.
+        cursor (str): Cursor de la página anterior.
+        limit (int): Tamaño de la página.
         stripe_service (StripeServices): Servicio de Stripe inyectado.
 
     Returns:
-        list[SubscriptionResponse]: Lista de suscripciones activas.
+        Page[SubscriptionResponse]: Página de suscripciones.
 
     Raises:
-        HTTPException: Si hay un error al obtener las suscripciones.
+        HTTPException: Si el cursor no es válido.
     """
-    return await stripe_service.get_subscriptions()
+    return await stripe_service.get_subscriptions(
+        status or None, customer_id, cursor, limit
+    )
 
 
 @stripe_router.get("/subscriptions/search")
 async def search_subscription(
-    status: str, order_id: str, stripe_service: StripeServices = Depends()
+    status: str,
+    order_id: str,
+    current_user: User = Depends(require_permission(["manage_stripe", "lectura"])),
+    stripe_service: StripeServices = Depends(),
 ):
     """
     Busca una suscripción por estado y ID de pedido.
@@ -199,7 +198,9 @@ async def search_subscription(
 
 @stripe_router.delete("/subscriptions/{subscription_id}")
 async def cancel_subscription(
-    subscription_id: str, stripe_service: StripeServices = Depends()
+    subscription_id: str,
+    current_user: User = Depends(require_permission(["manage_stripe", "eliminar"])),
+    stripe_service: StripeServices = Depends(),
 ):
     """
     Cancela una suscripción.
@@ -219,7 +220,9 @@ async def cancel_subscription(
 
 @stripe_router.post("/resume-subscription/{subscription_id}")
 async def resume_subscription(
-    subscription_id: str, stripe_service: StripeServices = Depends()
+    subscription_id: str,
+    current_user: User = Depends(require_permission(["manage_stripe", "editar"])),
+    stripe_service: StripeServices = Depends(),
 ):
     """
     Reanuda una suscripción.
@@ -235,23 +238,3 @@ async def resume_subscription(
         HTTPException: Si hay un error al reanudar la suscripción.
     """
     return await stripe_service.resume_subscription(subscription_id)
-
-
-@stripe_router.post("/create-checkout-session/{price_id}")
-async def create_checkout_session(
-    price_id: str, stripe_service: StripeServices = Depends()
-):
-    """
-    Crea una sesión de checkout para un precio específico.
-
-    Args:
-        price_id (str): ID del precio en Stripe.
-        stripe_service (StripeServices): Servicio de Stripe inyectado.
-
-    Returns:
-        dict: URL de la sesión de checkout.
-
-    Raises:
-        HTTPException: Si hay un error al crear la sesión.
-    """
-    return await stripe_service.create_checkout_session(price_id)
@@ -1,9 +1,21 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from api.deps.user_deps import get_current_user
+from schemas.bulk_schema import BulkReport
 from schemas.user_schema import UserCreate, UserResponse, UserUpdate
 from services.user_services import UserServices
 from models.user_model import User
+from utils.bulk_utils import BULK_OPENAPI, read_bulk_items
+from utils.http_cache_utils import conditional_json_response, hashed_json_response
+from utils.import_utils import (
+    IMPORT_OPENAPI,
+    ImportFormat,
+    import_format,
+    iter_rows,
+)
+from utils.pagination_utils import PageParams, filters_from
+from utils.streaming_utils import ExportFormat, stream_response
 from utils.permission_utils import require_permission
 
 users_router = APIRouter()
@@ -74,20 +86,126 @@ async def get_me(user: User = Depends(get_current_user)):
 
 @users_router.get("/", summary="Se obtienen todos los usuarios")
 async def get_all_users(
+    request: Request,
+    params: PageParams = Depends(),
+    active: Optional[bool] = None,
+    is_teacher: Optional[bool] = None,
+    is_student: Optional[bool] = None,
     # current_user: User = Depends(require_permission("user:read"))
 ):
     try:
-        result = await UserServices.get_all_users_service()
-        return result
+        filters = filters_from(
+            active=active, is_teacher=is_teacher, is_student=is_student
+        )
+        result = await UserServices.get_all_users_service(params, filters)
+        return hashed_json_response(request, result)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.detail)
 
 
+@users_router.get("/export", summary="Exporta todos los usuarios en streaming")
+async def export_users(
+    current_user: User = Depends(require_permission(["manage_users", "lectura"])),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    active: Optional[bool] = None,
+    is_teacher: Optional[bool] = None,
+    is_student: Optional[bool] = None,
+):
+    filters = filters_from(active=active, is_teacher=is_teacher, is_student=is_student)
+    return stream_response(
+        UserServices.export_users_service(filters), export_format, "users"
+    )
+
+
+@users_router.post(
+    "/import-students",
+    summary="Importa alumnos desde un CSV o NDJSON en streaming",
+    openapi_extra=IMPORT_OPENAPI,
+)
+async def import_students(
+    request: Request,
+    current_user: User = Depends(require_permission(["manage_users", "crear"])),
+    upload_format: ImportFormat = Depends(import_format),
+):
+    """
+    Columnas username, email y password. La respuesta es NDJSON: un evento
+    `error` por fila rechazada, un `progress` por bloque y un `done` al final.
+
+    El cuerpo se procesa conforme llega; la respuesta se envía al terminar
+    porque StreamingResponse consume el canal de receive del request.
+    """
+    rows = iter_rows(request.stream(), upload_format)
+    events = [event async for event in UserServices.import_students(rows)]
+    return Response(
+        content="".join(event.model_dump_json() + "\n" for event in events),
+        media_type="application/x-ndjson",
+    )
+
+
+@users_router.post(
+    "/bulk",
+    summary="Se crean varios usuarios",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_create_users(
+    current_user: User = Depends(require_permission(["manage_users", "crear"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await UserServices.bulk_create_users(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@users_router.put(
+    "/bulk",
+    summary="Se actualizan varios usuarios",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_update_users(
+    current_user: User = Depends(require_permission(["manage_users", "editar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await UserServices.bulk_update_users(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
+@users_router.post(
+    "/bulk/delete",
+    summary="Se eliminan varios usuarios",
+    response_model=BulkReport,
+    openapi_extra=BULK_OPENAPI,
+)
+async def bulk_delete_users(
+    current_user: User = Depends(require_permission(["manage_users", "eliminar"])),
+    items: list = Depends(read_bulk_items),
+    ordered: bool = Query(False, description="Detenerse en el primer item fallido."),
+):
+    try:
+        return await UserServices.bulk_delete_users(items, ordered)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{e}")
+
+
 @users_router.get("/{user_id}", summary="Se obtiene un usuario por su ID")
-async def get_user_by_id(user_id: str):
+async def get_user_by_id(request: Request, user_id: str):
     try:
-        result = await UserServices.get_user_by_id_service(user_id)
-        return result
+        return await conditional_json_response(
+            request, User, user_id,
+            lambda: UserServices.get_user_by_id_service(user_id),
+        )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.detail)
 
@@ -1,3 +1,5 @@
+import importlib
+
 from fastapi import APIRouter
 from api.v1.handlers import (
     user_handler,
@@ -5,15 +7,23 @@ from api.v1.handlers import (
     permission_handler,
     file_handler,
     course_handler,
+    enrollment_handler,
     lesson_handler,
     health_check_handler,
     verification_codes_handler,
-    account_utils_handler
 )
 from api.auth.jwt import auth_router
+from core.config import settings
 
 router = APIRouter()
 
+# Routers poco usados: con LAZY_ROUTERS se importan hasta su primer request
+# (ver DeferredRoutersMiddleware en main.py).
+deferred_routers = [
+    ("/account-utils", "api.v1.handlers.account_utils_handler", "account_utils_router", ["Account Utils"]),
+    ("/stripe", "api.v1.handlers.stripe_handler", "stripe_router", ["Stripe"]),
+]
+
 
 router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 router.include_router(user_handler.users_router, prefix="/user", tags=["Users"])
@@ -24,7 +34,14 @@ router.include_router(
 router.include_router(file_handler.file_router, prefix="/file", tags=["Files"])
 router.include_router(course_handler.course_router, prefix="/course", tags=["Courses"])
 router.include_router(lesson_handler.lesson_router, prefix="/lesson", tags=["Lessons"])
+router.include_router(
+    enrollment_handler.enrollment_router, prefix="/enrollment", tags=["Enrollment"]
+)
 router.include_router(health_check_handler.health_check_router, prefix="/health-check",
                       tags=["Health Check"]),
 router.include_router(verification_codes_handler.verification_codes_router, prefix="/verification-codes", tags=["Verification Codes"])
-router.include_router(account_utils_handler.account_utils_router, prefix="/account-utils", tags=["Account Utils"])
+
+if not settings.LAZY_ROUTERS:
+    for prefix, module_path, attribute, tags in deferred_routers:
+        module = importlib.import_module(module_path)
+        router.include_router(getattr(module, attribute), prefix=prefix, tags=tags)
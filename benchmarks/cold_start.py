@@ -0,0 +1,147 @@
+"""
+Benchmark de cold start del handler de Lambda.
+
+Cada corrida es un proceso nuevo (como un contenedor nuevo de Lambda) que
+mide el tiempo de importar `main` y el de la primera respuesta de
+`main.handler` a un evento de API Gateway, seguido de una segunda invocación
+(warm) para comparar.
+
+Uso:
+    python -m benchmarks.cold_start --runs 3
+    python -m benchmarks.cold_start --no-lifespan   # sin base de datos
+    python -m benchmarks.cold_start --importtime 15 # módulos más lentos
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PATH = "/api/v1/health-check/"
+
+
+def _event(path: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "localhost", "x-forwarded-proto": "https"},
+        "requestContext": {
+            "accountId": "bench",
+            "apiId": "bench",
+            "domainName": "localhost",
+            "http": {
+                "method": "GET",
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "cold-start-bench",
+            },
+            "requestId": "bench",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "01/Jan/2024:00:00:00 +0000",
+            "timeEpoch": 0,
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def child(no_lifespan: bool) -> None:
+    started = time.perf_counter()
+    import main
+
+    import_ms = (time.perf_counter() - started) * 1000
+
+    handler = main.handler
+    if no_lifespan:
+        from mangum import Mangum
+
+        handler = Mangum(main.app, lifespan="off")
+
+    timings = []
+    status = None
+    for _ in range(2):
+        invoked = time.perf_counter()
+        response = handler(_event(PATH), None)
+        timings.append((time.perf_counter() - invoked) * 1000)
+        status = response["statusCode"]
+
+    print(
+        json.dumps(
+            {
+                "import_ms": import_ms,
+                "first_response_ms": timings[0],
+                "warm_response_ms": timings[1],
+                "time_to_first_response_ms": import_ms + timings[0],
+                "status": status,
+            }
+        )
+    )
+
+
+def _run_child(no_lifespan: bool) -> dict:
+    cmd = [sys.executable, "-m", "benchmarks.cold_start", "--child"]
+    if no_lifespan:
+        cmd.append("--no-lifespan")
+    env = {"AWS_LAMBDA_FUNCTION_NAME": "cold-start-bench", **os.environ}
+    output = subprocess.run(
+        cmd, capture_output=True, text=True, check=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _slowest_imports(limit: int) -> list:
+    env = {"AWS_LAMBDA_FUNCTION_NAME": "cold-start-bench", **os.environ}
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, env=env,
+    ).stderr
+    direct = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(.+)", line)
+        # Cada nivel de anidación agrega dos espacios; nos quedamos con los
+        # imports que hace `main` directamente
+        if match and len(match.group(3)) == 3:
+            direct.append((int(match.group(2)), match.group(4).strip()))
+    return sorted(direct, reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-lifespan", action="store_true")
+    parser.add_argument("--importtime", type=int, default=0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.no_lifespan)
+        return
+
+    reports = [_run_child(args.no_lifespan) for _ in range(args.runs)]
+    for key in (
+        "import_ms",
+        "first_response_ms",
+        "time_to_first_response_ms",
+        "warm_response_ms",
+    ):
+        values = [report[key] for report in reports]
+        print(
+            f"{key:>26}: median {statistics.median(values):8.1f} ms  "
+            f"min {min(values):8.1f}  max {max(values):8.1f}"
+        )
+    print(f"{'status':>26}: {sorted({report['status'] for report in reports})}")
+
+    if args.importtime:
+        print("\nSlowest imports made by main (cumulative):")
+        for cumulative_us, module in _slowest_imports(args.importtime):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark de una ráfaga de logins.
+
+Compara verificar bcrypt directamente en el event loop contra hacerlo en el
+pool de PasswordHasher, midiendo logins por segundo y la latencia del event
+loop (cuánto se retrasa un tick de 10 ms) mientras dura la ráfaga.
+
+Uso:
+    python -m benchmarks.login_throughput --logins 40 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# La configuración exige estas variables; para el benchmark no importan
+for _name in (
+    "DATABASE_URL", "DATABASE_NAME", "PROJECT_NAME", "API_V1_STR", "SECRET_KEY",
+    "ALGORITHM", "JWT_SECRET_KEY", "JWT_REFRESH_SECRET_KEY", "STRIPE_SECRET_KEY",
+    "STRIPE_PUBLISHABLE_KEY", "STRIPE_WEBHOOK_SECRET", "FRONTEND_URL",
+):
+    os.environ.setdefault(_name, "benchmark")
+
+from core.password_hasher import PasswordHasher  # noqa: E402
+from utils.auth_utils import get_password_hash, verify_password  # noqa: E402
+
+TICK_SECONDS = 0.01
+
+
+async def _measure_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+
+async def _storm(verify, logins: int, hashed: str) -> dict:
+    stop = asyncio.Event()
+    lag_samples: list = []
+    ticker = asyncio.create_task(_measure_lag(stop, lag_samples))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(verify("password", hashed) for _ in range(logins))
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    assert all(results)
+    lag_samples = lag_samples or [0.0]
+    return {
+        "logins_per_second": logins / elapsed,
+        "elapsed_s": elapsed,
+        "loop_lag_max_ms": max(lag_samples),
+        "loop_lag_p50_ms": statistics.median(lag_samples),
+        "loop_ticks": len(lag_samples),
+    }
+
+
+async def main(logins: int, workers: int):
+    hashed = get_password_hash("password")
+
+    async def inline_verify(password, hashed_password):
+        return verify_password(password, hashed_password)
+
+    hasher = PasswordHasher(workers)
+
+    async def pooled_verify(password, hashed_password):
+        return await hasher.run(verify_password, password, hashed_password)
+
+    for name, verify in (("inline", inline_verify), ("pool", pooled_verify)):
+        report = await _storm(verify, logins, hashed)
+        print(
+            f"{name:>6}: {report['logins_per_second']:7.1f} logins/s  "
+            f"elapsed {report['elapsed_s']:.2f}s  "
+            f"loop lag max {report['loop_lag_max_ms']:8.1f} ms  "
+            f"p50 {report['loop_lag_p50_ms']:6.1f} ms  "
+            f"ticks {report['loop_ticks']}"
+        )
+    print(f"  pool stats: {hasher.stats()}")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers))
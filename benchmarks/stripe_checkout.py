@@ -0,0 +1,159 @@
+"""
+Benchmark de creación concurrente de sesiones de checkout.
+
+Levanta un servidor local que imita a Stripe (responde con `--latency` ms de
+retraso) y lanza `--checkouts` creaciones concurrentes de dos formas: con el
+SDK síncrono llamado desde `async def` (como estaban los servicios) y con
+StripeGateway (SDK async sobre httpx con pool). Reporta checkouts por
+segundo, la latencia del event loop y cuántas conexiones TCP abrió cada uno.
+
+Uso:
+    python -m benchmarks.stripe_checkout --checkouts 100 --latency 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# La configuración exige estas variables; para el benchmark no importan
+for _name in (
+    "DATABASE_URL", "DATABASE_NAME", "PROJECT_NAME", "API_V1_STR", "SECRET_KEY",
+    "ALGORITHM", "JWT_SECRET_KEY", "JWT_REFRESH_SECRET_KEY", "STRIPE_SECRET_KEY",
+    "STRIPE_PUBLISHABLE_KEY", "STRIPE_WEBHOOK_SECRET", "FRONTEND_URL",
+):
+    os.environ.setdefault(_name, "benchmark")
+
+import stripe  # noqa: E402
+
+from core.stripe_gateway import StripeGateway  # noqa: E402
+
+TICK_SECONDS = 0.01
+CHECKOUT_PARAMS = {
+    "mode": "subscription",
+    "line_items": [{"price": "price_benchmark", "quantity": 1}],
+    "success_url": "https://example.com/success",
+    "cancel_url": "https://example.com/cancel",
+}
+
+
+class StubStripe(ThreadingHTTPServer):
+    """Servidor HTTP/1.1 con keep-alive que responde como Stripe."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.server.latency)
+        session_id = f"cs_test_{time.perf_counter_ns()}"
+        body = json.dumps(
+            {
+                "id": session_id,
+                "object": "checkout.session",
+                "url": f"https://checkout.stripe.com/c/pay/{session_id}",
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _measure_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+
+async def _storm(create, checkouts: int, server: StubStripe) -> dict:
+    connections_before = server.connections
+    stop = asyncio.Event()
+    lag_samples: list = []
+    ticker = asyncio.create_task(_measure_lag(stop, lag_samples))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    sessions = await asyncio.gather(*(create() for _ in range(checkouts)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    assert all(session.url for session in sessions)
+    lag_samples = lag_samples or [0.0]
+    return {
+        "checkouts_per_second": checkouts / elapsed,
+        "elapsed_s": elapsed,
+        "loop_lag_max_ms": max(lag_samples),
+        "loop_lag_p50_ms": statistics.median(lag_samples),
+        "connections": server.connections - connections_before,
+    }
+
+
+async def main(checkouts: int, latency_ms: int):
+    server = StubStripe(latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stripe.api_key = "sk_test_benchmark"
+    stripe.api_base = server.url
+
+    async def sync_create():
+        # Como estaban los servicios: el SDK síncrono dentro de async def
+        return stripe.checkout.Session.create(**CHECKOUT_PARAMS)
+
+    gateway = StripeGateway(api_base=server.url)
+
+    async def gateway_create():
+        return await gateway.client.checkout.sessions.create_async(
+            params=CHECKOUT_PARAMS
+        )
+
+    for name, create in (("sync", sync_create), ("gateway", gateway_create)):
+        # Calentamiento: imports y cliente HTTP fuera de la medición
+        await create()
+        report = await _storm(create, checkouts, server)
+        print(
+            f"{name:>8}: {report['checkouts_per_second']:7.1f} checkouts/s  "
+            f"elapsed {report['elapsed_s']:.2f}s  "
+            f"loop lag max {report['loop_lag_max_ms']:8.1f} ms  "
+            f"p50 {report['loop_lag_p50_ms']:6.1f} ms  "
+            f"connections {report['connections']}"
+        )
+
+    await gateway.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checkouts", type=int, default=100)
+    parser.add_argument("--latency", type=int, default=50, help="ms por respuesta")
+    args = parser.parse_args()
+    asyncio.run(main(args.checkouts, args.latency))
@@ -0,0 +1,186 @@
+import asyncio
+from typing import Awaitable, Callable, NamedTuple, Optional, Protocol
+
+from core.config import settings
+from utils.cache_utils import TTLCache
+from utils.http_cache_utils import make_etag
+
+GENERATION_KEY = "catalog:generation"
+
+
+class CatalogEntry(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def get_counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend:
+    """LRU en memoria del proceso (default)."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class RedisCacheBackend:
+    """
+    Redis compartido entre procesos. Dependencia opcional: `pip install redis`.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CATALOG_CACHE_BACKEND=redis requiere instalar redis")
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, ex=max(1, int(ttl)))
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self._redis.get(key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class FakeRedisCacheBackend(RedisCacheBackend):
+    """fakeredis en memoria, para pruebas locales del backend de Redis."""
+
+    def __init__(self, url: str = ""):
+        try:
+            from fakeredis import aioredis
+        except ImportError:
+            raise RuntimeError(
+                "CATALOG_CACHE_BACKEND=fakeredis requiere instalar fakeredis"
+            )
+        self._redis = aioredis.FakeRedis()
+
+
+def get_cache_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return MemoryCacheBackend(
+            settings.CATALOG_CACHE_MAX_SIZE, settings.CATALOG_CACHE_TTL_SECONDS
+        )
+    if name == "redis":
+        return RedisCacheBackend(settings.CATALOG_CACHE_URL)
+    if name == "fakeredis":
+        return FakeRedisCacheBackend()
+    raise RuntimeError(f"CATALOG_CACHE_BACKEND desconocido: {name}")
+
+
+class CatalogCache:
+    """
+    Cache read-through del catálogo de cursos: guarda el JSON ya serializado
+    junto con su ETag.
+
+    Las llaves incluyen una generación; invalidar es incrementarla, con lo que
+    todas las entradas anteriores quedan huérfanas y expiran por TTL. Con Redis
+    la generación es compartida, así que una escritura invalida a todos los
+    procesos. Los misses concurrentes de la misma llave comparten una sola
+    carga (single-flight).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = settings.CATALOG_CACHE_TTL_SECONDS,
+    ):
+        self.backend = backend or get_cache_backend(settings.CATALOG_CACHE_BACKEND)
+        self.ttl = ttl
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[bytes]]
+    ) -> CatalogEntry:
+        generation = await self.backend.get_counter(GENERATION_KEY)
+        key = f"catalog:{generation}:{key}"
+
+        raw = await self.backend.get(key)
+        if raw is not None:
+            self.hits += 1
+            return _decode(raw)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await loader()
+            entry = CatalogEntry(body, make_etag(body))
+            await self.backend.set(key, _encode(entry), self.ttl)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita el aviso "exception was never retrieved" si nadie esperaba
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def invalidate(self) -> None:
+        self.invalidations += 1
+        await self.backend.incr(GENERATION_KEY)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "inflight": len(self._inflight),
+            **self.backend.stats(),
+        }
+
+
+def _encode(entry: CatalogEntry) -> bytes:
+    return entry.etag.encode("utf-8") + b"\n" + entry.body
+
+
+def _decode(raw: bytes) -> CatalogEntry:
+    etag, body = raw.split(b"\n", 1)
+    return CatalogEntry(body, etag.decode("utf-8"))
+
+
+catalog_cache = CatalogCache()
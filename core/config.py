@@ -5,10 +5,22 @@ from decouple import config
 class Settings(BaseSettings):
     DATABASE_URL: str = config("DATABASE_URL")
     DATABASE_NAME: str = config("DATABASE_NAME")
+    MONGO_MAX_POOL_SIZE: int = config("MONGO_MAX_POOL_SIZE", default=100, cast=int)
+    MONGO_MIN_POOL_SIZE: int = config("MONGO_MIN_POOL_SIZE", default=2, cast=int)
+    MONGO_MAX_IDLE_TIME_MS: int = config(
+        "MONGO_MAX_IDLE_TIME_MS", default=60000, cast=int
+    )
+    # Se usa el primero que soporten cliente y servidor
+    MONGO_COMPRESSORS: str = config("MONGO_COMPRESSORS", default="zstd,snappy,zlib")
 
     PROJECT_NAME: str = config("PROJECT_NAME")
     API_V1_STR: str = config("API_V1_STR")
 
+    # AWS define AWS_LAMBDA_FUNCTION_NAME dentro de Lambda
+    IS_LAMBDA: bool = bool(config("AWS_LAMBDA_FUNCTION_NAME", default=""))
+    # Importa los routers poco usados hasta su primer request
+    LAZY_ROUTERS: bool = config("LAZY_ROUTERS", default=IS_LAMBDA, cast=bool)
+
     SECRET_KEY: str = config("SECRET_KEY")
     ALGORITHM: str = config("ALGORITHM")
 
@@ -18,11 +30,111 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str = config("STRIPE_SECRET_KEY")
     STRIPE_PUBLISHABLE_KEY: str = config("STRIPE_PUBLISHABLE_KEY")
     STRIPE_WEBHOOK_SECRET: str = config("STRIPE_WEBHOOK_SECRET")
+    # Cliente HTTP de Stripe (core/stripe_gateway.py)
+    STRIPE_API_BASE: str = config("STRIPE_API_BASE", default="https://api.stripe.com")
+    STRIPE_TIMEOUT_SECONDS: float = config(
+        "STRIPE_TIMEOUT_SECONDS", default=30, cast=float
+    )
+    STRIPE_CONNECT_TIMEOUT_SECONDS: float = config(
+        "STRIPE_CONNECT_TIMEOUT_SECONDS", default=5, cast=float
+    )
+    STRIPE_MAX_NETWORK_RETRIES: int = config(
+        "STRIPE_MAX_NETWORK_RETRIES", default=2, cast=int
+    )
+    STRIPE_MAX_CONNECTIONS: int = config("STRIPE_MAX_CONNECTIONS", default=50, cast=int)
+    STRIPE_MAX_KEEPALIVE_CONNECTIONS: int = config(
+        "STRIPE_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int
+    )
+    STRIPE_KEEPALIVE_SECONDS: float = config(
+        "STRIPE_KEEPALIVE_SECONDS", default=30, cast=float
+    )
+    # Catálogo local de productos/precios (core/stripe_catalog.py)
+    STRIPE_CATALOG_REFRESH_SECONDS: int = config(
+        "STRIPE_CATALOG_REFRESH_SECONDS", default=60, cast=int
+    )
+    STRIPE_CATALOG_RECONCILE_SECONDS: int = config(
+        "STRIPE_CATALOG_RECONCILE_SECONDS", default=3600, cast=int
+    )
+    # En Lambda se usa scripts/sync_stripe_catalog.py desde una tarea programada
+    STRIPE_CATALOG_RECONCILE_ENABLED: bool = config(
+        "STRIPE_CATALOG_RECONCILE_ENABLED", default=not IS_LAMBDA, cast=bool
+    )
     FRONTEND_URL: str = config("FRONTEND_URL")
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 999
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
 
+    PRINCIPAL_CACHE_TTL_SECONDS: int = config(
+        "PRINCIPAL_CACHE_TTL_SECONDS", default=60, cast=int
+    )
+    PRINCIPAL_CACHE_MAX_SIZE: int = config(
+        "PRINCIPAL_CACHE_MAX_SIZE", default=2048, cast=int
+    )
+    PERMISSION_REGISTRY_REFRESH_SECONDS: int = config(
+        "PERMISSION_REGISTRY_REFRESH_SECONDS", default=300, cast=int
+    )
+    # Cada cuánto se compara la versión de permisos/roles guardada en Mongo
+    PERMISSION_REGISTRY_VERSION_CHECK_SECONDS: float = config(
+        "PERMISSION_REGISTRY_VERSION_CHECK_SECONDS", default=2, cast=float
+    )
+    TOKEN_BLACKLIST_CAPACITY: int = config(
+        "TOKEN_BLACKLIST_CAPACITY", default=100000, cast=int
+    )
+    TOKEN_BLACKLIST_REFRESH_SECONDS: int = config(
+        "TOKEN_BLACKLIST_REFRESH_SECONDS", default=30, cast=int
+    )
+    # Ventana que el delta de revocaciones vuelve a leer hacia atrás
+    TOKEN_BLACKLIST_OVERLAP_SECONDS: int = config(
+        "TOKEN_BLACKLIST_OVERLAP_SECONDS", default=120, cast=int
+    )
+    # "jose" (python-jose) o "pyjwt"
+    JWT_BACKEND: str = config("JWT_BACKEND", default="jose")
+    TOKEN_CLAIMS_CACHE_SIZE: int = config(
+        "TOKEN_CLAIMS_CACHE_SIZE", default=10000, cast=int
+    )
+    TOKEN_CLAIMS_CACHE_TTL_SECONDS: int = config(
+        "TOKEN_CLAIMS_CACHE_TTL_SECONDS", default=300, cast=int
+    )
+    # 0 = automático (min(4, núcleos))
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=0, cast=int)
+    PAGE_SIZE_DEFAULT: int = config("PAGE_SIZE_DEFAULT", default=50, cast=int)
+    PAGE_SIZE_MAX: int = config("PAGE_SIZE_MAX", default=200, cast=int)
+    EXPORT_BATCH_SIZE: int = config("EXPORT_BATCH_SIZE", default=500, cast=int)
+    # "memory" (LRU por proceso), "redis" o "fakeredis" (solo pruebas)
+    CATALOG_CACHE_BACKEND: str = config("CATALOG_CACHE_BACKEND", default="memory")
+    CATALOG_CACHE_URL: str = config("CATALOG_CACHE_URL", default="redis://localhost:6379/0")
+    CATALOG_CACHE_TTL_SECONDS: int = config(
+        "CATALOG_CACHE_TTL_SECONDS", default=300, cast=int
+    )
+    CATALOG_CACHE_MAX_SIZE: int = config("CATALOG_CACHE_MAX_SIZE", default=512, cast=int)
+    ENROLLMENT_BUCKET_SIZE: int = config("ENROLLMENT_BUCKET_SIZE", default=500, cast=int)
+    # Endpoints bulk: máximo de items por request y por llamada a bulk_write
+    BULK_MAX_ITEMS: int = config("BULK_MAX_ITEMS", default=5000, cast=int)
+    BULK_BATCH_SIZE: int = config("BULK_BATCH_SIZE", default=1000, cast=int)
+    # Importación de alumnos: filas por consulta `$in` / insert_many
+    IMPORT_CHUNK_SIZE: int = config("IMPORT_CHUNK_SIZE", default=500, cast=int)
+    # Bandeja de webhooks de Stripe. El worker corre dentro del proceso de la
+    # API salvo en Lambda; ahí se usa scripts/run_webhook_worker.py
+    WEBHOOK_WORKER_ENABLED: bool = config(
+        "WEBHOOK_WORKER_ENABLED", default=not IS_LAMBDA, cast=bool
+    )
+    WEBHOOK_WORKER_CONCURRENCY: int = config(
+        "WEBHOOK_WORKER_CONCURRENCY", default=4, cast=int
+    )
+    WEBHOOK_LEASE_SECONDS: int = config("WEBHOOK_LEASE_SECONDS", default=60, cast=int)
+    WEBHOOK_POLL_SECONDS: float = config("WEBHOOK_POLL_SECONDS", default=2, cast=float)
+    WEBHOOK_MAX_ATTEMPTS: int = config("WEBHOOK_MAX_ATTEMPTS", default=8, cast=int)
+    WEBHOOK_RETRY_BASE_SECONDS: int = config(
+        "WEBHOOK_RETRY_BASE_SECONDS", default=30, cast=int
+    )
+    WEBHOOK_RETRY_MAX_SECONDS: int = config(
+        "WEBHOOK_RETRY_MAX_SECONDS", default=3600, cast=int
+    )
+    # Stripe reintenta una entrega hasta por 3 días
+    WEBHOOK_EVENT_RETENTION_DAYS: int = config(
+        "WEBHOOK_EVENT_RETENTION_DAYS", default=30, cast=int
+    )
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Optional
+
+from bson import DBRef
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.permission_registry import permission_registry
+from models.permission_model import Permission
+from models.role_model import Role
+
+DEFAULT_PERMISSIONS = {
+    "crear": "Permiso para crear",
+    "editar": "Permiso para editar",
+    "lectura": "Permiso para lectura",
+    "eliminar": "Permiso para eliminar",
+}
+ADMIN_ROLE = "Administrador"
+USER_ROLE = "User"
+DEFAULT_ROLES = {
+    ADMIN_ROLE: "Permiso para administradores",
+    USER_ROLE: "Permiso para usuarios",
+}
+
+
+async def _upsert(collection, operations: list) -> int:
+    """:return: Cuántos documentos se insertaron"""
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+    except BulkWriteError as e:
+        # Otro proceso insertó el mismo nombre al mismo tiempo (índice único)
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != 11000 for error in errors):
+            raise
+        return e.details.get("nUpserted", 0)
+
+
+class DefaultRoles:
+    """
+    Catálogo de permisos y roles por omisión, sembrado una vez por proceso.
+
+    `ensure_seeded` hace upserts con `$setOnInsert`, así que es idempotente y
+    no pisa cambios hechos desde la API a roles ya existentes. Los ids quedan
+    en memoria y el registro de un usuario solo adjunta el id del rol; se
+    vuelven a sembrar cuando cambia la versión del registro de permisos (p. ej.
+    otro proceso borró uno de los roles).
+    """
+
+    def __init__(self):
+        self._role_ids: dict[str, object] = {}
+        self._version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def seeded(self) -> bool:
+        return bool(self._role_ids)
+
+    async def _is_current(self) -> bool:
+        return self.seeded and await permission_registry.version() == self._version
+
+    async def ensure_seeded(self) -> None:
+        if await self._is_current():
+            return
+        async with self._lock:
+            if not await self._is_current():
+                await self._seed()
+
+    async def _seed(self) -> None:
+        permissions = Permission.get_motor_collection()
+        inserted = await _upsert(
+            permissions,
+            [
+                UpdateOne(
+                    {"name": name},
+                    {"$setOnInsert": {"name": name, "description": description}},
+                    upsert=True,
+                )
+                for name, description in DEFAULT_PERMISSIONS.items()
+            ],
+        )
+        permission_refs = [
+            DBRef(permissions.name, raw["_id"])
+            async for raw in permissions.find(
+                {"name": {"$in": list(DEFAULT_PERMISSIONS)}}, {"_id": 1}
+            )
+        ]
+
+        roles = Role.get_motor_collection()
+        inserted += await _upsert(
+            roles,
+            [
+                UpdateOne(
+                    {"name": name},
+                    {
+                        "$setOnInsert": {
+                            "name": name,
+                            "description": description,
+                            "permissions": permission_refs,
+                        }
+                    },
+                    upsert=True,
+                )
+                for name, description in DEFAULT_ROLES.items()
+            ],
+        )
+        if inserted:
+            await permission_registry.bump_version()
+        # La versión se toma antes de leer los ids: un cambio intermedio
+        # provoca otra siembra en la siguiente llamada
+        self._version = await permission_registry.version()
+        self._role_ids = {
+            raw["name"]: raw["_id"]
+            async for raw in roles.find(
+                {"name": {"$in": list(DEFAULT_ROLES)}}, {"name": 1}
+            )
+        }
+
+    async def role_id(self, is_admin: bool = False):
+        """Id del rol por omisión de un usuario nuevo."""
+        await self.ensure_seeded()
+        return self._role_ids[ADMIN_ROLE if is_admin else USER_ROLE]
+
+    def reset(self, role_id: Optional[object] = None) -> None:
+        """
+        Olvida los ids (todos, o solo si `role_id` es uno de ellos). Solo
+        afecta a este proceso; los demás lo notan por la versión del registro.
+        """
+        if role_id is None or role_id in self._role_ids.values():
+            self._role_ids = {}
+            self._version = None
+
+
+default_roles = DefaultRoles()
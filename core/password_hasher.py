@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from core.config import settings
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt fuera del event loop.
+
+    bcrypt libera el GIL, así que un pool de hilos basta para que un pico de
+    logins no congele el resto de las peticiones. El semáforo limita cuántos
+    hashes corren a la vez; los demás esperan en cola y se cuentan en `waiting`.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        executor = self._get_executor()
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        acquired = False
+        try:
+            async with self._semaphore:
+                acquired = True
+                self.waiting -= 1
+                self.total_wait_seconds += time.perf_counter() - queued_at
+                self.in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(executor, func, *args)
+                finally:
+                    self.in_flight -= 1
+                    self.completed += 1
+        finally:
+            # Cancelado mientras esperaba turno
+            if not acquired:
+                self.waiting -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "avg_wait_ms": (
+                self.total_wait_seconds / self.completed * 1000
+                if self.completed
+                else 0.0
+            ),
+        }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
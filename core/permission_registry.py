@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Iterable, Optional
+
+from beanie import Link
+from pymongo import ReturnDocument
+
+from core.config import settings
+from models.permission_model import Permission
+from models.role_model import Role
+
+# Versión compartida de permisos y roles: cada escritura la incrementa y los
+# demás procesos recargan al ver un valor distinto
+REGISTRY_STATE_COLLECTION = "_registry_state"
+REGISTRY_STATE_ID = "permissions"
+
+
+def _ref_id(item):
+    """Id de un documento ya resuelto o de un Link sin resolver."""
+    if isinstance(item, Link):
+        return item.ref.id
+    return getattr(item, "id", item)
+
+
+class PermissionRegistry:
+    """
+    Registro en memoria de permisos como bits.
+
+    Cada nombre de permiso recibe un índice de bit estable durante la vida del
+    proceso y cada rol se guarda como una máscara entera, de modo que validar
+    permisos es un AND sin consultas a la base de datos.
+
+    Los cambios hechos en otros procesos se detectan comparando la versión
+    guardada en `_registry_state` a lo más cada `version_check_seconds` (una
+    lectura por `_id`); si cambió, se recarga todo.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: int = settings.PERMISSION_REGISTRY_REFRESH_SECONDS,
+        version_check_seconds: float = settings.PERMISSION_REGISTRY_VERSION_CHECK_SECONDS,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.version_check_seconds = version_check_seconds
+        self._bits: dict[str, int] = {}
+        self._permission_names: dict = {}
+        self._role_permissions: dict = {}
+        self._role_masks: dict = {}
+        self._loaded_at: Optional[float] = None
+        self._version: Optional[int] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def bit_for(self, name: str) -> int:
+        """Regresa el bit del permiso, asignándole uno nuevo si no existe."""
+        if name not in self._bits:
+            self._bits[name] = len(self._bits)
+        return 1 << self._bits[name]
+
+    def compile(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= self.bit_for(name)
+        return mask
+
+    async def load(self) -> None:
+        """Carga todos los permisos y roles (dos consultas) y reconstruye las máscaras."""
+        async with self._lock:
+            await self._load()
+
+    @staticmethod
+    def _state_collection():
+        return Permission.get_motor_collection().database[REGISTRY_STATE_COLLECTION]
+
+    async def _read_version(self) -> int:
+        state = await self._state_collection().find_one({"_id": REGISTRY_STATE_ID})
+        return (state or {}).get("version", 0)
+
+    async def _load(self) -> None:
+        # La versión se lee antes que los datos: un cambio intermedio se
+        # detecta en la siguiente revisión
+        version = await self._read_version()
+        permissions = await Permission.find_all().to_list()
+        roles = await Role.find_all().to_list()
+        self._permission_names = {p.id: p.name for p in permissions}
+        self._role_permissions = {}
+        self._role_masks = {}
+        for permission in permissions:
+            self.bit_for(permission.name)
+        for role in roles:
+            self._set_role(role)
+        self._version = version
+        self._loaded_at = self._checked_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.refresh_seconds
+        )
+
+    def _needs_check(self) -> bool:
+        return time.monotonic() - self._checked_at > self.version_check_seconds
+
+    async def ensure_loaded(self) -> None:
+        if not self._is_stale() and not self._needs_check():
+            return
+        async with self._lock:
+            if self._is_stale():
+                await self._load()
+            elif self._needs_check():
+                if await self._read_version() != self._version:
+                    await self._load()
+                else:
+                    self._checked_at = time.monotonic()
+
+    async def version(self) -> Optional[int]:
+        """Versión vigente del registro, revisada como en `ensure_loaded`."""
+        await self.ensure_loaded()
+        return self._version
+
+    async def bump_version(self) -> None:
+        """
+        Marca un cambio de permisos o roles para los demás procesos. Llamar
+        después de escribir en la base de datos y de actualizar este registro.
+        """
+        state = await self._state_collection().find_one_and_update(
+            {"_id": REGISTRY_STATE_ID},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        # Si otro proceso también escribió, la versión no es la siguiente a
+        # la nuestra y la próxima revisión recarga
+        if self._version is not None and state["version"] == self._version + 1:
+            self._version = state["version"]
+
+    def _set_role(self, role: Role) -> None:
+        permission_ids = {_ref_id(p) for p in role.permissions}
+        self._role_permissions[role.id] = permission_ids
+        self._role_masks[role.id] = self._mask_for_permission_ids(permission_ids)
+
+    def _mask_for_permission_ids(self, permission_ids) -> int:
+        mask = 0
+        for permission_id in permission_ids:
+            name = self._permission_names.get(permission_id)
+            if name is not None:
+                mask |= self.bit_for(name)
+        return mask
+
+    def upsert_permission(self, permission: Permission) -> None:
+        self._permission_names[permission.id] = permission.name
+        self.bit_for(permission.name)
+        self._refresh_roles_with(permission.id)
+
+    def remove_permission(self, permission_id) -> None:
+        self._permission_names.pop(permission_id, None)
+        self._refresh_roles_with(permission_id)
+
+    def upsert_role(self, role: Role) -> None:
+        for permission in role.permissions:
+            if isinstance(permission, Permission):
+                self._permission_names[permission.id] = permission.name
+        self._set_role(role)
+
+    def remove_role(self, role_id) -> None:
+        self._role_permissions.pop(role_id, None)
+        self._role_masks.pop(role_id, None)
+
+    def _refresh_roles_with(self, permission_id) -> None:
+        for role_id, permission_ids in self._role_permissions.items():
+            if permission_id in permission_ids:
+                self._role_masks[role_id] = self._mask_for_permission_ids(
+                    permission_ids
+                )
+
+    def mask_for_roles(self, roles: Iterable) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self._role_masks.get(_ref_id(role), 0)
+        return mask
+
+    def has_all(self, roles: Iterable, required_mask: int) -> bool:
+        return self.mask_for_roles(roles) & required_mask == required_mask
+
+
+permission_registry = PermissionRegistry()
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Union, Any
+from uuid import uuid4
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -19,7 +20,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expires_delta, "sub": str(subject)}
+    to_encode = {"exp": expires_delta, "sub": str(subject), "jti": uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, settings.ALGORITHM)
     return encoded_jwt
 
@@ -34,7 +35,7 @@ def create_refresh_token(
             minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expires_delta, "sub": str(subject)}
+    to_encode = {"exp": expires_delta, "sub": str(subject), "jti": uuid4().hex}
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_REFRESH_SECRET_KEY, settings.ALGORITHM
     )
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from decimal import Decimal
+from typing import Optional
+
+from core.config import settings
+from models.stripe_catalog_model import CatalogPrice, CatalogProduct
+from schemas.stripe_schemas import PriceResponse, ProductResponse
+from utils.logger import logger
+
+
+def _price_response(price: CatalogPrice) -> PriceResponse:
+    return PriceResponse(
+        id=price.id,
+        price=Decimal(price.unit_amount or 0) / 100,
+        currency=price.currency,
+        interval=price.interval,
+        interval_count=price.interval_count,
+        lookup_key=price.lookup_key,
+    )
+
+
+def _product_response(product: CatalogProduct) -> Optional[ProductResponse]:
+    """Un producto activo con al menos un precio activo; el principal es `default_price`."""
+    prices = sorted(
+        (price for price in product.prices if price.active), key=lambda p: p.created
+    )
+    if not product.active or not prices:
+        return None
+    main = next((p for p in prices if p.id == product.default_price), prices[0])
+    return ProductResponse(
+        id=product.id,
+        name=product.name,
+        description=product.description,
+        price_id=main.id,
+        price=Decimal(main.unit_amount or 0) / 100,
+        interval=main.interval,
+        currency=main.currency,
+        active=product.active,
+        prices=[_price_response(price) for price in prices],
+    )
+
+
+class StripeCatalog:
+    """
+    Catálogo de productos y precios de Stripe en memoria, leído de la
+    colección `stripe_products`.
+
+    Resolver un precio (por id o por `lookup_key`) es una búsqueda en un
+    dict y el listado de productos ya está armado. Los webhooks procesados
+    en este proceso invalidan la copia; los de otros procesos se ven al
+    releer la colección cada `refresh_seconds`. Una copia vencida se sigue
+    sirviendo mientras se relee en segundo plano (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: int = settings.STRIPE_CATALOG_REFRESH_SECONDS,
+        reconcile_seconds: int = settings.STRIPE_CATALOG_RECONCILE_SECONDS,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.reconcile_seconds = reconcile_seconds
+        self._products: dict[str, CatalogProduct] = {}
+        self._prices: dict[str, tuple[CatalogProduct, CatalogPrice]] = {}
+        self._listing: list[ProductResponse] = []
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    async def load(self) -> None:
+        async with self._lock:
+            await self._load()
+
+    async def _load(self) -> None:
+        products = await CatalogProduct.find_all().to_list()
+        prices = {}
+        for product in products:
+            for price in product.prices:
+                prices[price.id] = (product, price)
+                if price.lookup_key and price.active:
+                    prices[price.lookup_key] = (product, price)
+        self._products = {product.id: product for product in products}
+        self._prices = prices
+        listing = (_product_response(product) for product in products)
+        self._listing = sorted(
+            (item for item in listing if item is not None), key=lambda p: p.name
+        )
+        self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.refresh_seconds
+        )
+
+    async def ensure_loaded(self) -> None:
+        """
+        Espera la carga solo si no hay copia (o se invalidó); si la copia
+        venció, la sirve y la relee en segundo plano.
+        """
+        if self._loaded_at is None:
+            async with self._lock:
+                if self._loaded_at is None:
+                    await self._load()
+        elif self._is_stale():
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        try:
+            async with self._lock:
+                if self._is_stale():
+                    await self._load()
+        except Exception as e:
+            # Se sigue sirviendo la copia anterior; se reintenta en la siguiente lectura
+            logger.error({"message": "Stripe catalog refresh failed", "error": str(e)})
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def list_products(self) -> list[ProductResponse]:
+        """Productos activos con sus precios activos, ordenados por nombre."""
+        await self.ensure_loaded()
+        return self._listing
+
+    def get_product(self, product_id: Optional[str]) -> Optional[CatalogProduct]:
+        """Producto de la copia en memoria (llamar antes a `ensure_loaded`)."""
+        return self._products.get(product_id)
+
+    async def resolve_price(
+        self, key: str
+    ) -> Optional[tuple[CatalogProduct, CatalogPrice]]:
+        """Producto y precio activos para un id de precio o un `lookup_key`."""
+        await self.ensure_loaded()
+        resolved = self._prices.get(key)
+        if resolved is None or not (resolved[0].active and resolved[1].active):
+            return None
+        return resolved
+
+    def start_reconcile(self) -> None:
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def stop_reconcile(self) -> None:
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+
+    async def _reconcile_loop(self) -> None:
+        # Import diferido: stripe no se carga en el arranque de la API
+        from services.stripe.stripe_catalog_services import StripeCatalogServices
+
+        # Con la colección vacía se sincroniza de inmediato
+        if await CatalogProduct.find_all().count():
+            await asyncio.sleep(self.reconcile_seconds)
+        while True:
+            try:
+                await StripeCatalogServices().sync()
+            except Exception as e:
+                logger.error({"message": "Stripe catalog sync failed", "error": str(e)})
+            await asyncio.sleep(self.reconcile_seconds)
+
+
+stripe_catalog = StripeCatalog()
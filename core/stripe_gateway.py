@@ -0,0 +1,79 @@
+from typing import Optional
+
+from core.config import settings
+
+
+def _pooled_http_client():
+    import anyio
+    import httpx
+    import stripe
+
+    class PooledHTTPXClient(stripe.HTTPXClient):
+        """HTTPXClient del SDK con límites de conexiones configurables."""
+
+        def __init__(self, limits: httpx.Limits, timeout, **kwargs):
+            # El SDK no expone `limits`. No se llama a HTTPXClient.__init__,
+            # que crea su propio AsyncClient y quedaría sin cerrar: se hace
+            # lo mismo que él (stripe 11.x) con el AsyncClient del pool
+            super(stripe.HTTPXClient, self).__init__(**kwargs)
+            self.httpx = httpx
+            self.anyio = anyio
+            self._client_async = httpx.AsyncClient(
+                verify=stripe.ca_bundle_path if self._verify_ssl_certs else False,
+                limits=limits,
+            )
+            self._client = None
+            self._timeout = timeout
+
+    return PooledHTTPXClient(
+        limits=httpx.Limits(
+            max_connections=settings.STRIPE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.STRIPE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.STRIPE_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.STRIPE_TIMEOUT_SECONDS,
+            connect=settings.STRIPE_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+class StripeGateway:
+    """
+    Cliente de Stripe compartido por todos los servicios.
+
+    Usa la interfaz async del SDK (`*_async`) sobre un `httpx.AsyncClient`
+    con keep-alive, así que una llamada a Stripe no bloquea el event loop y
+    las siguientes reutilizan la conexión TLS. Los reintentos (errores de
+    red, 409, 429 y 5xx) los hace el SDK con backoff exponencial con jitter
+    y la misma idempotency key en cada intento.
+    """
+
+    def __init__(self, api_base: Optional[str] = None):
+        self.api_base = api_base or settings.STRIPE_API_BASE
+        self._client = None
+        self._http_client = None
+
+    @property
+    def client(self):
+        # Import diferido: stripe y httpx no se cargan en el arranque de la API
+        if self._client is None:
+            import stripe
+
+            self._http_client = _pooled_http_client()
+            self._client = stripe.StripeClient(
+                settings.STRIPE_SECRET_KEY,
+                http_client=self._http_client,
+                max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+                base_addresses={"api": self.api_base},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.close_async()
+        self._client = None
+        self._http_client = None
+
+
+stripe_gateway = StripeGateway()
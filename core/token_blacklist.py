@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from core.config import settings
+from models.token_model import BlacklistToken
+from utils.bloom_filter import BloomFilter
+
+
+def token_revocation_id(token: str, claims: Optional[dict] = None) -> str:
+    """
+    Identificador con el que se revoca un token: el claim `jti` si existe,
+    o el sha256 del token para los emitidos antes de agregar `jti`.
+    """
+    if claims and claims.get("jti"):
+        return claims["jti"]
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenBlacklist:
+    """
+    Lista negra de tokens en memoria.
+
+    Un filtro de Bloom descarta en microsegundos el caso común (token no
+    revocado); los positivos se confirman contra el conjunto exacto. Los
+    cambios hechos por otros procesos se leen cada `refresh_seconds` por
+    delta de `revoked_at`, que asigna el servidor de Mongo (los `_id` los
+    genera cada cliente y no llegan en orden). El delta vuelve a leer
+    `overlap_seconds` hacia atrás para no perder escrituras que se
+    confirmaron después de la lectura anterior.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.TOKEN_BLACKLIST_CAPACITY,
+        refresh_seconds: int = settings.TOKEN_BLACKLIST_REFRESH_SECONDS,
+        overlap_seconds: int = settings.TOKEN_BLACKLIST_OVERLAP_SECONDS,
+    ):
+        self.capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self._bloom = BloomFilter(capacity)
+        self._revoked: dict[str, datetime] = {}
+        self._last_revoked_at: Optional[datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Carga completa de las revocaciones vigentes."""
+        async with self._lock:
+            self._revoked = {}
+            self._last_revoked_at = None
+            await self._pull({"expires_at": {"$gt": datetime.utcnow()}})
+            self._rebuild_bloom()
+
+    async def ensure_loaded(self) -> None:
+        """Carga completa la primera vez; después solo el delta."""
+        if self._refreshed_at is None:
+            await self.load()
+        else:
+            await self.refresh()
+
+    async def refresh(self) -> None:
+        """Trae las revocaciones registradas desde la última lectura (más el traslape)."""
+        async with self._lock:
+            if not self._is_stale():
+                return
+            if self._last_revoked_at is None:
+                query = {"revoked_at": {"$ne": None}}
+            else:
+                query = {"revoked_at": {"$gte": self._last_revoked_at - self.overlap}}
+            await self._pull(query)
+            self._prune()
+
+    async def _pull(self, query: dict) -> None:
+        async for doc in BlacklistToken.find(query):
+            self._remember(
+                doc.jti or token_revocation_id(doc.token), doc.expires_at
+            )
+            if doc.revoked_at and (
+                self._last_revoked_at is None or doc.revoked_at > self._last_revoked_at
+            ):
+                self._last_revoked_at = doc.revoked_at
+        self._refreshed_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at > self.refresh_seconds
+        )
+
+    def _remember(self, jti: str, expires_at: datetime) -> None:
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        if self._bloom.is_full:
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(jti)
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        if expired:
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        self._bloom = BloomFilter(max(self.capacity, len(self._revoked) * 2))
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Registra una revocación hecha en este proceso sin esperar al polling."""
+        self._remember(jti, expires_at)
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Guarda la revocación con `revoked_at` asignado por el servidor."""
+        await BlacklistToken.get_motor_collection().update_one(
+            {"jti": jti},
+            {
+                "$setOnInsert": {
+                    "jti": jti,
+                    "expires_at": expires_at,
+                    "created_at": datetime.utcnow(),
+                },
+                "$currentDate": {"revoked_at": True},
+            },
+            upsert=True,
+        )
+        self.add(jti, expires_at)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if self._is_stale():
+            await self.refresh()
+        if jti not in self._bloom:
+            return False
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._revoked),
+            "bloom_size_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hash_count,
+        }
+
+
+token_blacklist = TokenBlacklist()
@@ -0,0 +1,136 @@
+import hashlib
+import time
+from typing import Optional, Protocol
+
+from core.config import settings
+from utils.cache_utils import TTLCache
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class TokenExpiredError(InvalidTokenError):
+    pass
+
+
+class JWTBackend(Protocol):
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict: ...
+
+
+class JoseBackend:
+    """python-jose (implementación original)."""
+
+    def __init__(self):
+        from jose import jwt
+
+        self._jwt = jwt
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.ExpiredSignatureError as e:
+            raise TokenExpiredError(str(e))
+        except self._jwt.JWTError as e:
+            raise InvalidTokenError(str(e))
+
+
+class PyJWTBackend:
+    """PyJWT, más rápido para HS256. Dependencia opcional: `pip install PyJWT`."""
+
+    def __init__(self):
+        try:
+            import jwt
+        except ImportError:
+            raise RuntimeError("JWT_BACKEND=pyjwt requiere instalar PyJWT")
+        self._jwt = jwt
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._jwt.ExpiredSignatureError as e:
+            raise TokenExpiredError(str(e))
+        except self._jwt.InvalidTokenError as e:
+            raise InvalidTokenError(str(e))
+
+
+JWT_BACKENDS = {
+    "jose": JoseBackend,
+    "pyjwt": PyJWTBackend,
+}
+
+
+def get_jwt_backend(name: str) -> JWTBackend:
+    if name not in JWT_BACKENDS:
+        raise RuntimeError(f"JWT_BACKEND desconocido: {name}")
+    return JWT_BACKENDS[name]()
+
+
+class TokenVerifier:
+    """
+    Valida JWTs y guarda los claims ya validados de los tokens vistos
+    recientemente, indexados por el hash del token. Cada entrada vive como
+    máximo hasta que el token expira.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithms: list[str],
+        backend: Optional[JWTBackend] = None,
+        cache_size: int = settings.TOKEN_CLAIMS_CACHE_SIZE,
+        cache_ttl: int = settings.TOKEN_CLAIMS_CACHE_TTL_SECONDS,
+    ):
+        self.secret_key = secret_key
+        self.algorithms = algorithms
+        self.backend = backend or get_jwt_backend(settings.JWT_BACKEND)
+        self._cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.decodes = 0
+        self.decode_seconds = 0.0
+
+    def verify(self, token: str) -> dict:
+        """
+        Regresa los claims del token.
+
+        Raises:
+            TokenExpiredError: Si el token ya expiró.
+            InvalidTokenError: Si la firma o el formato no son válidos.
+        """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        claims = self._cache.get(key)
+        now = time.time()
+        if claims is not None:
+            if claims.get("exp") is not None and claims["exp"] <= now:
+                self._cache.invalidate(key)
+                raise TokenExpiredError("Signature has expired.")
+            return claims
+
+        started = time.perf_counter()
+        try:
+            claims = self.backend.decode(token, self.secret_key, self.algorithms)
+        finally:
+            self.decodes += 1
+            self.decode_seconds += time.perf_counter() - started
+
+        ttl = self._cache.ttl
+        if claims.get("exp") is not None:
+            ttl = min(ttl, claims["exp"] - now)
+        if ttl > 0:
+            self._cache.set(key, claims, ttl=ttl)
+        return claims
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "decodes": self.decodes,
+            "avg_decode_ms": (
+                self.decode_seconds / self.decodes * 1000 if self.decodes else 0.0
+            ),
+            "cache": self._cache.stats(),
+        }
+
+
+access_token_verifier = TokenVerifier(settings.JWT_SECRET_KEY, [settings.ALGORITHM])
+refresh_token_verifier = TokenVerifier(
+    settings.JWT_REFRESH_SECRET_KEY, [settings.ALGORITHM]
+)
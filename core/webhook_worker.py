@@ -0,0 +1,239 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import uuid4
+
+from pymongo import ReturnDocument
+
+from core.config import settings
+from models.webhook_event_model import WebhookEvent, WebhookEventStatus
+from utils.logger import logger
+
+
+class WebhookWorker:
+    """
+    Procesa la bandeja `webhook_events` fuera del request.
+
+    Cada evento se toma con un `find_one_and_update` que lo marca como
+    `processing` y le da un lease: mientras dura, `available_at` es el fin
+    del lease, así que si el proceso muere el evento vuelve a estar
+    disponible solo. Corren a lo más `concurrency` eventos a la vez; un
+    fallo se reintenta con backoff exponencial hasta `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.WEBHOOK_WORKER_CONCURRENCY,
+        lease_seconds: int = settings.WEBHOOK_LEASE_SECONDS,
+        poll_seconds: float = settings.WEBHOOK_POLL_SECONDS,
+        max_attempts: int = settings.WEBHOOK_MAX_ATTEMPTS,
+    ):
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        # Margen para que `_finish` escriba el resultado antes de que el lease
+        # venza y otro worker tome el mismo evento
+        self.handler_timeout = lease_seconds * 0.8
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._webhook_services = None
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Deja de tomar eventos y espera a los que están en curso."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wake.set()
+        await self._task
+
+    def notify(self) -> None:
+        """Despierta al worker de este proceso (llegó un evento nuevo)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self, until_empty: bool = False) -> int:
+        """
+        Toma y procesa eventos hasta `stop()`, o hasta vaciar la bandeja con
+        `until_empty`.
+
+        :return: Número de eventos tomados
+        """
+        self._stopping = self._stopping or asyncio.Event()
+        self._wake = self._wake or asyncio.Event()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        in_flight: set[asyncio.Task] = set()
+        claimed = 0
+        while not self._stopping.is_set():
+            await semaphore.acquire()
+            try:
+                raw = await self.claim()
+            except Exception as e:
+                logger.error({"message": "Webhook claim failed", "error": str(e)})
+                raw = None
+            if raw is None:
+                semaphore.release()
+                if until_empty:
+                    break
+                await self._idle()
+                continue
+            claimed += 1
+            task = asyncio.create_task(self._process_and_release(raw, semaphore))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        return claimed
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def claim(self) -> Optional[dict]:
+        """Toma el siguiente evento disponible (pendiente o con lease vencido)."""
+        now = datetime.utcnow()
+        return await WebhookEvent.get_motor_collection().find_one_and_update(
+            {
+                "status": {
+                    "$in": [
+                        WebhookEventStatus.pending.value,
+                        WebhookEventStatus.processing.value,
+                    ]
+                },
+                "available_at": {"$lte": now},
+            },
+            {
+                "$set": {
+                    "status": WebhookEventStatus.processing.value,
+                    "lease_owner": self.owner,
+                    "available_at": now + timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _process_and_release(self, raw: dict, semaphore: asyncio.Semaphore) -> None:
+        try:
+            await self.process(raw)
+        except Exception as e:
+            # El lease vence y otro intento lo vuelve a tomar
+            logger.error(
+                {
+                    "message": "Webhook worker error",
+                    "event_id": raw.get("event_id"),
+                    "error": str(e),
+                }
+            )
+        finally:
+            semaphore.release()
+
+    async def process(self, raw: dict) -> None:
+        """Ejecuta el handler de un evento tomado y registra el resultado."""
+        if raw["attempts"] > self.max_attempts:
+            # Sus leases vencieron una y otra vez (el proceso murió a la mitad)
+            await self._finish(raw, failed=True, error="Lease expired too many times")
+            return
+
+        import stripe
+
+        event = stripe.Event.construct_from(raw["payload"], stripe.api_key)
+        try:
+            # Un handler debe terminar antes que su lease
+            result = await asyncio.wait_for(
+                self._services().dispatch(event), timeout=self.handler_timeout
+            )
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            await self._finish(raw, failed=raw["attempts"] >= self.max_attempts, error=error)
+            return
+        await self._finish(raw, result=result if isinstance(result, dict) else None)
+
+    def _services(self):
+        # Import diferido: stripe no se carga en el arranque de la API
+        if self._webhook_services is None:
+            import stripe
+
+            from services.stripe.stripe_webhook_services import StripeWebhookServices
+
+            stripe.api_key = settings.STRIPE_SECRET_KEY
+            self._webhook_services = StripeWebhookServices(
+                settings.STRIPE_WEBHOOK_SECRET
+            )
+        return self._webhook_services
+
+    def _backoff(self, attempts: int) -> timedelta:
+        seconds = settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+        return timedelta(seconds=min(seconds, settings.WEBHOOK_RETRY_MAX_SECONDS))
+
+    async def _finish(
+        self,
+        raw: dict,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+        failed: bool = False,
+    ) -> None:
+        now = datetime.utcnow()
+        if error is None:
+            update = {
+                "status": WebhookEventStatus.processed.value,
+                "processed_at": now,
+                "result": result,
+                "last_error": None,
+            }
+            self.processed += 1
+        elif failed:
+            update = {"status": WebhookEventStatus.failed.value, "last_error": error}
+            self.failed += 1
+        else:
+            update = {
+                "status": WebhookEventStatus.pending.value,
+                "available_at": now + self._backoff(raw["attempts"]),
+                "last_error": error,
+            }
+            self.retried += 1
+        log = logger.info if error is None else logger.warning
+        log(
+            {
+                "message": f"Webhook event {update['status']}",
+                "event_id": raw["event_id"],
+                "event_type": raw["type"],
+                "attempts": raw["attempts"],
+                "error": error,
+            }
+        )
+        update["lease_owner"] = None
+        # Solo si el lease sigue siendo nuestro: si venció, otro worker lo tomó
+        await WebhookEvent.get_motor_collection().update_one(
+            {
+                "_id": raw["_id"],
+                "status": WebhookEventStatus.processing.value,
+                "lease_owner": self.owner,
+            },
+            {"$set": update},
+        )
+
+
+webhook_worker = WebhookWorker()
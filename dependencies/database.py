@@ -1,35 +1,328 @@
+import asyncio
+import hashlib
+import importlib
+import logging
+from datetime import datetime
+from typing import Optional
+
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
+from beanie.odm.utils.init import Initializer
+from beanie.odm.utils.typing import get_index_attributes
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import IndexModel, monitoring
+from pymongo.errors import OperationFailure
 from core.config import settings
 from models.account_utils_model import ResetPassword
+from models.comment_model import CommentModel
+from models.course_summary_model import CourseSummary
+from models.enrollment_model import EnrollmentBucket
 from models.role_model import Permission, Role
+from models.stripe_catalog_model import CatalogProduct
+from models.stripe_subscription_model import SubscriptionMirror
 from models.user_model import User
 from models.files_model import File
 from models.courses_model import Course
 from models.lesson_model import Lesson
 from models.token_model import BlacklistToken
 from models.verification_code_model import VerificationCode
+from models.webhook_event_model import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_MODELS = [
+    User,
+    Permission,
+    Role,
+    File,
+    Course,
+    Lesson,
+    BlacklistToken,
+    ResetPassword,
+    VerificationCode,
+    CommentModel,
+    CourseSummary,
+    EnrollmentBucket,
+    WebhookEvent,
+    CatalogProduct,
+    SubscriptionMirror,
+]
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Contadores del pool de conexiones de Mongo para monitoreo."""
+
+    def __init__(self):
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.checkout_failed = 0
+        self.pool_cleared = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pool_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failed += 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def stats(self) -> dict:
+        return {
+            "open": self.created - self.closed,
+            "in_use": self.checked_out,
+            "created": self.created,
+            "closed": self.closed,
+            "checkout_failed": self.checkout_failed,
+            "pool_cleared": self.pool_cleared,
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        }
+
+
+pool_stats = PoolStatsListener()
+_client: Optional[AsyncIOMotorClient] = None
+_initialized = False
+
+INDEX_STATE_COLLECTION = "_index_state"
+# Código de error de MongoDB para drop_index de un índice inexistente
+INDEX_NOT_FOUND = 27
+
+
+def _available_compressors(compressors: str) -> list[str]:
+    """Filtra los compresores cuyo módulo no está instalado (zstd/snappy son opcionales)."""
+    modules = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    available = []
+    for name in (c.strip() for c in compressors.split(",") if c.strip()):
+        try:
+            importlib.import_module(modules.get(name, name))
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def get_client() -> AsyncIOMotorClient:
+    """
+    Cliente de Motor único por proceso, con el pool configurado desde settings.
+
+    :return: AsyncIOMotorClient
+    """
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            settings.DATABASE_URL,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            compressors=_available_compressors(settings.MONGO_COMPRESSORS),
+            event_listeners=[pool_stats],
+        )
+    return _client
+
+
+def get_database() -> AsyncIOMotorDatabase:
+    return get_client()[settings.DATABASE_NAME]
+
+
+async def warm_up_pool(database: AsyncIOMotorDatabase, connections: int):
+    """
+    Abre `connections` conexiones de una vez con pings concurrentes para que
+    los primeros requests no paguen el handshake/TLS.
+
+    :return: None
+    """
+    if connections > 0:
+        await asyncio.gather(
+            *(database.command("ping") for _ in range(connections))
+        )
+
+
+def _declared_indexes(model) -> list[dict]:
+    """Índices declarados explícitamente con IndexModel en Settings del modelo."""
+    declared = getattr(model.Settings, "indexes", None) or []
+    return [index.document for index in declared if isinstance(index, IndexModel)]
+
+
+def _index_options(index: dict) -> dict:
+    return {k: v for k, v in index.items() if k not in ("key", "v", "ns")}
+
+
+def _same_options(existing: dict, declared: dict) -> bool:
+    """
+    Compara las opciones de dos índices; de la collation solo cuentan los
+    campos declarados (el servidor regresa la collation completa).
+    """
+    existing, declared = _index_options(existing), _index_options(declared)
+    if "collation" in declared and "collation" in existing:
+        existing["collation"] = {
+            key: existing["collation"].get(key) for key in declared["collation"]
+        }
+    return existing == declared
+
+
+async def reconcile_indexes(database: AsyncIOMotorDatabase, document_models: list):
+    """
+    Elimina los índices existentes que chocan con los declarados (misma llave
+    con otro nombre u opciones, p. ej. un índice simple que ahora debe ser TTL)
+    para que init_beanie pueda crearlos.
+
+    :return: None
+    """
+    for model in document_models:
+        declared = _declared_indexes(model)
+        if not declared:
+            continue
+        collection = database[model.Settings.name]
+        existing = await collection.index_information()
+        for index in declared:
+            key = list(index["key"].items())
+            for name, info in existing.items():
+                if name == "_id_" or list(info["key"]) != key:
+                    continue
+                if not _same_options({"name": name, **info}, index):
+                    logger.warning(
+                        f"Dropping index {name} on {collection.name}: "
+                        f"replaced by {index['name']}"
+                    )
+                    try:
+                        await collection.drop_index(name)
+                    except OperationFailure as e:
+                        # Otro worker que arrancó al mismo tiempo ya lo borró
+                        if e.code != INDEX_NOT_FOUND:
+                            raise
+
+
+async def verify_indexes(database: AsyncIOMotorDatabase, document_models: list):
+    """
+    Verifica que existan los índices declarados y crea los que falten.
+
+    :return: None
+    """
+    for model in document_models:
+        declared = _declared_indexes(model)
+        if not declared:
+            continue
+        collection = database[model.Settings.name]
+        existing = await collection.index_information()
+        missing = [
+            IndexModel(list(index["key"].items()), **_index_options(index))
+            for index in declared
+            if index["name"] not in existing
+        ]
+        if missing:
+            logger.warning(
+                f"Creating missing indexes on {collection.name}: "
+                f"{[index.document['name'] for index in missing]}"
+            )
+            await collection.create_indexes(missing)
+
+
+class _SkipIndexesInitializer(Initializer):
+    """Initializer de Beanie que no consulta ni crea índices."""
+
+    async def init_indexes(self, cls, allow_index_dropping: bool = False):
+        return None
+
+
+def index_fingerprint(document_models: list) -> str:
+    """Hash de todos los índices declarados (Settings.indexes e Indexed)."""
+    parts = []
+    for model in document_models:
+        declared = getattr(model.Settings, "indexes", None) or []
+        indexed_fields = sorted(
+            f"{name}:{get_index_attributes(field)}"
+            for name, field in model.model_fields.items()
+            if get_index_attributes(field) is not None
+        )
+        parts.append(
+            f"{model.Settings.name}|"
+            f"{[i.document if isinstance(i, IndexModel) else i for i in declared]}|"
+            f"{indexed_fields}"
+        )
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+async def _indexes_up_to_date(database: AsyncIOMotorDatabase, fingerprint: str) -> bool:
+    state = await database[INDEX_STATE_COLLECTION].find_one({"_id": "indexes"})
+    return bool(state) and state.get("fingerprint") == fingerprint
 
 
 async def init_db():
     """
     Inicializa la conexión a la base de datos y configura los modelos de documentos.
 
+    Es idempotente: en invocaciones "warm" de Lambda (Mangum corre el lifespan
+    en cada invocación) reutiliza el cliente y Beanie ya inicializados. En un
+    arranque en frío, si la definición de los índices no cambió desde el último
+    despliegue, se omite la reconciliación de Beanie pero se sigue verificando
+    que los índices existan (alguien pudo borrarlos a mano o restaurar un
+    respaldo sin ellos).
+
+    :return: None
+    """
+    global _initialized
+    if _initialized:
+        return
+
+    database = get_database()
+
+    await warm_up_pool(database, settings.MONGO_MIN_POOL_SIZE)
+
+    fingerprint = index_fingerprint(DOCUMENT_MODELS)
+    if await _indexes_up_to_date(database, fingerprint):
+        await _SkipIndexesInitializer(
+            database=database, document_models=DOCUMENT_MODELS
+        )
+        await verify_indexes(database, DOCUMENT_MODELS)
+    else:
+        await reconcile_indexes(database, DOCUMENT_MODELS)
+        await init_beanie(
+            database=database,
+            document_models=DOCUMENT_MODELS,
+        )
+        await verify_indexes(database, DOCUMENT_MODELS)
+        await database[INDEX_STATE_COLLECTION].update_one(
+            {"_id": "indexes"},
+            {"$set": {"fingerprint": fingerprint, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    _initialized = True
+
+
+async def close_db():
+    """
+    Cierra el cliente y sus conexiones al apagar la aplicación.
+
     :return: None
     """
-    client = AsyncIOMotorClient(settings.DATABASE_URL)
-
-    await init_beanie(
-        database=client[settings.DATABASE_NAME],
-        document_models=[
-            User,
-            Permission,
-            Role,
-            File,
-            Course,
-            Lesson,
-            BlacklistToken,
-            ResetPassword,
-            VerificationCode
-        ],
-    )
+    global _client, _initialized
+    if _client is not None:
+        _client.close()
+        _client = None
+    _initialized = False
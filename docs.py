@@ -6,7 +6,9 @@ tags_metadata = [
     {"name": "Files", "description": "Files routes"},
     {"name": "Courses", "description": "Courses routes"},
     {"name": "Lessons", "description": "Lessons routes"},
+    {"name": "Enrollment", "description": "Enrollment routes"},
     {"name": "Invoices", "description": "Invoices routes"},
     {"name": "Verification Codes", "description": "Verification Codes routes"},
     {"name": "Account Utils", "description": "Account Utils routes"},
+    {"name": "Stripe", "description": "Stripe routes"},
 ]
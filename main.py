@@ -6,18 +6,41 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from api.v1.router import router
+from api.deferred_routers import DeferredRoutersMiddleware
+from api.v1.router import deferred_routers, router
 from core.config import settings
-from dependencies.database import init_db
+from core.default_roles import default_roles
+from core.password_hasher import password_hasher
+from core.permission_registry import permission_registry
+from core.stripe_catalog import stripe_catalog
+from core.stripe_gateway import stripe_gateway
+from core.token_blacklist import token_blacklist
+from core.webhook_worker import webhook_worker
+from dependencies.database import close_db, init_db
 from docs import tags_metadata
+from utils.timing_utils import server_timing_middleware
 from mangum import Mangum
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize DB.
+    # Initialize DB. En Lambda, Mangum corre el lifespan en cada invocación:
+    # init_db y las cargas siguientes no repiten trabajo en invocaciones warm.
     await init_db()
     print("Init db ...")
+    await default_roles.ensure_seeded()
+    await permission_registry.ensure_loaded()
+    await token_blacklist.ensure_loaded()
+    if settings.WEBHOOK_WORKER_ENABLED and not settings.IS_LAMBDA:
+        webhook_worker.start()
+    if settings.STRIPE_CATALOG_RECONCILE_ENABLED and not settings.IS_LAMBDA:
+        stripe_catalog.start_reconcile()
     yield
+    if not settings.IS_LAMBDA:
+        await webhook_worker.stop()
+        await stripe_catalog.stop_reconcile()
+        await stripe_gateway.close()
+        password_hasher.shutdown()
+        await close_db()
 
 
 app = FastAPI(
@@ -34,6 +57,16 @@ app = FastAPI(
 
 app.include_router(router, prefix=settings.API_V1_STR)
 
+if settings.LAZY_ROUTERS:
+    app.add_middleware(
+        DeferredRoutersMiddleware,
+        fastapi_app=app,
+        routers=deferred_routers,
+        prefix=settings.API_V1_STR,
+    )
+
+app.middleware("http")(server_timing_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import IndexModel
+
+
+class TeacherSummary(BaseModel):
+    id: Optional[PydanticObjectId] = Field(default=None)
+    username: str = Field(default="")
+    profile_picture: Optional[str] = Field(default="")
+
+
+class CourseSummary(Document):
+    """
+    Read model de un curso: un documento chico por curso (mismo `_id` que el
+    curso) con los contadores que el catálogo y los dashboards necesitan, sin
+    resolver los arreglos de Link del curso.
+    """
+
+    name: str = Field()
+    status: str = Field()
+    level: str = Field(default="")
+    price: float = Field(default=0.0)
+    discount: float = Field(default=0.0)
+    rating: float = Field(default=0.0)
+    teacher: TeacherSummary = Field(default_factory=TeacherSummary)
+    student_count: int = Field(default=0)
+    lesson_count: int = Field(default=0)
+    total_duration: int = Field(default=0)
+    file_count: int = Field(default=0)
+    comment_count: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "course_summaries"
+        indexes = [
+            IndexModel([("teacher.id", 1)], name="teacher_id"),
+            IndexModel([("status", 1), ("_id", 1)], name="status_id"),
+        ]
@@ -13,7 +13,8 @@ class Course(Document):
     description: str = Field()
     price: float = Field()
     status: str = Field()
-    students: list[Link[User]] = Field()
+    # Legado: las inscripciones viven en `enrollments` (EnrollmentBucket)
+    students: list[Link[User]] = Field(default=[])
     teacher: Link[User] = Field()
     lessons: list[Link[Lesson]] = Field()
     files: list[Link[File]] = Field()
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import IndexModel
+
+
+class EnrolledStudent(BaseModel):
+    user_id: PydanticObjectId = Field()
+    enrolled_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class EnrollmentBucket(Document):
+    """
+    Inscripciones de un curso agrupadas en buckets de a lo más
+    ENROLLMENT_BUCKET_SIZE alumnos. Inscribir o dar de baja toca un solo
+    bucket, sin importar cuántos alumnos tenga el curso.
+    """
+
+    course_id: PydanticObjectId = Field()
+    size: int = Field(default=0)
+    students: list[EnrolledStudent] = Field(default_factory=list)
+
+    class Settings:
+        name = "enrollments"
+        indexes = [
+            # Único: un alumno no puede quedar en dos buckets del mismo curso
+            IndexModel(
+                [("course_id", 1), ("students.user_id", 1)],
+                name="course_user",
+                unique=True,
+            ),
+            IndexModel([("students.user_id", 1), ("course_id", 1)], name="user_course"),
+        ]
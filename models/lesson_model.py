@@ -2,6 +2,7 @@ from datetime import datetime
 
 from beanie import Document, Link
 from pydantic import Field
+from pymongo import IndexModel
 
 from models.comment_model import CommentModel
 from models.files_model import File
@@ -16,11 +17,16 @@ class Lesson(Document):
     description: str = Field()
     video_url: str = Field()
     duration: int = Field()
+    # Orden de la lección dentro de su curso
+    position: int = Field(default=0)
     files: Optional[list[Link[File]]] = Field([])
     comments: Optional[list[Link[CommentModel]]] = Field([])
-    created_at: datetime = Field(default=datetime.utcnow())
-    updated_at: datetime = Field(default=datetime.utcnow())
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "lessons"
         use_state_management = True
+        indexes = [
+            IndexModel([("course_from", 1), ("position", 1)], name="course_position"),
+        ]
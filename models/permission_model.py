@@ -1,5 +1,6 @@
 from beanie import Document
 from pydantic import Field
+from pymongo import IndexModel
 
 
 class Permission(Document):
@@ -7,4 +8,5 @@ class Permission(Document):
     description: str = Field(...)
 
     class Settings:
-        name = "permissions"
\ No newline at end of file
+        name = "permissions"
+        indexes = [IndexModel([("name", 1)], name="name_unique", unique=True)]
@@ -1,6 +1,7 @@
 from beanie import Document, Link
 from typing import List
 from pydantic import Field
+from pymongo import IndexModel
 from models.permission_model import Permission
 
 class Role(Document):
@@ -10,4 +11,5 @@ class Role(Document):
 
     class Settings:
         name = "roles"
+        indexes = [IndexModel([("name", 1)], name="name_unique", unique=True)]
 
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from beanie import Document
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, IndexModel
+
+
+class CatalogPrice(BaseModel):
+    id: str
+    unit_amount: Optional[int] = None  # centavos
+    currency: str = "usd"
+    interval: Optional[str] = None
+    interval_count: Optional[int] = None
+    lookup_key: Optional[str] = None
+    active: bool = True
+    created: int = 0
+    # `created` del último evento aplicado: descarta eventos fuera de orden
+    event_created: int = 0
+
+
+class CatalogProduct(Document):
+    """
+    Copia local de un producto de Stripe con todos sus precios. Se mantiene
+    con los webhooks `product.*`/`price.*` y una reconciliación periódica
+    (StripeCatalogServices.sync); el `_id` es el id del producto en Stripe.
+    """
+
+    id: str
+    name: str = ""
+    description: Optional[str] = None
+    active: bool = True
+    metadata: dict[str, Any] = Field(default_factory=dict)
+    default_price: Optional[str] = None
+    prices: list[CatalogPrice] = Field(default_factory=list)
+    # `updated` de Stripe: descarta eventos que llegan fuera de orden
+    updated: int = 0
+    synced_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "stripe_products"
+        indexes = [
+            IndexModel([("active", ASCENDING)], name="active"),
+            IndexModel([("prices.id", ASCENDING)], name="price_id"),
+            IndexModel([("prices.lookup_key", ASCENDING)], name="price_lookup_key"),
+        ]
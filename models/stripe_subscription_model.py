@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class SubscriptionMirror(Document):
+    """
+    Copia local de una suscripción de Stripe, mantenida con los webhooks
+    `customer.subscription.*` (y scripts/sync_stripe_subscriptions.py para
+    la carga inicial). El `_id` es el id de la suscripción en Stripe.
+    """
+
+    id: str
+    customer_id: Optional[str] = None
+    customer_email: Optional[str] = None
+    status: str = "incomplete"
+    price_id: Optional[str] = None
+    product_id: Optional[str] = None
+    unit_amount: Optional[int] = None  # centavos
+    currency: str = "usd"
+    interval: Optional[str] = None
+    quantity: int = 1
+    current_period_start: Optional[datetime] = None
+    current_period_end: Optional[datetime] = None
+    cancel_at_period_end: bool = False
+    canceled_at: Optional[datetime] = None
+    created: Optional[datetime] = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
+    # `created` del último evento aplicado: descarta eventos fuera de orden
+    event_created: int = 0
+    synced_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "stripe_subscriptions"
+        indexes = [
+            IndexModel(
+                [("customer_id", ASCENDING), ("current_period_end", ASCENDING)],
+                name="customer_period_end",
+            ),
+            # Listado paginado por estado, en orden de renovación
+            IndexModel(
+                [
+                    ("status", ASCENDING),
+                    ("current_period_end", ASCENDING),
+                    ("_id", ASCENDING),
+                ],
+                name="status_period_end",
+            ),
+            IndexModel([("current_period_end", ASCENDING)], name="period_end"),
+        ]
@@ -1,15 +1,29 @@
 from datetime import datetime
+from typing import Optional
 from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class BlacklistToken(Document):
-    token: str
+    jti: Optional[str] = None
+    # Solo presente en registros antiguos; las revocaciones nuevas usan `jti`
+    token: Optional[str] = None
     expires_at: datetime
-    created_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    # Hora del servidor de Mongo ($currentDate): los demás procesos leen el
+    # delta por este campo
+    revoked_at: Optional[datetime] = None
 
     class Settings:
         name = "blacklisted_tokens"
         indexes = [
-            "token",
-            "expires_at",
+            "jti",
+            IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+            # TTL: MongoDB borra el registro cuando el token ya expiró
+            IndexModel(
+                [("expires_at", ASCENDING)],
+                name="expires_at_ttl",
+                expireAfterSeconds=0,
+            ),
         ]
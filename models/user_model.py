@@ -1,8 +1,14 @@
 from beanie import Document, Link
 from pydantic import Field
+from pymongo import IndexModel
+from pymongo.collation import Collation
 from schemas.user_schema import UserSchema
 from models.role_model import Role
 
+# Comparación sin distinguir mayúsculas; las consultas por email/username
+# deben usar la misma collation para aprovechar los índices únicos
+CASE_INSENSITIVE = Collation(locale="en", strength=2)
+
 
 class User(Document, UserSchema):
     """Override fields from Schema."""
@@ -12,3 +18,17 @@ class User(Document, UserSchema):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel(
+                [("email", 1)],
+                name="email_unique",
+                unique=True,
+                collation=CASE_INSENSITIVE,
+            ),
+            IndexModel(
+                [("username", 1)],
+                name="username_unique",
+                unique=True,
+                collation=CASE_INSENSITIVE,
+            ),
+        ]
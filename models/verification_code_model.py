@@ -2,6 +2,7 @@ from datetime import datetime
 
 from beanie import Document
 from pydantic import Field
+from pymongo import ASCENDING, IndexModel
 
 
 class VerificationCode(Document):
@@ -15,6 +16,17 @@ class VerificationCode(Document):
     class Settings:
         name = "verification_codes"
         use_state_management = True
+        indexes = [
+            IndexModel(
+                [("code", ASCENDING), ("owner", ASCENDING)], name="code_owner"
+            ),
+            # TTL: MongoDB borra el código cuando expira
+            IndexModel(
+                [("expiration", ASCENDING)],
+                name="expiration_ttl",
+                expireAfterSeconds=0,
+            ),
+        ]
 
     model_config = {
         "json_schema_extra": {
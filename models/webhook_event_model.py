@@ -0,0 +1,57 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from core.config import settings
+
+
+class WebhookEventStatus(str, Enum):
+    pending = "pending"
+    processing = "processing"
+    processed = "processed"
+    # Agotó WEBHOOK_MAX_ATTEMPTS; queda para revisión manual
+    failed = "failed"
+
+
+class WebhookEvent(Document):
+    """
+    Bandeja de entrada de eventos de Stripe. El endpoint solo verifica la
+    firma e inserta el evento; el worker (core/webhook_worker.py) lo procesa
+    después. El índice único en `event_id` descarta las entregas repetidas.
+    """
+
+    event_id: str
+    type: str
+    # Evento tal como lo envió Stripe (JSON ya verificado)
+    payload: dict[str, Any]
+    status: WebhookEventStatus = Field(default=WebhookEventStatus.pending)
+    attempts: int = Field(default=0)
+    # El worker no lo toma antes de esta fecha: backoff de los reintentos y,
+    # mientras está en proceso, fin del lease de `lease_owner`
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    lease_owner: Optional[str] = None
+    last_error: Optional[str] = None
+    result: Optional[dict[str, Any]] = None
+    received_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: Optional[datetime] = None
+
+    class Settings:
+        name = "webhook_events"
+        indexes = [
+            IndexModel([("event_id", ASCENDING)], name="event_id_unique", unique=True),
+            # Consulta del worker: pendientes disponibles y leases vencidos
+            IndexModel(
+                [("status", ASCENDING), ("available_at", ASCENDING)],
+                name="status_available_at",
+            ),
+            # TTL: los procesados se borran tras la ventana de deduplicación
+            IndexModel(
+                [("processed_at", ASCENDING)],
+                name="processed_at_ttl",
+                expireAfterSeconds=settings.WEBHOOK_EVENT_RETENTION_DAYS * 86400,
+            ),
+        ]
@@ -11,6 +11,7 @@ class TokenSchema(BaseModel):
 class TokenPayload(BaseModel):
     sub: str = None
     exp: int = None
+    jti: Optional[str] = None
 
 
 class BlacklistTokenSchema(BaseModel):
@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(description="Position of the item in the request.")
+    status: Literal["created", "updated", "deleted", "failed", "skipped"] = Field()
+    id: Optional[PydanticObjectId] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+
+
+class BulkReport(BaseModel):
+    ordered: bool = Field(
+        description="If true, processing stopped at the first failed item."
+    )
+    total: int = Field()
+    succeeded: int = Field()
+    failed: int = Field()
+    skipped: int = Field()
+    items: list[BulkItemResult] = Field()
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Optional, Union
 
-from beanie import Link
+from beanie import Link, PydanticObjectId
 from pydantic import BaseModel, Field
 
 from models.comment_model import CommentModel
@@ -8,6 +8,7 @@ from models.files_model import File
 from models.lesson_model import Lesson
 from models.user_model import User
 from schemas.general_schemas import AutoDates
+from schemas.user_schema import UserListItem
 
 
 class CourseCreate(BaseModel):
@@ -15,7 +16,7 @@ class CourseCreate(BaseModel):
     description: str = Field()
     price: float = Field()
     status: str = Field()
-    students: list[Link[User]] = Field()
+    students: list[Link[User]] = Field(default=[])
     teacher: Link[User] = Field()
     lessons: list[Link[Lesson]] = Field()
     files: list[Link[File]] = Field()
@@ -91,13 +92,15 @@ class CourseUpdate(BaseModel):
 
 
 class CourseResponse(AutoDates):
-    id: str = Field()
+    # Sin `students`: los alumnos viven en los buckets de inscripción
+    # (GET /enrollment/{course_id}/students y el resumen del curso)
+    id: PydanticObjectId = Field()
     name: str = Field()
     description: str = Field()
     price: float = Field()
     status: str = Field()
-    students: list[Link[User]] = Field()
-    teacher: Link[User] = Field()
+    # Resuelto como UserListItem (sin la contraseña); Link si el usuario ya no existe
+    teacher: Union[UserListItem, Link[User]] = Field()
     lessons: list[Link[Lesson]] = Field()
     files: list[Link[File]] = Field()
     certificate: Link[File] = Field()
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+
+class RosterEntry(BaseModel):
+    user_id: PydanticObjectId = Field()
+    enrolled_at: datetime = Field()
+    username: Optional[str] = Field(default=None)
+
+
+class EnrollmentResult(BaseModel):
+    course_id: PydanticObjectId = Field()
+    user_id: PydanticObjectId = Field()
+    changed: bool = Field(description="False if nothing had to be done.")
@@ -1,12 +1,23 @@
 from datetime import datetime
+from typing import Generic, Optional, TypeVar
 from pydantic import BaseModel, Field
 
+T = TypeVar("T")
+
 
 class AutoDates(BaseModel):
     created_at: datetime = Field(None, description="Item updated at.")
     updated_at: datetime = Field(
-        default_factory=datetime.now, description="Item updated at."
+        default_factory=datetime.utcnow, description="Item updated at."
     )
 
     async def before_update(self):
-        self.updated_at = datetime.now()
+        self.updated_at = datetime.utcnow()
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T] = Field(description="Items of the page.")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page."
+    )
+    limit: int = Field(description="Page size used.")
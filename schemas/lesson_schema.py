@@ -3,7 +3,6 @@ from models.comment_model import CommentModel
 from models.files_model import File
 from beanie import Link
 from typing import Optional
-from datetime import datetime
 from beanie.odm.fields import PydanticObjectId
 
 
@@ -13,6 +12,9 @@ class LessonCreate(BaseModel):
     description: str = Field()
     video_url: str = Field()
     duration: int = Field()
+    position: Optional[int] = Field(
+        None, description="Orden en el curso; por omisión va al final."
+    )
     files: Optional[list[Link[File]]] = Field([])
     comments: Optional[list[Link[CommentModel]]] = Field([])
 
@@ -33,13 +35,15 @@ class LessonCreate(BaseModel):
 
 
 class LessonUpdate(BaseModel):
-    name: Optional[str] = Field()
-    description: Optional[str] = Field()
-    course_from: PydanticObjectId = Field()
-    video_url: Optional[str] = Field()
-    duration: Optional[int] = Field()
-    files: Optional[list[Link[File]]] = Field()
-    comments: Optional[list[Link[CommentModel]]] = Field()
+    """Actualización parcial: solo se escriben los campos enviados."""
+
+    name: Optional[str] = Field(default=None)
+    description: Optional[str] = Field(default=None)
+    course_from: Optional[PydanticObjectId] = Field(default=None)
+    video_url: Optional[str] = Field(default=None)
+    duration: Optional[int] = Field(default=None)
+    files: Optional[list[Link[File]]] = Field(default=None)
+    comments: Optional[list[Link[CommentModel]]] = Field(default=None)
 
     model_config = {
         "json_schema_extra": {
@@ -55,13 +59,18 @@ class LessonUpdate(BaseModel):
     }
 
 
-class LessonUpdate(BaseModel):
-    id: str = Field()
+class LessonOutline(BaseModel):
+    """Lección para el temario de un curso: sin los arreglos de Link."""
+
+    id: PydanticObjectId = Field(alias="_id")
     name: str = Field()
     description: str = Field()
     video_url: str = Field()
     duration: int = Field()
-    files: list[Link[File]] = Field()
-    comments: list[Link[CommentModel]] = Field()
-    created_at: datetime = Field()
-    updated_at: datetime = Field()
+    position: int = Field(default=0)
+
+
+class LessonReorder(BaseModel):
+    lesson_ids: list[PydanticObjectId] = Field(
+        description="Todas las lecciones del curso en el orden deseado."
+    )
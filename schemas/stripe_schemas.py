@@ -37,10 +37,12 @@ class StripeEventType(str, Enum):
     # Additional Price Event
     PRICE_CREATED = "price.created"
     PRICE_UPDATED = "price.updated"
+    PRICE_DELETED = "price.deleted"
 
     # Additional Product Events
     PRODUCT_CREATED = "product.created"
     PRODUCT_UPDATED = "product.updated"
+    PRODUCT_DELETED = "product.deleted"
     # Additional Payment Events
     PAYMENT_INTENT_CREATED = "payment_intent.created"
     PAYMENT_INTENT_CANCELED = "payment_intent.canceled"
@@ -119,15 +121,30 @@ class ProductCreate(BaseModel):
     currency: str = "usd"
 
 
+class PriceResponse(BaseModel):
+    id: str
+    price: Decimal
+    currency: str
+    interval: Optional[str] = None
+    interval_count: Optional[int] = None
+    lookup_key: Optional[str] = None
+
+
 class ProductResponse(BaseModel):
+    """
+    Producto con su precio principal (`price_id`, `price`, ...) y la lista
+    completa de precios activos en `prices`.
+    """
+
     id: str
     name: str
-    description: str
+    description: Optional[str] = None
     price_id: str
     price: Decimal
-    interval: str
+    interval: Optional[str] = None
     currency: str
     active: bool
+    prices: List[PriceResponse] = Field(default_factory=list)
 
 
 class SubscriptionCreate(BaseModel):
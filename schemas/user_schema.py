@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List
-from beanie import Link
+from typing import Literal, Optional, List
+from beanie import Link, PydanticObjectId
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 from models.role_model import Role
@@ -115,3 +115,31 @@ class UserResponse(BaseModel):
                 user_dict[field] = getattr(user, field)
 
         return cls(**user_dict)
+
+
+class UserListItem(UserResponse):
+    """Usuario para listados: el hash de la contraseña nunca se lee de la base."""
+
+    id: PydanticObjectId = Field(alias="_id")
+
+    class Settings:
+        projection = {"hashed_password": 0}
+
+
+class StudentImportRow(BaseModel):
+    """Fila de una importación de alumnos; las columnas extra se ignoran."""
+
+    username: str = Field(min_length=1)
+    email: EmailStr = Field()
+    password: str = Field(min_length=1)
+
+
+class StudentImportEvent(BaseModel):
+    """Línea NDJSON del reporte de una importación."""
+
+    event: Literal["error", "progress", "done"] = Field()
+    line: Optional[int] = Field(default=None, description="Line of the upload.")
+    error: Optional[str] = Field(default=None)
+    rows: int = Field(default=0, description="Rows read so far.")
+    created: int = Field(default=0)
+    failed: int = Field(default=0)
@@ -0,0 +1,61 @@
+"""
+Numera las lecciones creadas antes de que existiera `Lesson.position`.
+
+En cada curso con alguna lección sin posición, renumera todas sus lecciones
+0..n-1 conservando el orden en que ya se listaban (primero las que no tenían
+posición, por `_id`, y luego las demás por `(position, _id)`).
+
+Es idempotente: solo escribe las posiciones que cambian y un curso ya
+numerado no se vuelve a tocar.
+
+Uso:
+    python -m scripts.backfill_lesson_positions
+    python -m scripts.backfill_lesson_positions --dry-run
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from dependencies.database import close_db, init_db
+from models.lesson_model import Lesson
+
+
+async def main(dry_run: bool) -> None:
+    await init_db()
+    try:
+        collection = Lesson.get_motor_collection()
+        course_ids = await collection.distinct("course_from", {"position": None})
+        lessons = 0
+        for course_id in course_ids:
+            ordered = (
+                await collection.find(
+                    {"course_from": course_id}, {"_id": 1, "position": 1}
+                )
+                .sort([("position", 1), ("_id", 1)])
+                .to_list(None)
+            )
+            now = datetime.utcnow()
+            operations = [
+                UpdateOne(
+                    {"_id": raw["_id"]},
+                    {"$set": {"position": index, "updated_at": now}},
+                )
+                for index, raw in enumerate(ordered)
+                if raw.get("position") != index
+            ]
+            lessons += len(operations)
+            if operations and not dry_run:
+                await collection.bulk_write(operations, ordered=False)
+        action = "Would number" if dry_run else "Numbered"
+        print(f"{action} {lessons} lessons in {len(course_ids)} courses")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
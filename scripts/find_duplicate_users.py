@@ -0,0 +1,50 @@
+"""
+Lista los usuarios, roles y permisos que impedirían crear los índices únicos
+(email/username sin distinguir mayúsculas, name en roles y permisos).
+
+Se corre antes de desplegar los índices; los duplicados se resuelven a mano
+y después el arranque crea los índices normalmente.
+
+Uso:
+    python -m scripts.find_duplicate_users
+"""
+import asyncio
+
+from dependencies.database import close_db, get_database
+
+CHECKS = [
+    ("users", "email", True),
+    ("users", "username", True),
+    ("roles", "name", False),
+    ("permissions", "name", False),
+]
+
+
+async def find_duplicates(database, collection: str, field: str, ignore_case: bool):
+    key = {"$toLower": f"${field}"} if ignore_case else f"${field}"
+    return await database[collection].aggregate(
+        [
+            {"$group": {"_id": key, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+    ).to_list(None)
+
+
+async def main() -> None:
+    database = get_database()
+    try:
+        found = 0
+        for collection, field, ignore_case in CHECKS:
+            for duplicate in await find_duplicates(
+                database, collection, field, ignore_case
+            ):
+                found += 1
+                ids = ", ".join(str(_id) for _id in duplicate["ids"])
+                print(f"{collection}.{field} = {duplicate['_id']!r}: {ids}")
+        print(f"{found} duplicated values")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
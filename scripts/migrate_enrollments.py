@@ -0,0 +1,43 @@
+"""
+Migra las inscripciones embebidas en `Course.students` a la colección
+`enrollments` (buckets por curso) y vacía el arreglo del curso.
+
+Es idempotente: se puede volver a correr y solo mueve lo que falte. Conviene
+correrlo sin tráfico de inscripciones para no competir con `enroll`.
+
+Uso:
+    python -m scripts.migrate_enrollments
+    python -m scripts.migrate_enrollments --dry-run
+"""
+import argparse
+import asyncio
+
+from dependencies.database import close_db, init_db
+from models.courses_model import Course
+from services.enrollment_services import EnrollmentServices
+
+
+async def main(dry_run: bool) -> None:
+    await init_db()
+    try:
+        courses = students = 0
+        pending = Course.get_motor_collection().find(
+            {"students.0": {"$exists": True}}, {"_id": 1, "students": 1}
+        )
+        async for raw in pending:
+            courses += 1
+            if dry_run:
+                students += len(raw["students"])
+                continue
+            students += await EnrollmentServices.migrate_course(raw["_id"])
+        action = "Would move" if dry_run else "Moved"
+        print(f"{action} {students} enrollments from {courses} courses")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,26 @@
+"""
+Reconstruye `course_summaries` a partir de los cursos y lecciones existentes.
+
+Se corre una vez al desplegar el read model (o si se sospecha que los
+contadores se desviaron); después los resúmenes se mantienen solos.
+
+Uso:
+    python -m scripts.rebuild_course_summaries
+"""
+import asyncio
+
+from dependencies.database import close_db, init_db
+from services.course_summary_services import CourseSummaryServices
+
+
+async def main() -> None:
+    await init_db()
+    try:
+        count = await CourseSummaryServices.rebuild_all()
+        print(f"Rebuilt {count} course summaries")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
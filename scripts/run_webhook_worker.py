@@ -0,0 +1,40 @@
+"""
+Procesa la bandeja de webhooks de Stripe (`webhook_events`) fuera de la API.
+
+Dentro de Lambda el worker no corre en el proceso de la API (la función se
+congela entre invocaciones); este script lo reemplaza, como proceso aparte o
+con `--once` desde una tarea programada.
+
+Uso:
+    python -m scripts.run_webhook_worker
+    python -m scripts.run_webhook_worker --once
+"""
+import argparse
+import asyncio
+
+from core.webhook_worker import webhook_worker
+from dependencies.database import close_db, init_db
+
+
+async def main(once: bool) -> None:
+    await init_db()
+    try:
+        if once:
+            claimed = await webhook_worker.run(until_empty=True)
+            print(
+                f"Claimed {claimed} events: {webhook_worker.processed} processed, "
+                f"{webhook_worker.retried} retried, {webhook_worker.failed} failed"
+            )
+        else:
+            await webhook_worker.run()
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--once", action="store_true", help="Vacía la bandeja y termina"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.once))
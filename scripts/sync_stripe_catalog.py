@@ -0,0 +1,36 @@
+"""
+Reconcilia la colección `stripe_products` con el catálogo de Stripe
+(productos y todos sus precios, todas las páginas).
+
+Fuera de Lambda la API ya lo hace cada STRIPE_CATALOG_RECONCILE_SECONDS;
+en Lambda se corre desde una tarea programada. También sirve para la carga
+inicial.
+
+Uso:
+    python -m scripts.sync_stripe_catalog
+"""
+import argparse
+import asyncio
+
+from core.stripe_gateway import stripe_gateway
+from dependencies.database import close_db, init_db
+from services.stripe.stripe_catalog_services import StripeCatalogServices
+
+
+async def main() -> None:
+    await init_db()
+    try:
+        report = await StripeCatalogServices().sync()
+        print(
+            f"Synced {report['products']} products and {report['prices']} prices, "
+            f"removed {report['removed']}"
+        )
+    finally:
+        await stripe_gateway.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+    asyncio.run(main())
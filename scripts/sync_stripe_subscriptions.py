@@ -0,0 +1,32 @@
+"""
+Carga todas las suscripciones de Stripe (todos los estados, todas las
+páginas) en el espejo local `stripe_subscriptions`.
+
+Después de la carga inicial el espejo se mantiene con los webhooks
+`customer.subscription.*`; volver a correrlo es seguro.
+
+Uso:
+    python -m scripts.sync_stripe_subscriptions
+"""
+import argparse
+import asyncio
+
+from core.stripe_gateway import stripe_gateway
+from dependencies.database import close_db, init_db
+from services.stripe.stripe_subscription_services import StripeSubscriptionServices
+
+
+async def main() -> None:
+    await init_db()
+    try:
+        count = await StripeSubscriptionServices().sync_subscriptions()
+        print(f"Synced {count} subscriptions")
+    finally:
+        await stripe_gateway.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+    asyncio.run(main())
@@ -1,8 +1,11 @@
+from datetime import datetime
+
 from fastapi import HTTPException, status
 
 from models.account_utils_model import ResetPassword
+from services.principal_services import PrincipalServices
 from services.user_services import UserServices
-from utils.auth_utils import verify_password, get_password_hash
+from utils.auth_utils import verify_password_async, get_password_hash_async
 
 
 class AccountUtilsServices:
@@ -10,7 +13,7 @@ class AccountUtilsServices:
     @staticmethod
     async def reset_password(data: ResetPassword):
         user = await UserServices.get_user_by_email_service(email=data.email)
-        is_valid = verify_password(
+        is_valid = await verify_password_async(
             plain_password=data.old_password, hashed_password=user.hashed_password
         )
         if not is_valid:
@@ -18,7 +21,9 @@ class AccountUtilsServices:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error al intentar cambiar la contraseña: La contraseña actual no es correcta.",
             )
-        new_password = get_password_hash(data.new_password)
+        new_password = await get_password_hash_async(data.new_password)
         user.hashed_password = new_password
+        user.updated_at = datetime.utcnow()
         await user.save()
+        PrincipalServices.invalidate_user(user.id)
         return user
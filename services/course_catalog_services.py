@@ -0,0 +1,44 @@
+import json
+
+from beanie.odm.fields import PydanticObjectId
+
+from core.catalog_cache import CatalogEntry, catalog_cache
+from schemas.course_schema import CourseResponse
+from schemas.general_schemas import Page
+from services.course_services import CourseServices
+from utils.pagination_utils import PageParams
+
+
+class CourseCatalogServices:
+    """Lecturas del catálogo de cursos servidas desde `catalog_cache`."""
+
+    @staticmethod
+    async def get_all_courses(params: PageParams, filters: dict = None) -> CatalogEntry:
+        key = "courses:" + json.dumps(
+            {"cursor": params.cursor, "limit": params.limit, "filters": filters},
+            sort_keys=True,
+            default=str,
+        )
+
+        async def load() -> bytes:
+            page = await CourseServices.get_all_courses(params, filters)
+            return (
+                Page[CourseResponse]
+                .model_validate(page, from_attributes=True)
+                .model_dump_json()
+                .encode("utf-8")
+            )
+
+        return await catalog_cache.get_or_load(key, load)
+
+    @staticmethod
+    async def get_course_by_id(course_id: PydanticObjectId) -> CatalogEntry:
+        async def load() -> bytes:
+            course = await CourseServices.get_course_by_id(course_id)
+            return (
+                CourseResponse.model_validate(course, from_attributes=True)
+                .model_dump_json()
+                .encode("utf-8")
+            )
+
+        return await catalog_cache.get_or_load(f"course:{course_id}", load)
@@ -1,46 +1,169 @@
+from datetime import datetime
+
 from beanie.odm.fields import PydanticObjectId
+from core.catalog_cache import catalog_cache
 from models.courses_model import Course
+from models.user_model import User
+from schemas.bulk_schema import BulkReport
 from schemas.course_schema import CourseCreate, CourseUpdate
+from schemas.general_schemas import Page
+from schemas.user_schema import UserListItem
+from services.course_summary_services import CourseSummaryServices
+from services.enrollment_services import EnrollmentServices
+from utils.bulk_utils import (
+    BulkResult,
+    delete_operation,
+    execute_bulk,
+    find_existing,
+    insert_operation,
+    update_operation,
+    validate_ids,
+    validate_items,
+    validate_update_items,
+)
+from utils.general_utils import update_payload
+from utils.link_utils import fetch_links_batched, link_id
+from utils.pagination_utils import PageParams, paginate
+from utils.streaming_utils import iter_documents
 
 
 class CourseServices:
 
+    @staticmethod
+    def _new_course(course: CourseCreate) -> Course:
+        # Los alumnos van a los buckets de inscripción, no al documento del curso
+        now = datetime.utcnow()
+        fields = {
+            name: getattr(course, name)
+            for name in CourseCreate.model_fields
+            if name != "students"
+        }
+        return Course(**fields, created_at=now, updated_at=now)
+
     @staticmethod
     async def create_course(course: CourseCreate) -> Course:
-        result = await Course(**course.model_dump())
+        result = CourseServices._new_course(course)
         await result.insert()
-        await result.fetch_all_links()
+        await EnrollmentServices.set_roster(
+            result.id, [link_id(student) for student in course.students]
+        )
+        await fetch_links_batched([result], {User: UserListItem})
+        await CourseSummaryServices.rebuild(result.id)
+        await catalog_cache.invalidate()
         return result
 
     @staticmethod
-    async def get_all_courses() -> list[Course]:
-        courses = await Course.find_all().to_list()
-        for course in courses:
-            await course.fetch_all_links()
-        return courses
+    async def get_all_courses(params: PageParams, filters: dict = None) -> Page:
+        page = await paginate(Course, params, filters)
+        await fetch_links_batched(page.items, {User: UserListItem})
+        return page
+
+    @staticmethod
+    def export_courses(filters: dict = None):
+        return iter_documents(
+            Course,
+            filters,
+            resolve_links=True,
+            link_projections={User: UserListItem},
+        )
 
     @staticmethod
     async def get_course_by_id(course_id: PydanticObjectId) -> Course:
         course = await Course.find_one(Course.id == course_id)
-        await course.fetch_all_links()
+        await fetch_links_batched([course], {User: UserListItem})
         return course
 
     @staticmethod
     async def update_course(
         course_id: PydanticObjectId, course: CourseUpdate
     ) -> Course:
-        course = await CourseServices.get_course_by_id(course_id)
-        await course.update({"set": course.model_dump(exclude_unset=True)})
-        await course.fetch_all_links()
-        return course
+        current = await CourseServices.get_course_by_id(course_id)
+        await current.update(update_payload(course, exclude={"students"}))
+        if course.students is not None:
+            await EnrollmentServices.set_roster(
+                course_id, [link_id(student) for student in course.students]
+            )
+        await CourseSummaryServices.rebuild(course_id)
+        await catalog_cache.invalidate()
+        return await CourseServices.get_course_by_id(course_id)
 
     @staticmethod
     async def delete_course(course_id: PydanticObjectId) -> None:
         course = await CourseServices.get_course_by_id(course_id)
         await course.delete()
+        await CourseSummaryServices.remove(course_id)
+        await catalog_cache.invalidate()
 
     @staticmethod
     async def logic_delete_course(course_id: PydanticObjectId) -> None:
         course = await CourseServices.get_course_by_id(course_id)
         course.status = "deleted"
+        course.updated_at = datetime.utcnow()
         await course.save()
+        await CourseSummaryServices.rebuild(course_id)
+        await catalog_cache.invalidate()
+
+    @staticmethod
+    async def bulk_create_courses(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        operations = []
+        rosters = {}
+        for index, course in validate_items(items, CourseCreate, result):
+            course_id, operation = insert_operation(CourseServices._new_course(course))
+            operations.append((index, course_id, operation))
+            rosters[course_id] = course.students
+
+        created = await execute_bulk(Course, result, operations, "created")
+        for course_id in created:
+            if rosters[course_id]:
+                await EnrollmentServices.set_roster(
+                    course_id, [link_id(student) for student in rosters[course_id]]
+                )
+            await CourseSummaryServices.rebuild(course_id)
+        if created:
+            await catalog_cache.invalidate()
+        return result.report()
+
+    @staticmethod
+    async def bulk_update_courses(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        pending = validate_update_items(items, CourseUpdate, result)
+        await find_existing(Course, pending, result)
+        operations = [
+            (
+                index,
+                course_id,
+                update_operation(
+                    course_id, update_payload(course, exclude={"students"})
+                ),
+            )
+            for index, course_id, course in result.runnable(pending)
+        ]
+
+        updated = await execute_bulk(Course, result, operations, "updated")
+        for index, course_id, course in pending:
+            if result.succeeded(index) and course.students is not None:
+                await EnrollmentServices.set_roster(
+                    course_id, [link_id(student) for student in course.students]
+                )
+        for course_id in set(updated):
+            await CourseSummaryServices.rebuild(course_id)
+        if updated:
+            await catalog_cache.invalidate()
+        return result.report()
+
+    @staticmethod
+    async def bulk_delete_courses(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        pending = validate_ids(items, result)
+        await find_existing(Course, pending, result)
+        operations = [
+            (index, course_id, delete_operation(course_id))
+            for index, course_id in result.runnable(pending)
+        ]
+
+        deleted = await execute_bulk(Course, result, operations, "deleted")
+        if deleted:
+            await CourseSummaryServices.remove_many(deleted)
+            await catalog_cache.invalidate()
+        return result.report()
@@ -0,0 +1,179 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie.odm.fields import PydanticObjectId
+from fastapi import HTTPException, status
+
+from models.course_summary_model import CourseSummary, TeacherSummary
+from models.courses_model import Course
+from models.enrollment_model import EnrollmentBucket
+from models.lesson_model import Lesson
+from models.user_model import User
+from schemas.general_schemas import Page
+from utils.error_codes import ErrorCodes
+from utils.pagination_utils import PageParams, paginate
+
+
+def _ref_id(value):
+    """Id de un DBRef guardado en el documento crudo."""
+    return getattr(value, "id", value)
+
+
+class CourseSummaryServices:
+
+    @staticmethod
+    async def rebuild(course_id: PydanticObjectId) -> Optional[CourseSummary]:
+        """Rebuild the whole summary of a course
+
+        Used when the course itself is created or edited; the rest of the
+        changes are applied incrementally.
+
+        Arguments:
+            course_id: PydanticObjectId = Course id
+
+        Returns:
+            CourseSummary, or None if the course no longer exists
+        """
+        raw = await Course.get_motor_collection().find_one({"_id": course_id})
+        if raw is None:
+            await CourseSummaryServices.remove(course_id)
+            return None
+
+        lessons = await Lesson.aggregate(
+            [
+                {"$match": {"course_from": course_id}},
+                {
+                    "$group": {
+                        "_id": None,
+                        "count": {"$sum": 1},
+                        "duration": {"$sum": "$duration"},
+                    }
+                },
+            ]
+        ).to_list()
+        lesson_stats = lessons[0] if lessons else {"count": 0, "duration": 0}
+        enrollments = await EnrollmentBucket.aggregate(
+            [
+                {"$match": {"course_id": course_id}},
+                {"$group": {"_id": None, "count": {"$sum": "$size"}}},
+            ]
+        ).to_list()
+        # Cursos aún no migrados conservan el arreglo embebido
+        student_count = len(raw.get("students") or []) + (
+            enrollments[0]["count"] if enrollments else 0
+        )
+
+        summary = CourseSummary(
+            id=course_id,
+            name=raw.get("name", ""),
+            status=raw.get("status", ""),
+            level=raw.get("level", ""),
+            price=raw.get("price", 0.0),
+            discount=raw.get("discount", 0.0),
+            rating=raw.get("rating", 0.0),
+            teacher=await CourseSummaryServices._teacher(raw.get("teacher")),
+            student_count=student_count,
+            lesson_count=lesson_stats["count"],
+            total_duration=lesson_stats["duration"],
+            file_count=len(raw.get("files") or []),
+            comment_count=len(raw.get("comments") or []),
+        )
+        await summary.save()
+        return summary
+
+    @staticmethod
+    async def _teacher(teacher_ref) -> TeacherSummary:
+        if teacher_ref is None:
+            return TeacherSummary()
+        teacher = await User.get_motor_collection().find_one(
+            {"_id": _ref_id(teacher_ref)}, {"username": 1, "profile_picture": 1}
+        )
+        if teacher is None:
+            return TeacherSummary(id=_ref_id(teacher_ref))
+        return TeacherSummary(
+            id=teacher["_id"],
+            username=teacher.get("username", ""),
+            profile_picture=teacher.get("profile_picture", ""),
+        )
+
+    @staticmethod
+    async def rebuild_all() -> int:
+        """Rebuild the summaries of every course (backfill)
+
+        Returns:
+            Number of summaries written
+        """
+        count = 0
+        async for raw in Course.get_motor_collection().find({}, {"_id": 1}):
+            await CourseSummaryServices.rebuild(raw["_id"])
+            count += 1
+        return count
+
+    @staticmethod
+    async def remove(course_id: PydanticObjectId) -> None:
+        await CourseSummary.find_one({"_id": course_id}).delete()
+
+    @staticmethod
+    async def remove_many(course_ids: list) -> None:
+        await CourseSummary.find({"_id": {"$in": list(course_ids)}}).delete()
+
+    @staticmethod
+    async def _increment(course_id: PydanticObjectId, **deltas) -> None:
+        await CourseSummary.get_motor_collection().update_one(
+            {"_id": course_id},
+            {"$inc": deltas, "$set": {"updated_at": datetime.utcnow()}},
+        )
+
+    @staticmethod
+    async def lesson_added(course_id: PydanticObjectId, duration: int) -> None:
+        await CourseSummaryServices._increment(
+            course_id, lesson_count=1, total_duration=duration or 0
+        )
+
+    @staticmethod
+    async def lesson_removed(course_id: PydanticObjectId, duration: int) -> None:
+        await CourseSummaryServices._increment(
+            course_id, lesson_count=-1, total_duration=-(duration or 0)
+        )
+
+    @staticmethod
+    async def students_changed(course_id: PydanticObjectId, delta: int) -> None:
+        await CourseSummaryServices._increment(course_id, student_count=delta)
+
+    @staticmethod
+    async def teacher_changed(user_id) -> None:
+        """Propagate the teacher display info to the summaries of their courses"""
+        teacher = await CourseSummaryServices._teacher(PydanticObjectId(str(user_id)))
+        await CourseSummary.get_motor_collection().update_many(
+            {"teacher.id": teacher.id},
+            {
+                "$set": {
+                    "teacher": teacher.model_dump(),
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+        )
+
+    @staticmethod
+    async def get_summary(course_id: PydanticObjectId) -> CourseSummary:
+        """Get the summary of a course, building it if it does not exist yet
+
+        Arguments:
+            course_id: PydanticObjectId = Course id
+
+        Returns:
+            CourseSummary model instance
+        """
+        summary = await CourseSummary.get(course_id)
+        if summary is None:
+            summary = await CourseSummaryServices.rebuild(course_id)
+        if summary is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ErrorCodes.OBJECT_NOT_FOUND.value,
+            )
+        return summary
+
+    @staticmethod
+    async def get_summaries(params: PageParams, filters: dict = None) -> Page:
+        return await paginate(CourseSummary, params, filters)
@@ -0,0 +1,306 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
+
+from core.config import settings
+from models.course_summary_model import CourseSummary
+from models.courses_model import Course
+from models.enrollment_model import EnrollmentBucket
+from models.user_model import User
+from schemas.enrollment_schema import RosterEntry
+from schemas.general_schemas import Page
+from services.course_summary_services import CourseSummaryServices
+from utils.error_codes import ErrorCodes
+from utils.link_utils import link_id
+from utils.pagination_utils import PageParams
+
+
+def _parse_roster_cursor(
+    cursor: Optional[str],
+) -> tuple[Optional[ObjectId], Optional[ObjectId]]:
+    """
+    El cursor del roster es `<bucket_id>:<user_id>` del último alumno
+    entregado; no es una posición del arreglo, que se recorre con cada `$pull`.
+    """
+    if not cursor:
+        return None, None
+    bucket_id, _, user_id = cursor.partition(":")
+    if not ObjectId.is_valid(bucket_id) or not ObjectId.is_valid(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorCodes.BAD_OBJECT_ID.value,
+        )
+    return ObjectId(bucket_id), ObjectId(user_id)
+
+
+class EnrollmentServices:
+
+    @staticmethod
+    def _collection():
+        return EnrollmentBucket.get_motor_collection()
+
+    @staticmethod
+    async def is_enrolled(course_id: ObjectId, user_id: ObjectId) -> bool:
+        found = await EnrollmentServices._collection().find_one(
+            {"course_id": course_id, "students.user_id": user_id}, {"_id": 1}
+        )
+        return found is not None
+
+    @staticmethod
+    async def enroll(course_id: ObjectId, user_id: ObjectId) -> bool:
+        """Enroll a user in a course
+
+        The student is pushed into the first bucket of the course with room
+        left, or a new bucket is upserted; either way it is a single write.
+
+        Arguments:
+            course_id: ObjectId = Course id
+            user_id: ObjectId = User id
+
+        Returns:
+            True if the user was enrolled, False if already enrolled
+        """
+        if await EnrollmentServices.is_enrolled(course_id, user_id):
+            return False
+        try:
+            await EnrollmentServices._collection().update_one(
+                {
+                    "course_id": course_id,
+                    "size": {"$lt": settings.ENROLLMENT_BUCKET_SIZE},
+                    "students.user_id": {"$ne": user_id},
+                },
+                {
+                    "$push": {
+                        "students": {
+                            "user_id": user_id,
+                            "enrolled_at": datetime.utcnow(),
+                        }
+                    },
+                    "$inc": {"size": 1},
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # Otra petición lo inscribió en otro bucket al mismo tiempo
+            return False
+        await CourseSummaryServices.students_changed(course_id, 1)
+        return True
+
+    @staticmethod
+    async def unenroll(course_id: ObjectId, user_id: ObjectId) -> bool:
+        """Remove a user from a course
+
+        Arguments:
+            course_id: ObjectId = Course id
+            user_id: ObjectId = User id
+
+        Returns:
+            True if the user was removed, False if was not enrolled
+        """
+        collection = EnrollmentServices._collection()
+        bucket = await collection.find_one_and_update(
+            {"course_id": course_id, "students.user_id": user_id},
+            {"$pull": {"students": {"user_id": user_id}}, "$inc": {"size": -1}},
+            projection={"_id": 1},
+        )
+        if bucket is None:
+            return False
+        # Un bucket vacío chocaría con el índice único (course_id, null)
+        await collection.delete_one({"_id": bucket["_id"], "size": {"$lte": 0}})
+        await CourseSummaryServices.students_changed(course_id, -1)
+        return True
+
+    @staticmethod
+    async def count(course_id: ObjectId) -> int:
+        result = await EnrollmentBucket.aggregate(
+            [
+                {"$match": {"course_id": course_id}},
+                {"$group": {"_id": None, "count": {"$sum": "$size"}}},
+            ]
+        ).to_list()
+        return result[0]["count"] if result else 0
+
+    @staticmethod
+    async def get_roster(course_id: ObjectId, cursor: Optional[str], limit: int) -> Page:
+        """Get a page of the students enrolled in a course
+
+        Pages walk the buckets in `_id` order and the students of each
+        bucket in `user_id` order, so a page reads at most
+        limit / ENROLLMENT_BUCKET_SIZE + 1 buckets. The cursor is the last
+        (bucket, user) returned: unenrolling between requests neither skips
+        nor repeats students.
+
+        Arguments:
+            course_id: ObjectId = Course id
+            cursor: str = `next_cursor` of the previous page
+            limit: int = Page size
+
+        Returns:
+            Page of RosterEntry with the username of each student
+        """
+        bucket_id, last_user_id = _parse_roster_cursor(cursor)
+        query = {"course_id": course_id}
+        if bucket_id is not None:
+            query["_id"] = {"$gte": bucket_id}
+
+        entries = []
+        next_cursor = None
+        buckets = (
+            EnrollmentServices._collection()
+            .find(query, {"students": 1})
+            .sort("_id", 1)
+            .batch_size(2)
+        )
+        async for bucket in buckets:
+            students = sorted(
+                bucket.get("students", []), key=lambda student: student["user_id"]
+            )
+            if bucket["_id"] == bucket_id:
+                students = [s for s in students if s["user_id"] > last_user_id]
+            for student in students:
+                if len(entries) == limit:
+                    last = entries[-1]
+                    next_cursor = f"{last['bucket_id']}:{last['user_id']}"
+                    break
+                entries.append({**student, "bucket_id": bucket["_id"]})
+            if next_cursor:
+                break
+
+        users = {
+            user["_id"]: user
+            async for user in User.get_motor_collection().find(
+                {"_id": {"$in": [entry["user_id"] for entry in entries]}},
+                {"username": 1},
+            )
+        }
+        items = [
+            RosterEntry(
+                user_id=entry["user_id"],
+                enrolled_at=entry["enrolled_at"],
+                username=users.get(entry["user_id"], {}).get("username"),
+            )
+            for entry in entries
+        ]
+        return Page(items=items, next_cursor=next_cursor, limit=limit)
+
+    @staticmethod
+    async def get_user_courses(user_id: ObjectId, params: PageParams) -> Page:
+        """Get a page of the courses a user is enrolled in
+
+        Uses the (students.user_id, course_id) index; the cursor is the last
+        course id.
+
+        Arguments:
+            user_id: ObjectId = User id
+            params: PageParams = Cursor and page size
+
+        Returns:
+            Page of CourseSummary
+        """
+        query = {"students.user_id": user_id}
+        if params.cursor:
+            query["course_id"] = {"$gt": ObjectId(params.cursor)}
+        rows = (
+            await EnrollmentServices._collection()
+            .find(query, {"course_id": 1})
+            .sort("course_id", 1)
+            .limit(params.limit + 1)
+            .to_list(None)
+        )
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[: params.limit]
+            next_cursor = str(rows[-1]["course_id"])
+
+        course_ids = [row["course_id"] for row in rows]
+        summaries = {
+            summary.id: summary
+            for summary in await CourseSummary.find(
+                {"_id": {"$in": course_ids}}
+            ).to_list()
+        }
+        items = []
+        for course_id in course_ids:
+            summary = summaries.get(course_id)
+            if summary is None:
+                summary = await CourseSummaryServices.rebuild(course_id)
+            if summary is not None:
+                items.append(summary)
+        return Page(items=items, next_cursor=next_cursor, limit=params.limit)
+
+    @staticmethod
+    async def _enrolled_ids(course_id: ObjectId) -> set:
+        return {
+            student["user_id"]
+            async for bucket in EnrollmentServices._collection().find(
+                {"course_id": course_id}, {"students.user_id": 1}
+            )
+            for student in bucket.get("students", [])
+        }
+
+    @staticmethod
+    async def set_roster(course_id: ObjectId, user_ids: Iterable) -> None:
+        """Make the roster of a course exactly `user_ids`
+
+        Keeps the old `students` semantics of course create/update.
+        """
+        wanted = {ObjectId(str(user_id)) for user_id in user_ids}
+        current = await EnrollmentServices._enrolled_ids(course_id)
+        for user_id in current - wanted:
+            await EnrollmentServices.unenroll(course_id, user_id)
+        for user_id in wanted - current:
+            await EnrollmentServices.enroll(course_id, user_id)
+
+    @staticmethod
+    async def migrate_course(course_id: ObjectId) -> int:
+        """Move the embedded `Course.students` array into enrollment buckets
+
+        Idempotent: students already enrolled are skipped. New students are
+        written in full buckets with one insert_many, then the embedded array
+        is emptied and the course summary rebuilt.
+
+        Arguments:
+            course_id: ObjectId = Course id
+
+        Returns:
+            Number of students moved
+        """
+        raw = await Course.get_motor_collection().find_one(
+            {"_id": course_id}, {"students": 1}
+        )
+        if raw is None:
+            return 0
+
+        enrolled = await EnrollmentServices._enrolled_ids(course_id)
+        pending = []
+        for reference in raw.get("students") or []:
+            user_id = link_id(reference)
+            if user_id not in enrolled:
+                enrolled.add(user_id)
+                pending.append(user_id)
+
+        now = datetime.utcnow()
+        size = settings.ENROLLMENT_BUCKET_SIZE
+        buckets = [
+            {
+                "course_id": course_id,
+                "size": len(chunk),
+                "students": [
+                    {"user_id": user_id, "enrolled_at": now} for user_id in chunk
+                ],
+            }
+            for chunk in (
+                pending[start : start + size] for start in range(0, len(pending), size)
+            )
+        ]
+        if buckets:
+            await EnrollmentServices._collection().insert_many(buckets)
+
+        await Course.get_motor_collection().update_one(
+            {"_id": course_id}, {"$set": {"students": []}}
+        )
+        await CourseSummaryServices.rebuild(course_id)
+        return len(pending)
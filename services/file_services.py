@@ -1,39 +1,119 @@
+from datetime import datetime
+
+from core.catalog_cache import catalog_cache
 from models.files_model import File
+from models.user_model import User
+from schemas.bulk_schema import BulkReport
 from schemas.file_schemas import FileCreate, FileResponse, FileUpdate
+from schemas.general_schemas import Page
+from schemas.user_schema import UserListItem
+from utils.bulk_utils import (
+    BulkResult,
+    execute_bulk,
+    find_existing,
+    insert_operation,
+    update_operation,
+    validate_ids,
+    validate_items,
+    validate_update_items,
+)
+from utils.general_utils import update_payload
+from utils.link_utils import fetch_links_batched
+from utils.pagination_utils import PageParams, paginate
+from utils.streaming_utils import iter_documents
 
 
 class FileService:
 
     @staticmethod
-    async def get_files() -> list[FileResponse]:
-        files = await File.find_all().to_list()
-        for file in files:
-            await file.fetch_link(file.owner)
-        return files
+    async def get_files(params: PageParams, filters: dict = None) -> Page:
+        page = await paginate(File, params, filters)
+        await fetch_links_batched(page.items, {User: UserListItem})
+        return page
+
+    @staticmethod
+    def export_files(filters: dict = None):
+        return iter_documents(
+            File, filters, resolve_links=True, link_projections={User: UserListItem}
+        )
 
     @staticmethod
     async def get_file_by_id(file_id: str) -> FileResponse:
-        file = await File.find_one(File.id == file_id)
-        await file.fetch_link(file.owner)
+        file = await File.get(file_id)
+        await fetch_links_batched([file], {User: UserListItem})
         return file
 
     @staticmethod
     async def create_file(file: FileCreate) -> FileResponse:
         file = File(**file.model_dump())
         await file.insert()
-        await file.fetch_link(file.owner)
+        await fetch_links_batched([file], {User: UserListItem})
         return file
 
     @staticmethod
     async def update_file(file_id: str, file: FileUpdate) -> FileResponse:
-        file = await FileService.get_file_by_id(file_id)
-        await file.update({"set": file.model_dump(exclude_unset=True)})
-        await file.fetch_link(file.owner)
-        return file
+        current = await FileService.get_file_by_id(file_id)
+        await current.update(update_payload(file))
+        await catalog_cache.invalidate()
+        return await FileService.get_file_by_id(file_id)
 
     @staticmethod
     async def delete_file(file_id: str) -> None:
         file = await FileService.get_file_by_id(file_id)
-        await file.update({"set": {"is_deleted": True}})
-        await file.fetch_link(file.owner)
+        await file.update(
+            {"$set": {"is_deleted": True, "updated_at": datetime.utcnow()}}
+        )
+        await fetch_links_batched([file], {User: UserListItem})
+        await catalog_cache.invalidate()
         return file
+
+    @staticmethod
+    async def bulk_create_files(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        now = datetime.utcnow()
+        operations = []
+        for index, file in validate_items(items, FileCreate, result):
+            fields = {name: getattr(file, name) for name in file.model_fields}
+            fields["created_at"] = fields["created_at"] or now
+            fields["updated_at"] = now
+            file_id, operation = insert_operation(File(**fields))
+            operations.append((index, file_id, operation))
+
+        await execute_bulk(File, result, operations, "created")
+        return result.report()
+
+    @staticmethod
+    async def bulk_update_files(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        pending = validate_update_items(items, FileUpdate, result)
+        await find_existing(File, pending, result)
+        operations = [
+            (index, file_id, update_operation(file_id, update_payload(file)))
+            for index, file_id, file in result.runnable(pending)
+        ]
+
+        if await execute_bulk(File, result, operations, "updated"):
+            await catalog_cache.invalidate()
+        return result.report()
+
+    @staticmethod
+    async def bulk_delete_files(items: list, ordered: bool) -> BulkReport:
+        """Soft delete, igual que delete_file"""
+        result = BulkResult(len(items), ordered)
+        pending = validate_ids(items, result)
+        await find_existing(File, pending, result)
+        now = datetime.utcnow()
+        operations = [
+            (
+                index,
+                file_id,
+                update_operation(
+                    file_id, {"$set": {"is_deleted": True, "updated_at": now}}
+                ),
+            )
+            for index, file_id in result.runnable(pending)
+        ]
+
+        if await execute_bulk(File, result, operations, "deleted"):
+            await catalog_cache.invalidate()
+        return result.report()
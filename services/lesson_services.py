@@ -1,16 +1,36 @@
+from datetime import datetime
+
 from fastapi import HTTPException, status
+from pymongo import UpdateOne
+from core.catalog_cache import catalog_cache
 from models.lesson_model import Lesson
-from schemas.lesson_schema import LessonCreate, LessonUpdate
+from schemas.bulk_schema import BulkReport
+from schemas.general_schemas import Page
+from schemas.lesson_schema import LessonCreate, LessonOutline, LessonUpdate
+from services.course_summary_services import CourseSummaryServices
 from beanie.odm.fields import PydanticObjectId
+from utils.bulk_utils import (
+    BulkResult,
+    delete_operation,
+    execute_bulk,
+    find_existing,
+    insert_operation,
+    update_operation,
+    validate_ids,
+    validate_items,
+    validate_update_items,
+)
+from utils.error_codes import ErrorCodes
+from utils.general_utils import update_payload
+from utils.pagination_utils import PageParams, paginate
 
 
 class LessonServices:
 
     @staticmethod
-    async def get_all_lessons():
+    async def get_all_lessons(params: PageParams, filters: dict = None):
         try:
-            lesson = await Lesson.find_all().to_list()
-            return lesson
+            return await paginate(Lesson, params, filters)
         except Exception as e:
             raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
 
@@ -22,10 +42,127 @@ class LessonServices:
         except Exception as e:
             raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
 
+    @staticmethod
+    async def get_lessons_for_course(
+        course_id: PydanticObjectId, params: PageParams
+    ) -> Page:
+        """Get a page of the lessons of a course in order
+
+        Keyset over (position, _id) served by the course_position index;
+        the cursor is the id of the last lesson of the previous page.
+        Lessons created before `position` existed sort first (a missing
+        field sorts before any number) until
+        scripts/backfill_lesson_positions.py numbers them.
+
+        Arguments:
+            course_id: PydanticObjectId = Course id
+            params: PageParams = Cursor and page size
+
+        Returns:
+            Page of LessonOutline
+        """
+        query = {"course_from": course_id}
+        if params.cursor:
+            last = await Lesson.get_motor_collection().find_one(
+                {"_id": PydanticObjectId(params.cursor), "course_from": course_id},
+                {"position": 1},
+            )
+            if last is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=ErrorCodes.BAD_OBJECT_ID.value,
+                )
+            if last.get("position") is None:
+                query["$or"] = [
+                    {"position": None, "_id": {"$gt": last["_id"]}},
+                    {"position": {"$ne": None}},
+                ]
+            else:
+                position = last["position"]
+                query["$or"] = [
+                    {"position": {"$gt": position}},
+                    {"position": position, "_id": {"$gt": last["_id"]}},
+                ]
+
+        items = (
+            await Lesson.find(query, projection_model=LessonOutline)
+            .sort([("position", 1), ("_id", 1)])
+            .limit(params.limit + 1)
+            .to_list()
+        )
+        next_cursor = None
+        if len(items) > params.limit:
+            items = items[: params.limit]
+            next_cursor = str(items[-1].id)
+        return Page(items=items, next_cursor=next_cursor, limit=params.limit)
+
+    @staticmethod
+    async def _next_position(course_id: PydanticObjectId) -> int:
+        collection = Lesson.get_motor_collection()
+        last = await collection.find_one(
+            {"course_from": course_id}, {"position": 1}, sort=[("position", -1)]
+        )
+        if last is None:
+            return 0
+        if last.get("position") is None:
+            # Solo lecciones sin posición: la nueva va después de todas
+            return await collection.count_documents({"course_from": course_id})
+        return last["position"] + 1
+
+    @staticmethod
+    async def reorder_lessons(
+        course_id: PydanticObjectId, lesson_ids: list[PydanticObjectId]
+    ) -> dict:
+        """Set the order of the lessons of a course
+
+        Every lesson gets its index in `lesson_ids` as position, all in one
+        bulk_write.
+
+        Arguments:
+            course_id: PydanticObjectId = Course id
+            lesson_ids: list[PydanticObjectId] = Every lesson of the course, in order
+
+        Returns:
+            Number of lessons whose position changed
+        """
+        collection = Lesson.get_motor_collection()
+        existing = await collection.count_documents({"course_from": course_id})
+        belonging = await collection.count_documents(
+            {"_id": {"$in": lesson_ids}, "course_from": course_id}
+        )
+        expected = len(lesson_ids)
+        if len(set(lesson_ids)) != expected or not existing == belonging == expected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="lesson_ids must list every lesson of the course once",
+            )
+        if not lesson_ids:
+            return {"modified": 0}
+
+        now = datetime.utcnow()
+        result = await collection.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": lesson_id, "position": {"$ne": index}},
+                    {"$set": {"position": index, "updated_at": now}},
+                )
+                for index, lesson_id in enumerate(lesson_ids)
+            ],
+            ordered=False,
+        )
+        if result.modified_count:
+            await catalog_cache.invalidate()
+        return {"modified": result.modified_count}
+
     @staticmethod
     async def create_lesson(lesson: LessonCreate):
         try:
-            lesson = await Lesson(**lesson.dict()).create()
+            fields = lesson.model_dump(exclude={"position"})
+            position = lesson.position
+            if position is None:
+                position = await LessonServices._next_position(lesson.course_from)
+            lesson = await Lesson(**fields, position=position).create()
+            await CourseSummaryServices.lesson_added(lesson.course_from, lesson.duration)
             return lesson
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to create lesson: {e}")
@@ -35,6 +172,10 @@ class LessonServices:
         try:
             lesson = await LessonServices.get_lesson_by_id(lesson_id)
             await lesson.delete()
+            await CourseSummaryServices.lesson_removed(
+                lesson.course_from, lesson.duration
+            )
+            await catalog_cache.invalidate()
             return {"message": "Lesson deleted successfully"}
         except Exception as e:
             raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
@@ -42,12 +183,98 @@ class LessonServices:
     @staticmethod
     async def update_lesson(lesson_id: PydanticObjectId, lesson: LessonUpdate):
         try:
-            lesson = await LessonServices.get_lesson_by_id(lesson_id)
+            current = await LessonServices.get_lesson_by_id(lesson_id)
             try:
-                await lesson.update({"set": lesson.model_dump(exclude_unset=True)})
-                await lesson.fetch_all_links()
-                return lesson
+                previous = (current.course_from, current.duration)
+                await current.update(update_payload(lesson))
+                if previous != (current.course_from, current.duration):
+                    await CourseSummaryServices.lesson_removed(*previous)
+                    await CourseSummaryServices.lesson_added(
+                        current.course_from, current.duration
+                    )
+                await current.fetch_all_links()
+                await catalog_cache.invalidate()
+                return current
             except Exception as e:
                 raise HTTPException(status_code=404, detail=f"Lesson not found: {e}")
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to update lesson: {e}")
+
+    @staticmethod
+    async def _rebuild_summaries(course_ids) -> None:
+        for course_id in set(course_ids):
+            await CourseSummaryServices.rebuild(course_id)
+        await catalog_cache.invalidate()
+
+    @staticmethod
+    async def bulk_create_lessons(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        now = datetime.utcnow()
+        operations = []
+        course_by_lesson = {}
+        next_positions = {}
+        for index, lesson in validate_items(items, LessonCreate, result):
+            course_id = lesson.course_from
+            if course_id not in next_positions:
+                next_positions[course_id] = await LessonServices._next_position(course_id)
+            position = lesson.position
+            if position is None:
+                position = next_positions[course_id]
+            next_positions[course_id] = max(next_positions[course_id], position + 1)
+
+            fields = lesson.model_dump(exclude={"position"})
+            lesson_id, operation = insert_operation(
+                Lesson(**fields, position=position, created_at=now, updated_at=now)
+            )
+            operations.append((index, lesson_id, operation))
+            course_by_lesson[lesson_id] = course_id
+
+        created = await execute_bulk(Lesson, result, operations, "created")
+        if created:
+            await LessonServices._rebuild_summaries(
+                course_by_lesson[lesson_id] for lesson_id in created
+            )
+        return result.report()
+
+    @staticmethod
+    async def bulk_update_lessons(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        pending = validate_update_items(items, LessonUpdate, result)
+        previous = await find_existing(Lesson, pending, result, {"course_from": 1})
+        operations = [
+            (
+                index,
+                lesson_id,
+                update_operation(lesson_id, update_payload(lesson, exclude={"id"})),
+            )
+            for index, lesson_id, lesson in result.runnable(pending)
+        ]
+
+        updated = await execute_bulk(Lesson, result, operations, "updated")
+        if updated:
+            # La lección pudo cambiar de curso: se reconstruyen ambos resúmenes
+            courses = [previous[lesson_id]["course_from"] for lesson_id in updated]
+            courses += [
+                lesson.course_from
+                for index, _, lesson in pending
+                if result.succeeded(index) and "course_from" in lesson.model_fields_set
+            ]
+            await LessonServices._rebuild_summaries(courses)
+        return result.report()
+
+    @staticmethod
+    async def bulk_delete_lessons(items: list, ordered: bool) -> BulkReport:
+        result = BulkResult(len(items), ordered)
+        pending = validate_ids(items, result)
+        previous = await find_existing(Lesson, pending, result, {"course_from": 1})
+        operations = [
+            (index, lesson_id, delete_operation(lesson_id))
+            for index, lesson_id in result.runnable(pending)
+        ]
+
+        deleted = await execute_bulk(Lesson, result, operations, "deleted")
+        if deleted:
+            await LessonServices._rebuild_summaries(
+                previous[lesson_id]["course_from"] for lesson_id in deleted
+            )
+        return result.report()
@@ -1,23 +1,30 @@
 from click import Argument
 from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
 from models.permission_model import Permission
 from schemas.permission_schema import PermissionCreate, PermissionUpdate
 from beanie import PydanticObjectId
+from core.permission_registry import permission_registry
 from models.role_model import Role
+from services.principal_services import PrincipalServices
 from typing import List
+from utils.pagination_utils import PageParams, paginate
 
 
 class PermissionsServices:
 
     @staticmethod
-    async def get_all_permissions():
-        """Get all permissions
+    async def get_all_permissions(params: PageParams, filters: dict = None):
+        """Get a page of permissions
+
+        Arguments:
+            params: PageParams = Cursor and page size
+            filters: dict = Equality filters applied by the database
 
         Returns:
-            List of Permission model instances
+            Page of Permission model instances
         """
-        permissions = await Permission.find_all().to_list()
-        return permissions
+        return await paginate(Permission, params, filters)
 
     @staticmethod
     async def get_permission_by_id(permission_id: PydanticObjectId):
@@ -54,11 +61,13 @@ class PermissionsServices:
         Returns:
             Permission model instance
         """
-        existing_permission = await Permission.find_one(Permission.name == data.name)
-        if existing_permission:
-            raise HTTPException(status_code=400, detail="Permission already exists")
         new_permission = Permission(**data.model_dump())
-        await new_permission.create()
+        try:
+            await new_permission.create()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Permission already exists")
+        permission_registry.upsert_permission(new_permission)
+        await permission_registry.bump_version()
         return new_permission
 
     @staticmethod
@@ -77,7 +86,13 @@ class PermissionsServices:
         permission = await PermissionsServices.get_permission_by_id(permission_id)
         if not permission:
             raise HTTPException(status_code=404, detail="Permission not found")
-        await permission.update({"$set": data.model_dump(exclude_unset=True)})
+        try:
+            await permission.update({"$set": data.model_dump(exclude_unset=True)})
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Permission already exists")
+        PrincipalServices.invalidate_permission(permission_id)
+        permission_registry.upsert_permission(permission)
+        await permission_registry.bump_version()
         return permission
 
     @staticmethod
@@ -94,6 +109,9 @@ class PermissionsServices:
         if not permission:
             raise HTTPException(status_code=404, detail="Permission not found")
         await permission.delete()
+        PrincipalServices.invalidate_permission(permission.id)
+        permission_registry.remove_permission(permission.id)
+        await permission_registry.bump_version()
         return {"message": "Permission deleted successfully"}
 
     @staticmethod
@@ -107,19 +125,10 @@ class PermissionsServices:
         Returns:
             Boolean
         """
-        # Obtenemos los IDs de los roles del usuario
-        role_ids = [role.id for role in user.roles]
-
-        # Cargamos los roles completos
-        user_roles = await Role.find({"_id": {"$in": role_ids}}).to_list()
-
-        for role in user_roles:
-            # Cargamos los permisos de cada rol
-            await role.fetch_link(Role.permissions)
-            for permission in role.permissions:
-                if permission.name == permission_name:
-                    return True
-        return False
+        await permission_registry.ensure_loaded()
+        return permission_registry.has_all(
+            user.roles, permission_registry.compile([permission_name])
+        )
 
     @staticmethod
     async def get_permissions_by_ids(permission_ids: List[str]):
@@ -0,0 +1,103 @@
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+
+from core.config import settings
+from models.user_model import User
+from utils.cache_utils import TTLCache
+from utils.error_codes import ErrorCodes
+
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def _principal_pipeline(user_id: ObjectId) -> list:
+    """Usuario + roles + permisos en una sola agregación."""
+    return [
+        {"$match": {"_id": user_id}},
+        {
+            "$lookup": {
+                "from": "roles",
+                "localField": "roles.$id",
+                "foreignField": "_id",
+                "as": "roles",
+                "pipeline": [
+                    {
+                        "$lookup": {
+                            "from": "permissions",
+                            "localField": "permissions.$id",
+                            "foreignField": "_id",
+                            "as": "permissions",
+                        }
+                    }
+                ],
+            }
+        },
+        {"$limit": 1},
+    ]
+
+
+class PrincipalServices:
+
+    @staticmethod
+    async def get_principal(user_id: str) -> User:
+        """Get the authenticated user with roles and permissions loaded
+
+        Arguments:
+            user_id: str = User id
+
+        Returns:
+            User model instance with roles and permissions already fetched
+        """
+        if not ObjectId.is_valid(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ErrorCodes.BAD_OBJECT_ID.value,
+            )
+
+        raw = principal_cache.get(user_id)
+        if raw is None:
+            raw = await PrincipalServices._load_principal(ObjectId(user_id))
+            if raw is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=ErrorCodes.COLLECTION_NOT_FOUND.value,
+                )
+            principal_cache.set(user_id, raw)
+
+        # Se construye una instancia nueva por request para no compartir estado mutable
+        return User.model_validate(raw)
+
+    @staticmethod
+    async def _load_principal(user_id: ObjectId) -> Optional[dict]:
+        result = await User.aggregate(_principal_pipeline(user_id)).to_list()
+        return result[0] if result else None
+
+    @staticmethod
+    def invalidate_user(user_id) -> None:
+        principal_cache.invalidate(str(user_id))
+
+    @staticmethod
+    def invalidate_role(role_id) -> None:
+        role_id = ObjectId(str(role_id))
+        principal_cache.invalidate_where(
+            lambda raw: any(role["_id"] == role_id for role in raw.get("roles", []))
+        )
+
+    @staticmethod
+    def invalidate_permission(permission_id) -> None:
+        permission_id = ObjectId(str(permission_id))
+        principal_cache.invalidate_where(
+            lambda raw: any(
+                permission["_id"] == permission_id
+                for role in raw.get("roles", [])
+                for permission in role.get("permissions", [])
+            )
+        )
+
+    @staticmethod
+    def clear() -> None:
+        principal_cache.clear()
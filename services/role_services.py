@@ -1,8 +1,16 @@
+from datetime import datetime
+
 from beanie import PydanticObjectId
 from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+from core.default_roles import default_roles
+from core.permission_registry import permission_registry
 from models.role_model import Role, Permission
 from typing import List
 from schemas.role_schemas import RoleUpdate
+from services.principal_services import PrincipalServices
+from utils.link_utils import fetch_links_batched
+from utils.pagination_utils import PageParams, paginate
 
 
 class RoleService:
@@ -16,10 +24,6 @@ class RoleService:
             description: string = Role description
             permissions: List[str] = List of permission names
         """
-        existing_role = await Role.find_one(Role.name == name)
-        if existing_role:
-            raise HTTPException(status_code=400, detail="Role already exists")
-
         permission_objects = []
         for perm_name in permissions:
             perm = await Permission.find_one(Permission.name == perm_name)
@@ -32,7 +36,12 @@ class RoleService:
         new_role = Role(
             name=name, description=description, permissions=permission_objects
         )
-        await new_role.create()
+        try:
+            await new_role.create()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Role already exists")
+        permission_registry.upsert_role(new_role)
+        await permission_registry.bump_version()
         return new_role
 
     @staticmethod
@@ -64,16 +73,19 @@ class RoleService:
         return role
 
     @staticmethod
-    async def get_all_roles():
-        """Get all roles
+    async def get_all_roles(params: PageParams, filters: dict = None):
+        """Get a page of roles
+
+        Arguments:
+            params: PageParams = Cursor and page size
+            filters: dict = Equality filters applied by the database
 
         Returns:
-            List of Role model instances
+            Page of Role model instances with their permissions
         """
-        roles = await Role.find_all().to_list()
-        for role in roles:
-            await role.fetch_all_links()
-        return roles
+        page = await paginate(Role, params, filters)
+        await fetch_links_batched(page.items)
+        return page
 
     @staticmethod
     async def update_role(role_id: PydanticObjectId, data: RoleUpdate):
@@ -87,8 +99,14 @@ class RoleService:
             Role model instance
         """
         role = await RoleService.get_role_by_id(role_id)
-        await role.update({"$set": data.model_dump(exclude_unset=True)})
+        try:
+            await role.update({"$set": data.model_dump(exclude_unset=True)})
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Role already exists")
+        PrincipalServices.invalidate_role(role_id)
         new_role = await RoleService.get_role_by_id(role_id)
+        permission_registry.upsert_role(new_role)
+        await permission_registry.bump_version()
         return new_role
 
     @staticmethod
@@ -103,6 +121,10 @@ class RoleService:
         """
         role = await RoleService.get_role_by_id(role_id)
         result = await role.delete()
+        PrincipalServices.invalidate_role(role_id)
+        permission_registry.remove_role(role_id)
+        await permission_registry.bump_version()
+        default_roles.reset(role_id)
         return result
 
     @staticmethod
@@ -124,5 +146,7 @@ class RoleService:
             raise HTTPException(status_code=404, detail="Role not found")
         if role not in user.roles:
             user.roles.append(role)
+            user.updated_at = datetime.utcnow()
             await user.save()
+            PrincipalServices.invalidate_user(user.id)
         return user
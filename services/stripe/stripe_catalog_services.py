@@ -0,0 +1,250 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Optional
+
+import stripe
+from beanie.odm.utils.dump import get_dict
+from pymongo import DeleteMany, ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from core.stripe_catalog import stripe_catalog
+from core.stripe_gateway import stripe_gateway
+from models.stripe_catalog_model import CatalogPrice, CatalogProduct
+from utils.logger import logger
+
+# Planes que el checkout ofrece por `lookup_key`; si aún no existen en
+# Stripe se crean la primera vez que se piden
+DEFAULT_PLANS = {
+    "price_basic": {
+        "amount": 1900,  # $19.00
+        "name": "Plan Básico",
+        "description": "Acceso a cursos básicos",
+    },
+    "price_premium": {
+        "amount": 3900,  # $39.00
+        "name": "Plan Premium",
+        "description": "Acceso a todos los cursos",
+    },
+}
+
+_provision_lock = asyncio.Lock()
+
+
+def _price(raw: Any, event_created: int) -> CatalogPrice:
+    recurring = raw.get("recurring") or {}
+    return CatalogPrice(
+        id=raw["id"],
+        unit_amount=raw.get("unit_amount"),
+        currency=raw.get("currency") or "usd",
+        interval=recurring.get("interval"),
+        interval_count=recurring.get("interval_count"),
+        lookup_key=raw.get("lookup_key"),
+        active=bool(raw.get("active", True)),
+        created=raw.get("created") or 0,
+        event_created=event_created,
+    )
+
+
+def _product_fields(raw: Any) -> dict:
+    default_price = raw.get("default_price")
+    return {
+        "name": raw.get("name") or "",
+        "description": raw.get("description"),
+        "active": bool(raw.get("active", True)),
+        "metadata": dict(raw.get("metadata") or {}),
+        # Puede venir expandido
+        "default_price": getattr(default_price, "id", default_price),
+        "updated": raw.get("updated") or 0,
+        "synced_at": datetime.utcnow(),
+    }
+
+
+def _product_id(value: Any) -> str:
+    return getattr(value, "id", value)
+
+
+class StripeCatalogServices:
+    """Mantiene la colección `stripe_products` igual al catálogo de Stripe."""
+
+    def __init__(self):
+        self.client = stripe_gateway.client
+
+    @staticmethod
+    def _collection():
+        return CatalogProduct.get_motor_collection()
+
+    async def sync(self) -> dict:
+        """
+        Reconciliación completa: recorre todas las páginas de productos y
+        precios de Stripe (activos e inactivos), reemplaza la copia local y
+        borra los productos que ya no existen.
+
+        Returns:
+            dict: Conteo de productos, precios y productos borrados.
+        """
+        now = int(time.time())
+        prices = defaultdict(list)
+        price_count = 0
+        page = await self.client.prices.list_async(params={"limit": 100})
+        async for price in page.auto_paging_iter():
+            prices[_product_id(price.product)].append(_price(price, now))
+            price_count += 1
+
+        operations = []
+        product_ids = []
+        page = await self.client.products.list_async(params={"limit": 100})
+        async for product in page.auto_paging_iter():
+            document = CatalogProduct(
+                id=product.id, prices=prices.get(product.id, []), **_product_fields(product)
+            )
+            operations.append(
+                ReplaceOne(
+                    {"_id": product.id}, get_dict(document, to_db=True), upsert=True
+                )
+            )
+            product_ids.append(product.id)
+        operations.append(DeleteMany({"_id": {"$nin": product_ids}}))
+
+        result = await self._collection().bulk_write(operations, ordered=False)
+        stripe_catalog.invalidate()
+        report = {
+            "products": len(product_ids),
+            "prices": price_count,
+            "removed": result.deleted_count,
+        }
+        logger.info({"message": "Stripe catalog synced", **report})
+        return report
+
+    async def apply_product(self, raw: Any) -> None:
+        """Guarda un producto recibido por webhook (`product.created/updated`)."""
+        fields = _product_fields(raw)
+        try:
+            # Si la copia local es más nueva (evento fuera de orden) no
+            # coincide el filtro, el upsert choca con el _id y se ignora
+            await self._collection().update_one(
+                {"_id": raw["id"], "updated": {"$not": {"$gt": fields["updated"]}}},
+                {"$set": fields, "$setOnInsert": {"prices": []}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return
+        stripe_catalog.invalidate()
+
+    async def remove_product(self, raw: Any) -> None:
+        await self._collection().delete_one({"_id": raw["id"]})
+        stripe_catalog.invalidate()
+
+    async def apply_price(self, raw: Any, event_created: int) -> None:
+        """
+        Reemplaza (o agrega) un precio dentro de su producto en una sola escritura.
+
+        Args:
+            raw: Objeto precio de Stripe.
+            event_created (int): `created` del evento; si el precio guardado
+                viene de un evento más nuevo, este se ignora.
+        """
+        price = _price(raw, event_created).model_dump()
+        prices = {"$ifNull": ["$prices", []]}
+        others = {
+            "$filter": {"input": prices, "cond": {"$ne": ["$$this.id", price["id"]]}}
+        }
+        newer = {
+            "$filter": {
+                "input": prices,
+                "cond": {
+                    "$and": [
+                        {"$eq": ["$$this.id", price["id"]]},
+                        {"$gt": ["$$this.event_created", event_created]},
+                    ]
+                },
+            }
+        }
+        await self._collection().update_one(
+            {"_id": _product_id(raw["product"])},
+            [
+                {
+                    "$set": {
+                        # Si la copia guardada viene de un evento más nuevo
+                        # (reintento o evento fuera de orden) se conserva
+                        "prices": {
+                            "$cond": [
+                                {"$gt": [{"$size": newer}, 0]},
+                                prices,
+                                {"$concatArrays": [others, {"$literal": [price]}]},
+                            ]
+                        },
+                        # Precio de un producto que todavía no llega: el
+                        # webhook del producto completa el resto
+                        "name": {"$ifNull": ["$name", ""]},
+                        "active": {"$ifNull": ["$active", False]},
+                        "updated": {"$ifNull": ["$updated", 0]},
+                    }
+                }
+            ],
+            upsert=True,
+        )
+        stripe_catalog.invalidate()
+
+    async def remove_price(self, raw: Any) -> None:
+        await self._collection().update_one(
+            {"_id": _product_id(raw["product"])},
+            {"$pull": {"prices": {"id": raw["id"]}}},
+        )
+        stripe_catalog.invalidate()
+
+    async def resolve_price(
+        self, key: Optional[str]
+    ) -> Optional[tuple[CatalogProduct, CatalogPrice]]:
+        """
+        Producto y precio para un id de precio o `lookup_key`, desde el
+        catálogo local. Un plan de DEFAULT_PLANS que aún no existe en Stripe
+        se crea una sola vez.
+        """
+        if not key:
+            return None
+        resolved = await stripe_catalog.resolve_price(key)
+        if resolved is None and key in DEFAULT_PLANS:
+            async with _provision_lock:
+                await stripe_catalog.load()
+                resolved = await stripe_catalog.resolve_price(key)
+                if resolved is None:
+                    await self._provision_plan(key)
+                    await stripe_catalog.load()
+                    resolved = await stripe_catalog.resolve_price(key)
+        return resolved
+
+    async def _provision_plan(self, lookup_key: str) -> None:
+        # Otro proceso pudo haberlo creado y su webhook no llegar todavía
+        found = await self.client.prices.list_async(
+            params={"lookup_keys": [lookup_key], "expand": ["data.product"]}
+        )
+        if found.data:
+            price = found.data[0]
+            product = price.product
+        else:
+            plan = DEFAULT_PLANS[lookup_key]
+            product = await self.client.products.create_async(
+                params={"name": plan["name"], "description": plan["description"]}
+            )
+            price = await self.client.prices.create_async(
+                params={
+                    "unit_amount": plan["amount"],
+                    "currency": "usd",
+                    "recurring": {"interval": "month"},
+                    "product": product.id,
+                    "lookup_key": lookup_key,
+                }
+            )
+            logger.info(
+                {
+                    "message": "Stripe plan provisioned",
+                    "lookup_key": lookup_key,
+                    "product_id": product.id,
+                    "price_id": price.id,
+                }
+            )
+        if isinstance(product, stripe.Product):
+            await self.apply_product(product)
+        await self.apply_price(price, price.created)
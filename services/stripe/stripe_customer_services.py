@@ -1,11 +1,11 @@
-import stripe
+from core.stripe_gateway import stripe_gateway
 
 
 class StripeCustomerServices:
     def __init__(self):
-        self.stripe = stripe
+        self.client = stripe_gateway.client
 
-    def create_customer(self, email: str, payment_method_id: str = None):
+    async def create_customer(self, email: str, payment_method_id: str = None):
         try:
             customer_data = {
                 "email": email,
@@ -13,7 +13,7 @@ class StripeCustomerServices:
             if payment_method_id:
                 customer_data["payment_method"] = payment_method_id
 
-            customer = self.stripe.Customer.create(**customer_data)
+            customer = await self.client.customers.create_async(params=customer_data)
             return customer
         except Exception as e:
             raise e
@@ -1,6 +1,7 @@
-import asyncio
 import stripe
 from core.config import settings
+from core.stripe_gateway import stripe_gateway
+from services.stripe.stripe_catalog_services import StripeCatalogServices
 from schemas.stripe_schemas import StripeWebhookEvent
 from utils.exceptions import PaymentError
 from utils.logger import logger
@@ -11,43 +12,7 @@ from utils.stripe_helpers import process_successful_checkout
 
 class StripePaymentServices:
     def __init__(self):
-        self.stripe = stripe
-
-    async def create_checkout_session(self, price_id: str) -> stripe.checkout.Session:
-        """
-        Crea una sesión de checkout para una suscripción.
-
-        Args:
-            price_id: ID del precio de Stripe
-
-        Returns:
-            Session: Sesión de checkout de Stripe
-        """
-        try:
-            session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                line_items=[
-                    {
-                        "price": price_id,
-                        "quantity": 1,
-                    }
-                ],
-                mode="subscription",
-                success_url=f"{settings.FRONTEND_URL}/success?session_id={{CHECKOUT_SESSION_ID}}",
-                cancel_url=f"{settings.FRONTEND_URL}/cancel",
-                # Opcional: Pasar metadata adicional
-                metadata={"price_id": price_id},
-            )
-            return session
-        except stripe.error.StripeError as e:
-            logger.error(
-                {
-                    "message": "Error creating checkout session",
-                    "error": str(e),
-                    "price_id": price_id,
-                }
-            )
-            raise PaymentError(str(e))
+        self.client = stripe_gateway.client
 
     async def create_checkout_session(self, request: Request):
         """Crea una sesión de checkout"""
@@ -56,50 +21,28 @@ class StripePaymentServices:
             data = await request.json()
             price_id = data.get("priceId")
 
-            # Mapeo de precios
-            price_mapping = {
-                "price_basic": {
-                    "amount": 1900,  # $19.00
-                    "name": "Plan Básico",
-                    "description": "Acceso a cursos básicos",
-                },
-                "price_premium": {
-                    "amount": 3900,  # $39.00
-                    "name": "Plan Premium",
-                    "description": "Acceso a todos los cursos",
-                },
-            }
-
-            price_data = price_mapping.get(price_id)
-            if not price_data:
+            # Precio y producto salen del catálogo local: la única llamada
+            # a Stripe es la creación de la sesión
+            resolved = await StripeCatalogServices().resolve_price(price_id)
+            if resolved is None:
                 raise PaymentError("Invalid price ID")
-
-            # Primero crear el producto
-            product = stripe.Product.create(
-                name=price_data["name"], description=price_data["description"]
-            )
-
-            # Luego crear el precio asociado al producto
-            price = stripe.Price.create(
-                unit_amount=price_data["amount"],
-                currency="usd",
-                recurring={"interval": "month"},
-                product=product.id,  # Usar el ID del producto creado
-            )
+            product, price = resolved
 
             # Crear la sesión de checkout
-            checkout_session = stripe.checkout.Session.create(
-                payment_method_types=["card"],
-                line_items=[
-                    {
-                        "price": price.id,
-                        "quantity": 1,
-                    }
-                ],
-                mode="subscription",
-                success_url=f"{settings.FRONTEND_URL}/success?session_id={{CHECKOUT_SESSION_ID}}",
-                cancel_url=f"{settings.FRONTEND_URL}/cancel",
-                metadata={"price_id": price_id, "plan_name": price_data["name"]},
+            checkout_session = await self.client.checkout.sessions.create_async(
+                params={
+                    "payment_method_types": ["card"],
+                    "line_items": [
+                        {
+                            "price": price.id,
+                            "quantity": 1,
+                        }
+                    ],
+                    "mode": "subscription",
+                    "success_url": f"{settings.FRONTEND_URL}/success?session_id={{CHECKOUT_SESSION_ID}}",
+                    "cancel_url": f"{settings.FRONTEND_URL}/cancel",
+                    "metadata": {"price_id": price_id, "plan_name": product.name},
+                }
             )
 
             logger.info(
@@ -113,6 +56,8 @@ class StripePaymentServices:
 
             return {"url": checkout_session.url}
 
+        except PaymentError:
+            raise
         except stripe.error.StripeError as e:
             logger.error(
                 {
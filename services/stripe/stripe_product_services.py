@@ -3,11 +3,14 @@ from typing import List
 from schemas.stripe_schemas import ProductCreate, ProductResponse
 import stripe
 from fastapi import HTTPException
+from core.stripe_catalog import stripe_catalog
+from core.stripe_gateway import stripe_gateway
+from services.stripe.stripe_catalog_services import StripeCatalogServices
 
 
 class StripeProductServices:
     def __init__(self):
-        self.stripe = stripe
+        self.client = stripe_gateway.client
 
     async def create_product(self, product: ProductCreate) -> ProductResponse:
         """
@@ -24,20 +27,29 @@ class StripeProductServices:
         """
         try:
             # Crear el producto
-            stripe_product = stripe.Product.create(
-                name=product.name,
-                description=product.description,
-                active=True,
+            stripe_product = await self.client.products.create_async(
+                params={
+                    "name": product.name,
+                    "description": product.description,
+                    "active": True,
+                }
             )
 
             # Crear el precio
-            price = stripe.Price.create(
-                product=stripe_product.id,
-                unit_amount=int(product.price * 100),  # Convertir a centavos
-                currency=product.currency,
-                recurring={"interval": product.interval},
+            price = await self.client.prices.create_async(
+                params={
+                    "product": stripe_product.id,
+                    "unit_amount": int(product.price * 100),  # Convertir a centavos
+                    "currency": product.currency,
+                    "recurring": {"interval": product.interval},
+                }
             )
 
+            # Visible en el listado sin esperar los webhooks
+            catalog = StripeCatalogServices()
+            await catalog.apply_product(stripe_product)
+            await catalog.apply_price(price, price.created)
+
             return ProductResponse(
                 id=stripe_product.id,
                 name=product.name,
@@ -55,36 +67,10 @@ class StripeProductServices:
 
     async def list_products(self) -> List[ProductResponse]:
         """
-        Obtiene la lista de todos los productos activos en Stripe.
+        Obtiene la lista de todos los productos activos desde el catálogo local
+        (sincronizado con Stripe por webhooks y reconciliación), sin llamar a Stripe.
 
         Returns:
-            List[ProductResponse]: Lista de productos con sus precios asociados.
-
-        Raises:
-            HTTPException: Si hay un error al obtener los productos de Stripe.
+            List[ProductResponse]: Lista de productos con todos sus precios activos.
         """
-        try:
-            products = stripe.Product.list(active=True)
-            prices = stripe.Price.list(active=True)
-
-            # Crear un diccionario de precios por producto
-            price_map = {price.product: price for price in prices.data}
-
-            return [
-                ProductResponse(
-                    id=product.id,
-                    name=product.name,
-                    description=product.description,
-                    price_id=price_map[product.id].id,
-                    price=price_map[product.id].unit_amount / 100,
-                    interval=price_map[product.id].recurring.interval,
-                    currency=price_map[product.id].currency,
-                    active=product.active,
-                )
-                for product in products.data
-                if product.id in price_map
-            ]
-
-        except stripe.error.StripeError as e:
-            logger.error({"message": "Error listing products", "error": str(e)})
-            raise HTTPException(status_code=400, detail=str(e))
+        return await stripe_catalog.list_products()
@@ -1,117 +1,208 @@
+import calendar
+import time
+from datetime import datetime
 from utils.logger import logger
 from utils.exceptions import PaymentError
-from typing import List
+from typing import Any, Optional
+from schemas.general_schemas import Page
 from schemas.stripe_schemas import SubscriptionCreate, SubscriptionResponse
 import stripe
-from fastapi import HTTPException
+from fastapi import HTTPException, status as http_status
+from pymongo.errors import DuplicateKeyError
+from core.config import settings
+from core.stripe_catalog import stripe_catalog
+from core.stripe_gateway import stripe_gateway
+from models.stripe_subscription_model import SubscriptionMirror
+from utils.error_codes import ErrorCodes
+from utils.pagination_utils import filters_from
+
+
+def _datetime(timestamp: Optional[int]) -> Optional[datetime]:
+    return datetime.utcfromtimestamp(timestamp) if timestamp else None
+
+
+def _epoch(value: Optional[datetime]) -> int:
+    return calendar.timegm(value.utctimetuple()) if value else 0
+
+
+def _parse_cursor(cursor: str) -> tuple[Optional[datetime], str]:
+    """El cursor es `<current_period_end en epoch>:<id de la suscripción>`."""
+    period_end, _, subscription_id = cursor.partition(":")
+    if not period_end.isdigit() or not subscription_id:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=ErrorCodes.BAD_OBJECT_ID.value,
+        )
+    return _datetime(int(period_end)), subscription_id
+
+
+def _subscription_fields(raw: Any) -> dict:
+    items = (raw.get("items") or {}).get("data") or []
+    price = (items[0].get("price") or {}) if items else {}
+    recurring = price.get("recurring") or {}
+    customer = raw.get("customer")
+    product = price.get("product")
+    return {
+        # `customer` y `product` pueden venir expandidos
+        "customer_id": getattr(customer, "id", customer),
+        "status": raw.get("status"),
+        "price_id": price.get("id"),
+        "product_id": getattr(product, "id", product),
+        "unit_amount": price.get("unit_amount"),
+        "currency": price.get("currency") or "usd",
+        "interval": recurring.get("interval"),
+        "quantity": (items[0].get("quantity") if items else None) or 1,
+        "current_period_start": _datetime(raw.get("current_period_start")),
+        "current_period_end": _datetime(raw.get("current_period_end")),
+        "cancel_at_period_end": bool(raw.get("cancel_at_period_end")),
+        "canceled_at": _datetime(raw.get("canceled_at")),
+        "created": _datetime(raw.get("created")),
+        "metadata": dict(raw.get("metadata") or {}),
+        "synced_at": datetime.utcnow(),
+    }
 
 
 class StripeSubscriptionServices:
     def __init__(self):
-        self.stripe = stripe
+        self.client = stripe_gateway.client
+
+    @staticmethod
+    def _collection():
+        return SubscriptionMirror.get_motor_collection()
 
     async def create_subscription(
         self, subscription: SubscriptionCreate
     ) -> SubscriptionResponse:
         try:
-            subscription = await self.stripe.Subscription.create(
-                customer=subscription.customer_id,
-                items=[{"price": subscription.price_id}],
-                payment_behavior="default_incomplete",
-                expand=["latest_invoice.payment_intent"],
+            subscription = await self.client.subscriptions.create_async(
+                params={
+                    "customer": subscription.customer_id,
+                    "items": [{"price": subscription.price_id}],
+                    "payment_behavior": "default_incomplete",
+                    "expand": ["latest_invoice.payment_intent"],
+                }
             )
             return subscription
         except stripe.error.StripeError as e:
             logger.error({"message": "Error creating subscription", "error": str(e)})
             raise HTTPException(status_code=400, detail=str(e))
 
-    async def get_subscriptions(self) -> List[SubscriptionResponse]:
+    async def apply_subscription(self, raw: Any, event_created: int) -> None:
         """
-        Obtiene todas las suscripciones activas.
-
-        Returns:
-            List[SubscriptionResponse]: Lista de suscripciones activas con detalles del cliente y producto.
+        Guarda una suscripción recibida por webhook (`customer.subscription.*`)
+        en el espejo local.
 
-        Raises:
-            HTTPException: Si hay un error al obtener las suscripciones de Stripe.
+        Args:
+            raw: Objeto suscripción de Stripe.
+            event_created (int): `created` del evento; uno más viejo que el
+                último aplicado se ignora.
         """
+        fields = _subscription_fields(raw)
+        fields["event_created"] = event_created
         try:
-            # Obtener suscripciones con expansión limitada
-            subscriptions_list = self.stripe.Subscription.list(
-                status="active", expand=["data.customer", "data.items.data.price"]
+            # Si la copia es más nueva no coincide el filtro y el upsert
+            # choca con el _id: el evento atrasado se descarta
+            await self._collection().update_one(
+                {"_id": raw["id"], "event_created": {"$not": {"$gt": event_created}}},
+                {"$set": fields},
+                upsert=True,
             )
+        except DuplicateKeyError:
+            pass
 
-            subscription_responses = []
-            for sub in subscriptions_list.data:
-                try:
-                    # Obtener el primer item de la suscripción
-                    item = sub.items.data[0] if sub.items.data else None
-                    if not item:
-                        continue
-
-                    # Obtener el producto separadamente si es necesario
-                    product = None
-                    if item and item.price and item.price.product:
-                        product = self.stripe.Product.retrieve(item.price.product)
-
-                    subscription_responses.append(
-                        SubscriptionResponse(
-                            id=sub.id,
-                            status=sub.status,
-                            customer_id=sub.customer.id if sub.customer else "N/A",
-                            customer_email=(
-                                sub.customer.email if sub.customer else "N/A"
-                            ),
-                            product_name=product.name if product else "N/A",
-                            price_amount=(
-                                item.price.unit_amount / 100 if item.price else 0
-                            ),
-                            currency=item.price.currency if item.price else "usd",
-                            interval=(
-                                item.price.recurring.interval
-                                if item.price and item.price.recurring
-                                else "month"
-                            ),
-                            current_period_end=sub.current_period_end,
-                            cancel_at_period_end=sub.cancel_at_period_end,
-                        )
-                    )
-
-                    logger.info(
-                        {
-                            "message": "Subscription processed",
-                            "subscription_id": sub.id,
-                            "customer_email": (
-                                sub.customer.email if sub.customer else "N/A"
-                            ),
-                        }
-                    )
-
-                except Exception as e:
-                    logger.error(
-                        {
-                            "message": "Error processing subscription",
-                            "subscription_id": sub.id,
-                            "error": str(e),
-                        }
-                    )
-                    continue
-
-            logger.info(
-                {
-                    "message": "Subscriptions retrieved successfully",
-                    "count": len(subscription_responses),
-                }
+    async def set_customer_email(self, subscription_id: str, email: str) -> None:
+        """El objeto suscripción no trae el email; llega con el checkout."""
+        try:
+            await self._collection().update_one(
+                {"_id": subscription_id},
+                {"$set": {"customer_email": email}},
+                upsert=True,
             )
+        except DuplicateKeyError:
+            pass
 
-            return subscription_responses
+    async def sync_subscriptions(self) -> int:
+        """
+        Carga todas las suscripciones de Stripe (todas las páginas y estados)
+        en el espejo local.
 
-        except stripe.error.StripeError as e:
-            logger.error({"message": "Error retrieving subscriptions", "error": str(e)})
-            raise HTTPException(status_code=400, detail=str(e))
-        except Exception as e:
-            logger.error({"message": "Unexpected error", "error": str(e)})
-            raise HTTPException(status_code=500, detail="Error interno del servidor")
+        Returns:
+            int: Número de suscripciones escritas.
+        """
+        now = int(time.time())
+        count = 0
+        page = await self.client.subscriptions.list_async(
+            params={"status": "all", "limit": 100, "expand": ["data.customer"]}
+        )
+        async for subscription in page.auto_paging_iter():
+            await self.apply_subscription(subscription, now)
+            customer = subscription.get("customer")
+            if getattr(customer, "email", None):
+                await self.set_customer_email(subscription.id, customer.email)
+            count += 1
+        return count
+
+    async def get_subscriptions(
+        self,
+        status: Optional[str] = "active",
+        customer_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+    ) -> Page:
+        """
+        Obtiene una página de suscripciones del espejo local, en orden de
+        renovación (`current_period_end`), sin llamar a Stripe. El nombre del
+        producto sale del catálogo en memoria.
+
+        Args:
+            status (str): Estado de la suscripción (None para todos).
+            customer_id (str): Solo las de este cliente de Stripe.
+            cursor (str): `next_cursor` de la página anterior.
+            limit (int): Tamaño de la página.
+
+        Returns:
+            Page[SubscriptionResponse]: Página de suscripciones.
+        """
+        query = filters_from(status=status, customer_id=customer_id)
+        if cursor:
+            period_end, subscription_id = _parse_cursor(cursor)
+            # Sin fecha (aún no llega el evento de la suscripción) van primero
+            after = {"$gt": period_end} if period_end else {"$ne": None}
+            query["$or"] = [
+                {"current_period_end": after},
+                {"current_period_end": period_end, "_id": {"$gt": subscription_id}},
+            ]
+        rows = (
+            await self._collection()
+            .find(query)
+            .sort([("current_period_end", 1), ("_id", 1)])
+            .limit(limit + 1)
+            .to_list(None)
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{_epoch(rows[-1].get('current_period_end'))}:{rows[-1]['_id']}"
+
+        await stripe_catalog.ensure_loaded()
+        items = []
+        for row in rows:
+            product = stripe_catalog.get_product(row.get("product_id"))
+            items.append(
+                SubscriptionResponse(
+                    id=row["_id"],
+                    status=row.get("status"),
+                    customer_id=row.get("customer_id") or "N/A",
+                    customer_email=row.get("customer_email") or "N/A",
+                    product_name=product.name if product else "N/A",
+                    price_amount=(row.get("unit_amount") or 0) / 100,
+                    currency=row.get("currency") or "usd",
+                    interval=row.get("interval") or "month",
+                    current_period_end=_epoch(row.get("current_period_end")),
+                    cancel_at_period_end=row.get("cancel_at_period_end", False),
+                )
+            )
+        return Page(items=items, next_cursor=next_cursor, limit=limit)
 
     async def cancel_subscription(self, subscription_id: str) -> dict:
         """
@@ -124,7 +215,7 @@ class StripeSubscriptionServices:
             dict: Detalles de la suscripción cancelada.
         """
         try:
-            subscription = await self.stripe.Subscription.delete(subscription_id)
+            subscription = await self.client.subscriptions.cancel_async(subscription_id)
             return subscription
         except stripe.error.StripeError as e:
             logger.error({"message": "Error canceling subscription", "error": str(e)})
@@ -144,8 +235,8 @@ class StripeSubscriptionServices:
             PaymentError: Si hay un error al reanudar la suscripción.
         """
         try:
-            subscription = await self.stripe.Subscription.resume(
-                subscription_id, billing_cycle_anchor="now"
+            subscription = await self.client.subscriptions.resume_async(
+                subscription_id, params={"billing_cycle_anchor": "now"}
             )
             return subscription
         except stripe.error.StripeError as e:
@@ -164,8 +255,10 @@ class StripeSubscriptionServices:
             dict: Detalles de la suscripción encontrada.
         """
         try:
-            subscription = await self.stripe.Subscription.search(
-                query=f"status:'{status}' AND metadata['order_id']:'{order_id}'"
+            subscription = await self.client.subscriptions.search_async(
+                params={
+                    "query": f"status:'{status}' AND metadata['order_id']:'{order_id}'"
+                }
             )
             return subscription
         except stripe.error.StripeError as e:
@@ -1,9 +1,14 @@
-import asyncio
+import json
 from typing import Dict, Any, Callable, Optional
 import stripe
+from pymongo.errors import DuplicateKeyError
+from core.webhook_worker import webhook_worker
+from models.webhook_event_model import WebhookEvent
 from schemas.stripe_schemas import StripeWebhookEvent
+from services.stripe.stripe_catalog_services import StripeCatalogServices
+from services.stripe.stripe_subscription_services import StripeSubscriptionServices
 from utils.exceptions import PaymentError, WebhookError
-from fastapi import Request, BackgroundTasks
+from fastapi import Request
 from utils.logger import logger
 from schemas.stripe_schemas import StripeEventType
 from utils.stripe_helpers import process_successful_checkout
@@ -32,6 +37,12 @@ class StripeWebhookServices:
             StripeEventType.SUBSCRIPTION_DELETED: self.handle_subscription_deleted,
             StripeEventType.INVOICE_PAID: self.handle_invoice_paid,
             StripeEventType.INVOICE_PAYMENT_FAILED: self.handle_payment_failed,
+            StripeEventType.PRODUCT_CREATED: self.handle_product_changed,
+            StripeEventType.PRODUCT_UPDATED: self.handle_product_changed,
+            StripeEventType.PRODUCT_DELETED: self.handle_product_deleted,
+            StripeEventType.PRICE_CREATED: self.handle_price_changed,
+            StripeEventType.PRICE_UPDATED: self.handle_price_changed,
+            StripeEventType.PRICE_DELETED: self.handle_price_deleted,
         }
 
     def get_event_handler(self, event_type: StripeEventType) -> Optional[Callable]:
@@ -46,13 +57,11 @@ class StripeWebhookServices:
         """
         return self._handlers.get(event_type)
 
-    async def webhook_received(
-        self, request: Request, background_tasks: BackgroundTasks
-    ) -> dict:
+    async def webhook_received(self, request: Request) -> dict:
         """Punto de entrada principal para webhooks"""
         try:
             event = await self._verify_webhook(request)
-            return await self._process_webhook(event, background_tasks)
+            return await self._enqueue_webhook(event, await request.body())
         except Exception as e:
             self._handle_webhook_error(e)
 
@@ -91,46 +100,52 @@ class StripeWebhookServices:
             )
             raise WebhookError("Invalid webhook signature")
 
-    async def process_webhook_async(self, event: stripe.Event) -> Dict[str, Any]:
+    async def dispatch(self, event: stripe.Event) -> Optional[Dict[str, Any]]:
         """
-        Procesa eventos de webhook de manera asíncrona.
+        Ejecuta el handler del evento. A diferencia de `process_webhook_async`
+        propaga los errores, para que el worker de la bandeja lo reintente.
         """
-        try:
+        logger.info(
+            {
+                "message": "Processing webhook event",
+                "event_type": event.type,
+                "event_id": event.id,
+            }
+        )
+
+        # Si el evento no está en nuestros handlers, lo registramos pero no lo tratamos como error
+        if event.type not in self._handlers:
             logger.info(
                 {
-                    "message": "Processing webhook event",
+                    "message": "Unhandled event type - skipping",
                     "event_type": event.type,
                     "event_id": event.id,
                 }
             )
+            return {
+                "status": "skipped",
+                "message": f"Event type {event.type} is not handled",
+            }
 
-            # Si el evento no está en nuestros handlers, lo registramos pero no lo tratamos como error
-            if event.type not in self._handlers:
-                logger.info(
-                    {
-                        "message": "Unhandled event type - skipping",
-                        "event_type": event.type,
-                        "event_id": event.id,
-                    }
-                )
-                return {
-                    "status": "skipped",
-                    "message": f"Event type {event.type} is not handled",
-                }
-
-            handler = self._handlers[event.type]
-            result = await handler(event)
+        handler = self._handlers[event.type]
+        result = await handler(event)
 
-            logger.info(
-                {
-                    "message": "Webhook processed successfully",
-                    "event_type": event.type,
-                    "event_id": event.id,
-                }
-            )
+        logger.info(
+            {
+                "message": "Webhook processed successfully",
+                "event_type": event.type,
+                "event_id": event.id,
+            }
+        )
 
-            return result
+        return result
 
+    async def process_webhook_async(self, event: stripe.Event) -> Dict[str, Any]:
+        """
+        Procesa eventos de webhook de manera asíncrona.
+        """
+        try:
+            return await self.dispatch(event)
         except Exception as e:
             logger.error(
                 {
@@ -142,19 +157,38 @@ class StripeWebhookServices:
             # No lanzamos el error, solo lo registramos
             return {"status": "error", "message": f"Error processing webhook: {str(e)}"}
 
-    async def _process_webhook(
-        self, event: stripe.Event, background_tasks: BackgroundTasks
-    ) -> dict:
-        """Procesa el webhook verificado"""
+    async def _enqueue_webhook(self, event: stripe.Event, payload: bytes) -> dict:
+        """
+        Guarda el webhook verificado en la bandeja `webhook_events` y responde
+        de inmediato; el worker lo procesa después. Una entrega repetida del
+        mismo evento choca con el índice único y no se vuelve a encolar.
+        """
+        try:
+            await WebhookEvent(
+                event_id=event.id, type=event.type, payload=json.loads(payload)
+            ).insert()
+        except DuplicateKeyError:
+            logger.info(
+                {
+                    "message": "Duplicate webhook delivery",
+                    "event_id": event.id,
+                    "event_type": event.type,
+                }
+            )
+            return {
+                "status": "duplicate",
+                "event_id": event.id,
+                "message": f"Webhook already received: {event.id}",
+            }
+
         logger.info(
             {
-                "message": "Processing webhook",
+                "message": "Webhook queued",
                 "event_id": event.id,
                 "event_type": event.type,
             }
         )
-
-        background_tasks.add_task(self.process_webhook_async, event)
+        webhook_worker.notify()
 
         return {
             "status": "accepted",
@@ -177,54 +211,42 @@ class StripeWebhookServices:
     async def handle_checkout_completed(
         self, event: StripeWebhookEvent
     ) -> Dict[str, Any]:
-        """Maneja eventos de checkout completado con reintentos"""
-        max_retries = 3
-        base_delay = 2  # segundos
-
-        for attempt in range(max_retries):
-            try:
-                session = event.data.object
-                customer_details = session.get("customer_details", {})
-
-                await process_successful_checkout(
-                    customer_email=customer_details.get("email"),
-                    subscription_id=session.get("subscription"),
-                )
+        """Maneja eventos de checkout completado (el worker reintenta si falla)"""
+        try:
+            session = event.data.object
+            customer_details = session.get("customer_details", {})
 
-                logger.info(
-                    {
-                        "message": "Checkout processed successfully",
-                        "event_id": event.id,
-                        "customer_email": customer_details.get("email"),
-                    }
+            await process_successful_checkout(
+                customer_email=customer_details.get("email"),
+                subscription_id=session.get("subscription"),
+            )
+            if session.get("subscription") and customer_details.get("email"):
+                await StripeSubscriptionServices().set_customer_email(
+                    session.get("subscription"), customer_details.get("email")
                 )
 
-                return {
-                    "status": "success",
-                    "message": f"Checkout completed for {customer_details.get('email')}",
+            logger.info(
+                {
+                    "message": "Checkout processed successfully",
+                    "event_id": event.id,
+                    "customer_email": customer_details.get("email"),
                 }
+            )
 
-            except Exception as e:
-                delay = base_delay * (2**attempt)  # Exponential backoff
-                if attempt == max_retries - 1:  # Último intento
-                    logger.error(
-                        {
-                            "message": "Max retries reached for checkout processing",
-                            "error": str(e),
-                            "event_id": event.id,
-                            "attempts": max_retries,
-                        }
-                    )
-                    raise PaymentError(f"Failed to process checkout: {str(e)}")
-
-                logger.warning(
-                    {
-                        "message": f"Retry {attempt + 1}/{max_retries} for checkout processing",
-                        "event_id": event.id,
-                        "next_retry_in": f"{delay}s",
-                    }
-                )
-                await asyncio.sleep(delay)
+            return {
+                "status": "success",
+                "message": f"Checkout completed for {customer_details.get('email')}",
+            }
+
+        except Exception as e:
+            logger.error(
+                {
+                    "message": "Error processing checkout",
+                    "error": str(e),
+                    "event_id": event.id,
+                }
+            )
+            raise PaymentError(f"Failed to process checkout: {str(e)}")
 
     async def handle_subscription_created(
         self, event: StripeWebhookEvent
@@ -232,16 +254,14 @@ class StripeWebhookServices:
         """Maneja eventos de suscripción creada"""
         try:
             subscription = event.data.object
-            customer_id = subscription.get("customer")
-            subscription_id = subscription.get("id")
-
-            # Aquí deberías actualizar tu base de datos con la nueva suscripción
-            # await update_user_subscription(customer_id, subscription_id)
+            await StripeSubscriptionServices().apply_subscription(
+                subscription, event.created
+            )
 
             return {
                 "status": "success",
-                "message": f"Subscription created: {subscription_id}",
-                "customer_id": customer_id,
+                "message": f"Subscription created: {subscription.get('id')}",
+                "customer_id": subscription.get("customer"),
             }
         except Exception as e:
             logger.error(
@@ -257,8 +277,26 @@ class StripeWebhookServices:
         self, event: StripeWebhookEvent
     ) -> Dict[str, Any]:
         """Maneja eventos de suscripción actualizada"""
-        # Implementar lógica específica
-        pass
+        try:
+            subscription = event.data.object
+            await StripeSubscriptionServices().apply_subscription(
+                subscription, event.created
+            )
+
+            return {
+                "status": "success",
+                "message": f"Subscription updated: {subscription.get('id')}",
+                "subscription_status": subscription.get("status"),
+            }
+        except Exception as e:
+            logger.error(
+                {
+                    "message": "Error processing subscription update",
+                    "error": str(e),
+                    "event_id": event.id,
+                }
+            )
+            raise PaymentError(f"Failed to process subscription update: {str(e)}")
 
     async def handle_subscription_deleted(
         self, event: StripeWebhookEvent
@@ -267,9 +305,10 @@ class StripeWebhookServices:
         try:
             subscription = event.data.object
             customer_id = subscription.get("customer")
-
-            # Aquí deberías actualizar tu base de datos para marcar la suscripción como cancelada
-            # await cancel_user_subscription(customer_id)
+            # El objeto llega con status "canceled"; se conserva en el espejo
+            await StripeSubscriptionServices().apply_subscription(
+                subscription, event.created
+            )
 
             return {
                 "status": "success",
@@ -316,3 +355,27 @@ class StripeWebhookServices:
                 "status": "error",
                 "message": f"Error processing payment failure: {str(e)}",
             }
+
+    async def handle_product_changed(self, event: StripeWebhookEvent) -> Dict[str, Any]:
+        """Actualiza el catálogo local con un producto creado o modificado"""
+        product = event.data.object
+        await StripeCatalogServices().apply_product(product)
+        return {"status": "success", "message": f"Product synced: {product.get('id')}"}
+
+    async def handle_product_deleted(self, event: StripeWebhookEvent) -> Dict[str, Any]:
+        """Quita un producto borrado del catálogo local"""
+        product = event.data.object
+        await StripeCatalogServices().remove_product(product)
+        return {"status": "success", "message": f"Product removed: {product.get('id')}"}
+
+    async def handle_price_changed(self, event: StripeWebhookEvent) -> Dict[str, Any]:
+        """Actualiza el catálogo local con un precio creado o modificado"""
+        price = event.data.object
+        await StripeCatalogServices().apply_price(price, event.created)
+        return {"status": "success", "message": f"Price synced: {price.get('id')}"}
+
+    async def handle_price_deleted(self, event: StripeWebhookEvent) -> Dict[str, Any]:
+        """Quita un precio borrado del catálogo local"""
+        price = event.data.object
+        await StripeCatalogServices().remove_price(price)
+        return {"status": "success", "message": f"Price removed: {price.get('id')}"}
@@ -1,20 +1,47 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
+import asyncio
 import logging
 
 from fastapi import HTTPException, status
-
-from models.role_model import Role
-from models.user_model import User
-from models.token_model import BlacklistToken
-from schemas.permission_schema import PermissionCreate
-from schemas.role_schemas import RoleCreate
-from schemas.user_schema import UserCreate, UserUpdate, UserInDB
+from jose import JWTError, jwt
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from core.config import settings
+from core.default_roles import default_roles
+from core.token_blacklist import token_blacklist, token_revocation_id
+from models.user_model import CASE_INSENSITIVE, User
+from schemas.user_schema import (
+    StudentImportEvent,
+    StudentImportRow,
+    UserCreate,
+    UserInDB,
+    UserListItem,
+    UserUpdate,
+)
 from schemas.auth_schema import TokenSchema
-from services.util_services import get_valid_document, user_exists
-from utils.auth_utils import get_password_hash, verify_password
-from services.role_services import RoleService
-from services.permission_services import PermissionsServices
+from schemas.bulk_schema import BulkReport
+from services.util_services import duplicate_user_message, get_valid_document
+from utils.auth_utils import get_password_hash_async, verify_password_async
+from utils.bulk_utils import (
+    BulkResult,
+    delete_operation,
+    execute_bulk,
+    find_existing,
+    insert_operation,
+    update_operation,
+    validate_ids,
+    validate_items,
+    validate_update_items,
+    validation_message,
+)
+from utils.general_utils import update_payload
+from utils.import_utils import chunked
+from utils.pagination_utils import PageParams, paginate
+from utils.streaming_utils import iter_documents
+from services.principal_services import PrincipalServices
+from services.course_summary_services import CourseSummaryServices
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +67,7 @@ class UserServices:
                 logger.error(f"Invalid hash format for user {email}")
                 return None
 
-            is_valid = verify_password(
+            is_valid = await verify_password_async(
                 plain_password=password, hashed_password=user.hashed_password
             )
 
@@ -66,17 +93,10 @@ class UserServices:
             dict = Mensaje de confirmación
         """
         try:
-            token_doc = BlacklistToken(
-                token=data.access_token, expires_at=datetime.now() + timedelta(days=1)
-            )
-            await token_doc.create()
+            await UserServices._revoke_token(data.access_token, timedelta(days=1))
 
             if data.refresh_token:
-                refresh_token_doc = BlacklistToken(
-                    token=data.refresh_token,
-                    expires_at=datetime.now() + timedelta(days=7),
-                )
-                await refresh_token_doc.create()
+                await UserServices._revoke_token(data.refresh_token, timedelta(days=7))
 
             return {"message": "Logout exitoso"}
 
@@ -87,6 +107,21 @@ class UserServices:
                 detail="Error al procesar el logout",
             )
 
+    @staticmethod
+    async def _revoke_token(token: str, default_ttl: timedelta):
+        """Guarda la revocación por `jti` (o hash del token) hasta que el token expire"""
+        try:
+            claims = jwt.get_unverified_claims(token)
+        except JWTError:
+            claims = {}
+        expires_at = (
+            datetime.utcfromtimestamp(claims["exp"])
+            if claims.get("exp")
+            else datetime.utcnow() + default_ttl
+        )
+        jti = token_revocation_id(token, claims)
+        await token_blacklist.revoke(jti, expires_at)
+
     @staticmethod
     async def create_user_service(user: UserCreate):
         """Create a user
@@ -98,78 +133,28 @@ class UserServices:
             User model instance
         """
         try:
-            # Check if username already exists
-            await user_exists(user.username, user.email)
-
             # Hash password
-            hashed_password = get_password_hash(user.password)
-            role_created = None
-
-            admin_permissions = ["crear", "editar", "lectura", "eliminar"]
-            permissions_created = []
-            for permission in admin_permissions:
-                try:
-                    permission_data = PermissionCreate(
-                        name=permission,
-                        description=f"Permiso para {permission}",
-                    )
-                    permission_result = await PermissionsServices.create_permission(permission_data)
-                    if permission_result:
-                        permissions_created.append(str(permission_result.name))
-                except Exception as e:
-                    # Si el permiso ya existe, lo recuperamos (evita detener el flujo)
-                    existing_permission = await PermissionsServices.get_permission_by_name(permission)
-                    if existing_permission:
-                        permissions_created.append(existing_permission.name)
-
-
-            if user.is_admin:
-                admin_role = None
-                try:
-                    search_if_role_already_exist = await RoleService.get_role_by_name("Administrador")
-                    if search_if_role_already_exist:
-                        admin_role = search_if_role_already_exist
-                    else:
-                        admin_role = RoleCreate(
-                            name=f"Administrador",
-                            description=f"Permiso para {user.username}",
-                            permissions=permissions_created,
-                        )
-                        role_created = await RoleService.create_role(name=admin_role.name, description=admin_role.description, permissions=admin_role.permissions)
-
-                except Exception as e:
-                    if e.args[0] == 400:
-                        existing_role = await RoleService.get_role_by_name(admin_role.name)
-                        if existing_role:
-                            role_created = existing_role
-            else:
-                user_role = RoleCreate(
-                    name=f"User",
-                    description=f"Permiso para usuarios",
-                    permissions=permissions_created,
-                )
-                try:
-                    result = await RoleService.create_role(user_role.name, description=user_role.description, permissions=user_role.permissions)
-                    role_created = result
-
-                except Exception as e:
-                    print("Error creating role: " + str(e))
-                    search_role = await Role.find_one(Role.name == user_role.name)
-                    if search_role:
-                        role_created = search_role
+            hashed_password = await get_password_hash_async(user.password)
 
             user_in_db = UserInDB(
                 username=user.username,
                 email=user.email,
                 hashed_password=hashed_password,
                 active=True,
-                roles=[role_created.id],
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                roles=[await default_roles.role_id(user.is_admin)],
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
             )
 
             new_user = User(**user_in_db.model_dump())
-            await new_user.create()
+            try:
+                # Los índices únicos de email/username deciden si ya existe
+                await new_user.create()
+            except DuplicateKeyError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=duplicate_user_message(e.details or {}),
+                )
             return new_user
         except Exception as e:
             raise HTTPException(
@@ -178,18 +163,34 @@ class UserServices:
             )
 
     @staticmethod
-    async def get_all_users_service():
-        """Get all users
+    async def get_all_users_service(params: PageParams, filters: dict = None):
+        """Get a page of users
+
+        Arguments:
+            params: PageParams = Cursor and page size
+            filters: dict = Equality filters applied by the database
 
         Returns:
-            List of User model instances
+            Page of users without the password hash
         """
-        users = await User.find_all().to_list()
-        if not users:
+        page = await paginate(User, params, filters, projection_model=UserListItem)
+        if not page.items and not params.cursor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="No users found"
             )
-        return users
+        return page
+
+    @staticmethod
+    def export_users_service(filters: dict = None):
+        """Iterate over every user for an export
+
+        Arguments:
+            filters: dict = Equality filters applied by the database
+
+        Returns:
+            Async iterator of users without the password hash
+        """
+        return iter_documents(User, filters, projection_model=UserListItem)
 
     @staticmethod
     async def get_user_by_id_service(user_id: str):
@@ -214,7 +215,9 @@ class UserServices:
         Returns:
             User model instance
         """
-        user = await User.find_one(User.username == username)
+        user = await User.find_one(
+            User.username == username, collation=CASE_INSENSITIVE
+        )
         return user
 
     @staticmethod
@@ -227,9 +230,19 @@ class UserServices:
         Returns:
             User model instance
         """
-        user = await User.find_one(User.email == email)
+        user = await User.find_one(User.email == email, collation=CASE_INSENSITIVE)
         return user
 
+    @staticmethod
+    async def _update_payload(data: UserUpdate) -> dict:
+        """`$set` de una actualización; la contraseña se guarda solo como hash."""
+        payload = update_payload(data, exclude={"password"})
+        if data.password:
+            payload["$set"]["hashed_password"] = await get_password_hash_async(
+                data.password
+            )
+        return payload
+
     @staticmethod
     async def update_user_by_id_service(user_id: str, data: UserUpdate):
         """Update a user by id
@@ -242,7 +255,15 @@ class UserServices:
             User model instance
         """
         user = await get_valid_document(user_id, User)
-        await user.update({"$set": data.model_dump(exclude_unset=True)})
+        try:
+            await user.update(await UserServices._update_payload(data))
+        except DuplicateKeyError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=duplicate_user_message(e.details or {}),
+            )
+        PrincipalServices.invalidate_user(user_id)
+        await CourseSummaryServices.teacher_changed(user.id)
         return user
 
     @staticmethod
@@ -257,4 +278,224 @@ class UserServices:
         """
         user = await get_valid_document(user_id, User)
         await user.delete()
+        PrincipalServices.invalidate_user(user_id)
         return {"message": "User deleted successfully"}
+
+    @staticmethod
+    async def _taken(users: list) -> tuple[set, set]:
+        """Usernames y emails (en minúsculas) de `users` que ya existen, en una consulta"""
+        existing = User.get_motor_collection().find(
+            {
+                "$or": [
+                    {"username": {"$in": [user.username for user in users]}},
+                    {"email": {"$in": [user.email for user in users]}},
+                ]
+            },
+            {"username": 1, "email": 1},
+            collation=CASE_INSENSITIVE,
+        )
+        usernames, emails = set(), set()
+        async for raw in existing:
+            usernames.add(str(raw.get("username", "")).lower())
+            emails.add(str(raw.get("email", "")).lower())
+        return usernames, emails
+
+    @staticmethod
+    async def bulk_create_users(items: list, ordered: bool) -> BulkReport:
+        """Create many users in one request
+
+        Usernames and emails are checked against the batch and the database
+        with a single query and passwords are hashed concurrently in the
+        bcrypt pool.
+
+        Arguments:
+            items: list = Raw UserCreate items
+            ordered: bool = Stop at the first failed item
+
+        Returns:
+            BulkReport with the result of every item
+        """
+        result = BulkResult(len(items), ordered)
+        pending = validate_items(items, UserCreate, result)
+
+        taken_usernames, taken_emails = await UserServices._taken(
+            [user for _, user in pending]
+        )
+        for index, user in pending:
+            if user.username.lower() in taken_usernames:
+                result.fail(index, "Username already exists")
+            elif user.email.lower() in taken_emails:
+                result.fail(index, "Email already exists")
+            taken_usernames.add(user.username.lower())
+            taken_emails.add(user.email.lower())
+
+        pending = result.runnable(pending)
+        hashes = await asyncio.gather(
+            *(get_password_hash_async(user.password) for _, user in pending)
+        )
+        operations = []
+        now = datetime.utcnow()
+        for (index, user), hashed_password in zip(pending, hashes):
+            user_in_db = UserInDB(
+                username=user.username,
+                email=user.email,
+                hashed_password=hashed_password,
+                active=True,
+                roles=[await default_roles.role_id(user.is_admin)],
+                created_at=now,
+                updated_at=now,
+            )
+            user_id, operation = insert_operation(User(**user_in_db.model_dump()))
+            operations.append((index, user_id, operation))
+
+        await execute_bulk(
+            User, result, operations, "created", duplicate_user_message
+        )
+        return result.report()
+
+    @staticmethod
+    async def bulk_update_users(items: list, ordered: bool) -> BulkReport:
+        """Update many users in one bulk_write
+
+        Arguments:
+            items: list = Raw UserUpdate items, each with its `id`
+            ordered: bool = Stop at the first failed item
+
+        Returns:
+            BulkReport with the result of every item
+        """
+        result = BulkResult(len(items), ordered)
+        pending = validate_update_items(items, UserUpdate, result)
+        await find_existing(User, pending, result)
+        operations = [
+            (
+                index,
+                user_id,
+                update_operation(user_id, await UserServices._update_payload(data)),
+            )
+            for index, user_id, data in result.runnable(pending)
+        ]
+
+        updated = await execute_bulk(
+            User, result, operations, "updated", duplicate_user_message
+        )
+        for user_id in set(updated):
+            PrincipalServices.invalidate_user(str(user_id))
+            await CourseSummaryServices.teacher_changed(user_id)
+        return result.report()
+
+    @staticmethod
+    async def bulk_delete_users(items: list, ordered: bool) -> BulkReport:
+        """Delete many users in one bulk_write
+
+        Arguments:
+            items: list = User ids
+            ordered: bool = Stop at the first failed item
+
+        Returns:
+            BulkReport with the result of every item
+        """
+        result = BulkResult(len(items), ordered)
+        pending = validate_ids(items, result)
+        await find_existing(User, pending, result)
+        operations = [
+            (index, user_id, delete_operation(user_id))
+            for index, user_id in result.runnable(pending)
+        ]
+
+        for user_id in await execute_bulk(User, result, operations, "deleted"):
+            PrincipalServices.invalidate_user(str(user_id))
+        return result.report()
+
+    @staticmethod
+    async def import_students(rows: AsyncIterator) -> AsyncIterator[StudentImportEvent]:
+        """Import students from the rows of a CSV/NDJSON upload
+
+        Rows are processed in chunks of IMPORT_CHUNK_SIZE as they are parsed:
+        one `$in` query per chunk to find taken usernames/emails, passwords
+        hashed in the bcrypt pool and one insert_many per chunk.
+
+        Arguments:
+            rows: AsyncIterator = (line, dict or parse error) from iter_rows
+
+        Returns:
+            Async iterator of error events, a progress event per chunk and a
+            final done event
+        """
+        role_id = await default_roles.role_id()
+        seen_usernames, seen_emails = set(), set()
+        totals = {"rows": 0, "created": 0, "failed": 0}
+        async for chunk in chunked(rows, settings.IMPORT_CHUNK_SIZE):
+            errors = await UserServices._import_chunk(
+                chunk, role_id, seen_usernames, seen_emails
+            )
+            totals["rows"] += len(chunk)
+            totals["failed"] += len(errors)
+            totals["created"] = totals["rows"] - totals["failed"]
+            logger.info(
+                "Student import: %(rows)s rows, %(created)s created, %(failed)s failed",
+                totals,
+            )
+            for line, error in errors:
+                yield StudentImportEvent(event="error", line=line, error=error, **totals)
+            yield StudentImportEvent(event="progress", **totals)
+        yield StudentImportEvent(event="done", **totals)
+
+    @staticmethod
+    async def _import_chunk(
+        chunk: list, role_id, seen_usernames: set, seen_emails: set
+    ) -> list[tuple[int, str]]:
+        errors = []
+        valid = []
+        for line, row in chunk:
+            if isinstance(row, str):
+                errors.append((line, row))
+                continue
+            try:
+                valid.append((line, StudentImportRow.model_validate(row)))
+            except ValidationError as e:
+                errors.append((line, validation_message(e)))
+
+        taken_usernames, taken_emails = await UserServices._taken(
+            [row for _, row in valid]
+        )
+        seen_usernames |= taken_usernames
+        seen_emails |= taken_emails
+
+        pending = []
+        for line, row in valid:
+            if row.username.lower() in seen_usernames:
+                errors.append((line, "Username already exists"))
+            elif row.email.lower() in seen_emails:
+                errors.append((line, "Email already exists"))
+            else:
+                pending.append((line, row))
+            seen_usernames.add(row.username.lower())
+            seen_emails.add(row.email.lower())
+
+        hashes = await asyncio.gather(
+            *(get_password_hash_async(row.password) for _, row in pending)
+        )
+        now = datetime.utcnow()
+        users = [
+            User(
+                username=row.username,
+                email=row.email,
+                hashed_password=hashed_password,
+                active=True,
+                is_student=True,
+                roles=[role_id],
+                created_at=now,
+                updated_at=now,
+            )
+            for (_, row), hashed_password in zip(pending, hashes)
+        ]
+        if users:
+            try:
+                await User.insert_many(users, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    errors.append(
+                        (pending[error["index"]][0], duplicate_user_message(error))
+                    )
+        return sorted(errors)
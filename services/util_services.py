@@ -2,9 +2,7 @@ from typing import Type, TypeVar
 from beanie import Document
 from bson import ObjectId
 from fastapi import HTTPException, status
-from pydantic import EmailStr
 
-from models.user_model import User
 from utils.error_codes import ErrorCodes
 
 T = TypeVar("T", bound=Document)
@@ -27,15 +25,35 @@ async def get_valid_document(id: str, model: Type[T]) -> T:
     return document
 
 
-async def user_exists(username: str, email: EmailStr):
-    existing_user = await User.find_one(User.username == username)
-    if existing_user:
+def duplicate_user_message(details: dict) -> str:
+    """
+    Mensaje para un DuplicateKeyError (o un writeError de bulk_write) de los
+    índices únicos de users.
+    """
+    key = str(details.get("keyPattern") or details.get("errmsg", ""))
+    if "username" in key:
+        return "Username already exists"
+    if "email" in key:
+        return "Email already exists"
+    return details.get("errmsg", "Duplicate key")
+
+
+async def ensure_document_exists(id: str, model: Type[T]) -> ObjectId:
+    """Como get_valid_document, pero solo lee el `_id` del documento."""
+    if not ObjectId.is_valid(str(id)):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorCodes.BAD_OBJECT_ID.value,
         )
-    existing_user = await User.find_one(User.email == email)
-    if existing_user:
+
+    document_id = ObjectId(str(id))
+    found = await model.get_motor_collection().find_one(
+        {"_id": document_id}, {"_id": 1}
+    )
+    if not found:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorCodes.COLLECTION_NOT_FOUND.value,
         )
-    return False
+
+    return document_id
@@ -16,8 +16,9 @@ class VerificationCodeService:
             origin="reset_password",
             owner=user_id,
             status=True,
-            expiration=datetime.datetime.today() + datetime.timedelta(minutes=5),
-            created_at=datetime.datetime.today()
+            # En UTC para que coincida con el índice TTL de MongoDB
+            expiration=datetime.datetime.utcnow() + datetime.timedelta(minutes=5),
+            created_at=datetime.datetime.utcnow()
         )
         code_created = await new_code.insert()
         return code_created
@@ -31,9 +32,12 @@ class VerificationCodeService:
     @staticmethod
     async def validate_verification_code(code: str, user_id: str):
         get_code_to_validate = await VerificationCodeService.get_verification_code(code, user_id)
+        if not get_code_to_validate:
+            # El índice TTL ya pudo haber borrado el código expirado
+            raise Exception(f"The code {code} does not exist or has expired, try to generate a new one.")
         if not get_code_to_validate.status:
             raise Exception("The verification code has been used.")
-        if get_code_to_validate.expiration < datetime.datetime.today():
+        if get_code_to_validate.expiration < datetime.datetime.utcnow():
             get_code_to_validate.status = False
             await get_code_to_validate.save()
             raise Exception(f"The code {code} has expired, try to generate a new one.")
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
+from typing import Optional
+from uuid import uuid4
 from fastapi import HTTPException, status
 from jose import jwt
 import bcrypt
 from core.config import settings
 import logging
-from models.token_model import BlacklistToken
+from core.password_hasher import password_hasher
+from core.token_blacklist import token_blacklist, token_revocation_id
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +29,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-async def verify_token(token: str) -> bool:
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Igual que verify_password pero en el pool de bcrypt, sin bloquear el event loop
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_token(token: str, claims: Optional[dict] = None) -> bool:
     """
     Verifica si el token está en la lista negra
     """
-    blacklsted = await BlacklistToken.find_one({"token": token})
+    blacklsted = await token_blacklist.is_revoked(token_revocation_id(token, claims))
     if blacklsted:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,10 +64,17 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+async def get_password_hash_async(password: str) -> str:
+    """
+    Igual que get_password_hash pero en el pool de bcrypt, sin bloquear el event loop
+    """
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_token(data: dict, expires_delta: timedelta):
     to_encode = data.copy()
     expire = datetime.now() + expires_delta
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
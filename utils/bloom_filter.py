@@ -0,0 +1,43 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom simple sobre un bytearray.
+
+    Responde "seguro que no está" o "puede que esté"; nunca da falsos negativos.
+    """
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(
+            8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Doble hashing (Kirsch-Mitzenmacher) a partir de un solo digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
@@ -0,0 +1,253 @@
+import json
+from typing import Any, Callable, Optional, Type
+
+from beanie import Document, PydanticObjectId
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.encoder import Encoder
+from bson import ObjectId
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.config import settings
+from schemas.bulk_schema import BulkItemResult, BulkReport
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Para /docs: el cuerpo se lee a mano en read_bulk_items
+BULK_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {}}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+async def read_bulk_items(request: Request) -> list:
+    """
+    Dependencia de los endpoints bulk: el cuerpo es un arreglo JSON o, con
+    Content-Type application/x-ndjson, un item JSON por línea.
+    """
+    body = await request.body()
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if media_type in NDJSON_MEDIA_TYPES:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body or b"[]")
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid bulk body: {e}"
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk body must be a JSON array or NDJSON",
+        )
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per request",
+        )
+    return items
+
+
+class BulkResult:
+    """
+    Resultado por item de una operación bulk. En modo `ordered` todo lo que
+    va después del primer item fallido se reporta como `skipped`.
+    """
+
+    def __init__(self, total: int, ordered: bool):
+        self.total = total
+        self.ordered = ordered
+        self.items: dict[int, BulkItemResult] = {}
+
+    def fail(self, index: int, error: Any) -> None:
+        self.items[index] = BulkItemResult(index=index, status="failed", error=str(error))
+
+    def succeed(self, index: int, outcome: str, document_id: ObjectId) -> None:
+        self.items[index] = BulkItemResult(index=index, status=outcome, id=document_id)
+
+    def succeeded(self, index: int) -> bool:
+        item = self.items.get(index)
+        return item is not None and item.status not in ("failed", "skipped")
+
+    def first_failure(self) -> Optional[int]:
+        failed = [index for index, item in self.items.items() if item.status == "failed"]
+        return min(failed) if failed else None
+
+    def runnable(self, pending: list[tuple]) -> list[tuple]:
+        """Items todavía por ejecutar; el primer elemento de cada tupla es el índice."""
+        pending = [entry for entry in pending if entry[0] not in self.items]
+        first = self.first_failure() if self.ordered else None
+        if first is None:
+            return pending
+        return [entry for entry in pending if entry[0] < first]
+
+    def report(self) -> BulkReport:
+        items = [
+            self.items.get(index, BulkItemResult(index=index, status="skipped"))
+            for index in range(self.total)
+        ]
+        failed = sum(1 for item in items if item.status == "failed")
+        skipped = sum(1 for item in items if item.status == "skipped")
+        return BulkReport(
+            ordered=self.ordered,
+            total=self.total,
+            succeeded=self.total - failed - skipped,
+            failed=failed,
+            skipped=skipped,
+            items=items,
+        )
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def validate_items(
+    items: list, schema: Type[BaseModel], result: BulkResult
+) -> list[tuple[int, BaseModel]]:
+    """Valida todos los items antes de tocar la base; los inválidos quedan como fallidos."""
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            result.fail(index, validation_message(e))
+    return valid
+
+
+def _item_id(value: Any) -> Optional[ObjectId]:
+    if isinstance(value, dict):
+        value = value.get("id", value.get("_id"))
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return None
+
+
+def validate_update_items(
+    items: list, schema: Type[BaseModel], result: BulkResult
+) -> list[tuple[int, ObjectId, BaseModel]]:
+    """Items de actualización: `id` más los campos de `schema` a cambiar."""
+    valid = []
+    for index, item in enumerate(items):
+        document_id = _item_id(item) if isinstance(item, dict) else None
+        if document_id is None:
+            result.fail(index, "id: a valid ObjectId is required")
+            continue
+        fields = {key: value for key, value in item.items() if key not in ("id", "_id")}
+        try:
+            valid.append((index, document_id, schema.model_validate(fields)))
+        except ValidationError as e:
+            result.fail(index, validation_message(e))
+    return valid
+
+
+def validate_ids(items: list, result: BulkResult) -> list[tuple[int, ObjectId]]:
+    """Items de borrado: el id como string o un objeto con `id`."""
+    valid = []
+    for index, item in enumerate(items):
+        document_id = _item_id(item)
+        if document_id is None:
+            result.fail(index, "id: a valid ObjectId is required")
+        else:
+            valid.append((index, document_id))
+    return valid
+
+
+async def find_existing(
+    model: Type[Document],
+    pending: list[tuple],
+    result: BulkResult,
+    projection: Optional[dict] = None,
+) -> dict[ObjectId, dict]:
+    """
+    Una sola consulta `$in` para los ids de `pending` (índice, id, ...); los
+    que no existen quedan como fallidos.
+
+    :return: Documentos crudos por id, con `projection`
+    """
+    ids = list({entry[1] for entry in pending})
+    found = {
+        raw["_id"]: raw
+        async for raw in model.get_motor_collection().find(
+            {"_id": {"$in": ids}}, projection or {"_id": 1}
+        )
+    }
+    for entry in pending:
+        if entry[1] not in found:
+            result.fail(entry[0], "not found")
+    return found
+
+
+def insert_operation(document: Document) -> tuple[ObjectId, InsertOne]:
+    if document.id is None:
+        document.id = PydanticObjectId()
+    return document.id, InsertOne(get_dict(document, to_db=True))
+
+
+def update_operation(document_id: ObjectId, update: dict) -> UpdateOne:
+    # Encoder de Beanie: los Link se guardan como DBRef igual que en Document.update
+    return UpdateOne({"_id": document_id}, Encoder(to_db=True).encode(update))
+
+
+def delete_operation(document_id: ObjectId) -> DeleteOne:
+    return DeleteOne({"_id": document_id})
+
+
+async def execute_bulk(
+    model: Type[Document],
+    result: BulkResult,
+    operations: list[tuple[int, ObjectId, Any]],
+    outcome: str,
+    error_message: Optional[Callable[[dict], str]] = None,
+) -> list[ObjectId]:
+    """
+    Ejecuta las operaciones (índice, id, operación de pymongo) en llamadas a
+    `bulk_write` de a lo más BULK_BATCH_SIZE, y registra el resultado de
+    cada item a partir de los `writeErrors` (`error_message` los convierte
+    en el mensaje del item).
+
+    :return: Ids de los documentos escritos con éxito
+    """
+    operations = result.runnable(operations)
+    collection = model.get_motor_collection()
+    written = []
+    size = settings.BULK_BATCH_SIZE
+    for start in range(0, len(operations), size):
+        chunk = operations[start : start + size]
+        errors = {}
+        try:
+            await collection.bulk_write(
+                [operation for _, _, operation in chunk], ordered=result.ordered
+            )
+        except BulkWriteError as e:
+            errors = {
+                error["index"]: (
+                    error_message(error)
+                    if error_message
+                    else error.get("errmsg", "write error")
+                )
+                for error in e.details.get("writeErrors", [])
+            }
+        stop = min(errors) if errors and result.ordered else None
+        for position, (index, document_id, _) in enumerate(chunk):
+            if position in errors:
+                result.fail(index, errors[position])
+            elif stop is not None and position > stop:
+                break
+            else:
+                result.succeed(index, outcome, document_id)
+                written.append(document_id)
+        if stop is not None:
+            break
+    return written
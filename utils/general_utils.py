@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+def update_payload(data: BaseModel, exclude: set = frozenset()) -> dict:
+    """
+    Expresión `$set` con los campos enviados en `data` y `updated_at` al
+    momento actual, para que el ETag/Last-Modified del documento cambie.
+
+    Se usan los valores tal cual (no `model_dump`) para que Beanie guarde los
+    Link como DBRef en lugar de documentos embebidos.
+    """
+    payload = {
+        name: getattr(data, name)
+        for name in data.model_fields_set
+        if name not in exclude
+    }
+    payload["updated_at"] = datetime.utcnow()
+    return {"$set": payload}
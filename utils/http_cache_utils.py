@@ -0,0 +1,119 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Type
+
+from beanie import Document, PydanticObjectId
+from bson import ObjectId
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+
+def make_etag(body: bytes) -> str:
+    """ETag fuerte a partir del contenido de la respuesta."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True si el cliente ya tiene esta versión (If-None-Match)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def json_response_with_etag(request: Request, body: bytes, etag: str) -> Response:
+    """Regresa el JSON ya serializado, o 304 si el cliente tiene el mismo ETag."""
+    headers = {"ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class DocumentVersion(NamedTuple):
+    etag: str
+    last_modified: datetime
+
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+        }
+
+    def matches(self, request: Request) -> bool:
+        """If-None-Match tiene prioridad sobre If-Modified-Since (RFC 9110)."""
+        if request.headers.get("if-none-match"):
+            return etag_matches(request, self.etag)
+        since = request.headers.get("if-modified-since")
+        if not since:
+            return False
+        try:
+            since = parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            # parsedate_to_datetime regresa una fecha naive con zona "-0000"
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified.replace(microsecond=0) <= since
+
+
+class _VersionProjection(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    updated_at: Optional[datetime] = None
+
+    class Settings:
+        projection = {"_id": 1, "updated_at": 1}
+
+
+async def get_document_version(
+    model: Type[Document], document_id
+) -> Optional[DocumentVersion]:
+    """
+    Versión del documento leyendo solo `_id` y `updated_at`.
+
+    :return: DocumentVersion, o None si el id no es válido, no existe o no
+    tiene `updated_at`
+    """
+    if not ObjectId.is_valid(str(document_id)):
+        return None
+    found = await model.find_one(
+        {"_id": ObjectId(str(document_id))}, projection_model=_VersionProjection
+    )
+    if found is None or found.updated_at is None:
+        return None
+    updated_at = found.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    millis = int(updated_at.timestamp() * 1000)
+    return DocumentVersion(f'"{found.id}-{millis}"', updated_at)
+
+
+async def conditional_json_response(
+    request: Request,
+    model: Type[Document],
+    document_id,
+    loader: Callable[[], Awaitable[Any]],
+) -> Response:
+    """
+    GET de un documento con ETag/Last-Modified derivados de `updated_at`.
+
+    Si el cliente ya tiene la versión vigente responde 304 sin cargar ni
+    serializar el documento; si no, llama a `loader`.
+    """
+    version = await get_document_version(model, document_id)
+    headers = version.headers() if version else {}
+    if version is not None and version.matches(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = await loader()
+    return JSONResponse(content=jsonable_encoder(content), headers=headers)
+
+
+def hashed_json_response(request: Request, content: Any) -> Response:
+    """Listados: ETag del contenido serializado; ahorra la transferencia."""
+    body = JSONResponse(content=jsonable_encoder(content)).body
+    return json_response_with_etag(request, body, make_etag(body))
@@ -0,0 +1,112 @@
+import codecs
+import csv
+import json
+from enum import Enum
+from typing import AsyncIterator, Union
+
+from fastapi import HTTPException, Request, status
+
+IMPORT_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# Para /docs: el cuerpo se lee a mano, en streaming
+IMPORT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "text/csv": {"schema": {"type": "string"}},
+            "application/x-ndjson": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+def import_format(request: Request) -> ImportFormat:
+    """Dependencia: formato del cuerpo según su Content-Type."""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type not in IMPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be text/csv or application/x-ndjson",
+        )
+    return ImportFormat(IMPORT_MEDIA_TYPES[media_type])
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Líneas de un cuerpo UTF-8 conforme llegan los chunks, sin leerlo completo."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_rows(
+    stream: AsyncIterator[bytes], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, Union[dict, str]]]:
+    """
+    Filas de un CSV (con encabezado) o NDJSON como (línea, dict). Una fila que
+    no se puede leer se entrega como (línea, mensaje de error) y la lectura
+    continúa con la siguiente.
+    """
+    if import_format == ImportFormat.ndjson:
+        number = 0
+        async for line in iter_lines(stream):
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, f"Invalid JSON: {e}"
+                continue
+            yield number, row if isinstance(row, dict) else "Row must be a JSON object"
+        return
+
+    header = None
+    record, start, number = "", 0, 0
+    async for line in iter_lines(stream):
+        number += 1
+        record = f"{record}\n{line}" if record else line
+        start = start or number
+        # Un número impar de comillas: el campo sigue en la siguiente línea
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record.rstrip("\r")]), [])
+        line_number, record, start = start, "", 0
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [value.strip() for value in values]
+        elif len(values) != len(header):
+            yield line_number, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield line_number, dict(zip(header, values))
+    if record:
+        yield start, "Unterminated quoted field"
+
+
+async def chunked(items: AsyncIterator, size: int) -> AsyncIterator[list]:
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,92 @@
+import asyncio
+from collections import defaultdict
+from typing import Optional, Type
+
+from beanie import Document, Link
+from beanie.odm.fields import LinkTypes
+from pydantic import BaseModel
+
+_FORWARD_LINK_TYPES = (
+    LinkTypes.DIRECT,
+    LinkTypes.OPTIONAL_DIRECT,
+    LinkTypes.LIST,
+    LinkTypes.OPTIONAL_LIST,
+)
+
+
+async def fetch_links_batched(
+    documents: list[Document],
+    projections: Optional[dict[Type[Document], Type[BaseModel]]] = None,
+) -> list[Document]:
+    """
+    Resuelve los Link de una lista de documentos del mismo modelo con una
+    consulta `$in` por colección enlazada, en lugar de `fetch_all_links()`
+    por documento. El número de consultas no depende de cuántos documentos
+    haya en la página.
+
+    Los Link cuyo documento ya no existe se dejan sin resolver, igual que
+    `fetch_all_links()`. `projections` lee los documentos de un modelo
+    enlazado con un `projection_model` (p. ej. User sin la contraseña).
+
+    :return: Los mismos documentos, con los Link reemplazados por documentos
+    """
+    if not documents:
+        return documents
+
+    link_fields = {
+        name: info
+        for name, info in (type(documents[0]).get_link_fields() or {}).items()
+        if info.link_type in _FORWARD_LINK_TYPES
+    }
+
+    # Ids a buscar agrupados por modelo: students/teacher comparten la consulta
+    # a users y files/certificate la de files
+    ids_by_model = defaultdict(set)
+    for document in documents:
+        for name, info in link_fields.items():
+            for link in _links(getattr(document, name, None)):
+                ids_by_model[info.document_class].add(link.ref.id)
+
+    models = list(ids_by_model)
+    projections = projections or {}
+    results = await asyncio.gather(
+        *(
+            model.find(
+                {"_id": {"$in": list(ids_by_model[model])}},
+                projection_model=projections.get(model),
+            ).to_list()
+            for model in models
+        )
+    )
+    fetched = {
+        model: {item.id: item for item in items}
+        for model, items in zip(models, results)
+    }
+
+    for document in documents:
+        for name, info in link_fields.items():
+            value = getattr(document, name, None)
+            by_id = fetched.get(info.document_class, {})
+            if isinstance(value, list):
+                setattr(document, name, [_resolve(item, by_id) for item in value])
+            elif value is not None:
+                setattr(document, name, _resolve(value, by_id))
+    return documents
+
+
+def _links(value) -> list[Link]:
+    values = value if isinstance(value, list) else [value]
+    return [item for item in values if isinstance(item, Link)]
+
+
+def _resolve(value, by_id: dict):
+    if isinstance(value, Link):
+        return by_id.get(value.ref.id, value)
+    return value
+
+
+def link_id(value):
+    """Id de un Link, de un documento ya resuelto o de un DBRef."""
+    if isinstance(value, Link):
+        return value.ref.id
+    return getattr(value, "id", value)
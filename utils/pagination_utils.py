@@ -0,0 +1,71 @@
+from typing import Optional, Type
+
+from beanie import Document
+from bson import ObjectId
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+from core.config import settings
+from schemas.general_schemas import Page
+from utils.error_codes import ErrorCodes
+
+
+class PageParams:
+    """
+    Parámetros de paginación por cursor (keyset sobre `_id`) para usar como
+    dependencia: `params: PageParams = Depends()`.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(
+            None, description="`next_cursor` de la página anterior."
+        ),
+        limit: int = Query(
+            settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX
+        ),
+    ):
+        if cursor is not None and not ObjectId.is_valid(cursor):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ErrorCodes.BAD_OBJECT_ID.value,
+            )
+        self.cursor = cursor
+        self.limit = limit
+
+
+def filters_from(**fields) -> dict:
+    """Filtros de igualdad con los parámetros que sí se enviaron."""
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+async def paginate(
+    model: Type[Document],
+    params: PageParams,
+    filters: Optional[dict] = None,
+    projection_model: Optional[Type[BaseModel]] = None,
+) -> Page:
+    """
+    Regresa una página de `model` ordenada por `_id`.
+
+    Se pide un elemento de más para saber si hay otra página sin hacer un
+    count; el costo depende del tamaño de la página y no de la colección.
+
+    :return: Page con los items y el cursor de la siguiente página
+    """
+    queries = [filters or {}]
+    if params.cursor:
+        queries.append({"_id": {"$gt": ObjectId(params.cursor)}})
+
+    items = (
+        await model.find(*queries, projection_model=projection_model)
+        .sort("+_id")
+        .limit(params.limit + 1)
+        .to_list()
+    )
+
+    next_cursor = None
+    if len(items) > params.limit:
+        items = items[: params.limit]
+        next_cursor = str(items[-1].id)
+    return Page(items=items, next_cursor=next_cursor, limit=params.limit)
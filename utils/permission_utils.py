@@ -1,14 +1,17 @@
 from fastapi import HTTPException, Depends
 from api.deps.user_deps import get_current_user
+from core.permission_registry import permission_registry
 from models.user_model import User
-from services.permission_services import PermissionsServices
 
 
 def require_permission(list_permissions: list[str]):
+    # La lista se compila a una máscara una sola vez, al definir la ruta
+    required_mask = permission_registry.compile(list_permissions)
+
     async def wrapper(current_user: User = Depends(get_current_user)):
-        for permission in list_permissions:
-            if not await PermissionsServices.check_permission(current_user, permission):
-                raise HTTPException(status_code=403, detail="Not enough permissions")
+        await permission_registry.ensure_loaded()
+        if not permission_registry.has_all(current_user.roles, required_mask):
+            raise HTTPException(status_code=403, detail="Not enough permissions")
         return current_user
 
     return wrapper
@@ -0,0 +1,89 @@
+from enum import Enum
+from typing import AsyncIterator, Optional, Type
+
+from beanie import Document
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from core.config import settings
+from utils.link_utils import fetch_links_batched
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    json = "json"
+
+
+async def iter_documents(
+    model: Type[Document],
+    filters: Optional[dict] = None,
+    projection_model: Optional[Type[BaseModel]] = None,
+    resolve_links: bool = False,
+    link_projections: Optional[dict[Type[Document], Type[BaseModel]]] = None,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> AsyncIterator[BaseModel]:
+    """
+    Recorre el cursor de Motor en lotes de `batch_size` documentos y los
+    entrega uno por uno; en memoria solo vive el lote actual.
+
+    Con `resolve_links` los Link de cada lote se resuelven con
+    `fetch_links_batched` (una consulta por colección enlazada y por lote),
+    leyendo cada modelo enlazado con su `link_projections`.
+    """
+    cursor = model.find(
+        filters or {}, projection_model=projection_model, batch_size=batch_size
+    ).sort("+_id")
+
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            for item in await _prepare(batch, resolve_links, link_projections):
+                yield item
+            batch = []
+    for item in await _prepare(batch, resolve_links, link_projections):
+        yield item
+
+
+async def _prepare(
+    batch: list, resolve_links: bool, link_projections: Optional[dict]
+) -> list:
+    if resolve_links:
+        await fetch_links_batched(batch, link_projections)
+    return batch
+
+
+async def _ndjson(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    async for item in items:
+        yield item.model_dump_json(by_alias=True).encode("utf-8") + b"\n"
+
+
+async def _json_array(items: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    separator = b"["
+    async for item in items:
+        yield separator + item.model_dump_json(by_alias=True).encode("utf-8")
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def stream_response(
+    items: AsyncIterator[BaseModel],
+    export_format: ExportFormat = ExportFormat.ndjson,
+    filename: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Respuesta que serializa cada documento conforme llega del cursor, como
+    NDJSON (un documento por línea) o como un arreglo JSON enviado por partes.
+    """
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format.value}"'
+        )
+    if export_format == ExportFormat.json:
+        return StreamingResponse(
+            _json_array(items), media_type="application/json", headers=headers
+        )
+    return StreamingResponse(
+        _ndjson(items), media_type="application/x-ndjson", headers=headers
+    )
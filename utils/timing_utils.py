@@ -0,0 +1,22 @@
+import time
+
+from fastapi import Request
+
+
+async def server_timing_middleware(request: Request, call_next):
+    """
+    Agrega el header Server-Timing separando el costo de autenticación
+    (get_current_user) del resto del procesamiento del request.
+    """
+    started = time.perf_counter()
+    response = await call_next(request)
+    total_ms = (time.perf_counter() - started) * 1000
+    auth_ms = getattr(request.state, "auth_ms", None)
+
+    timings = []
+    if auth_ms is not None:
+        timings.append(f"auth;dur={auth_ms:.2f}")
+        timings.append(f"app;dur={max(total_ms - auth_ms, 0):.2f}")
+    timings.append(f"total;dur={total_ms:.2f}")
+    response.headers["Server-Timing"] = ", ".join(timings)
+    return response